@@ -0,0 +1,106 @@
+"""
+Benchmark: full FTS5 search index build, serial vs worker processes.
+
+Generates N synthetic compound XML files plus index.xml and times a full
+DoxygenSearchIndex build with 1 worker and with every available core.
+Peak traced memory of the parent process is measured in a separate run
+(tracemalloc slows in-process parsing); worker memory is bounded by the
+batches in flight.
+
+Usage:
+    python scripts/benchmark_fts_build.py [--compounds 5000] [--members 20]
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from doxygen_mcp.search import DoxygenSearchIndex  # noqa: E402
+from doxygen_mcp.warmup import default_workers  # noqa: E402
+
+
+def write_corpus(xml_dir: Path, compounds: int, members: int) -> None:
+    xml_dir.mkdir(parents=True)
+    (xml_dir.parent / ".git").mkdir()
+    index = ["<doxygenindex>"]
+    for i in range(compounds):
+        refid = f"class_c{i}"
+        index.append(
+            f'<compound refid="{refid}" kind="class"><name>ns::C{i}</name></compound>'
+        )
+        rows = "".join(
+            f'<memberdef kind="function" id="{refid}_1m{m}"><name>m{m}</name>'
+            f"<briefdescription><para>Does step {m} of {i}.</para>"
+            f"</briefdescription>"
+            f'<location file="src/c{i}.h" line="{m + 1}"/></memberdef>'
+            for m in range(members)
+        )
+        (xml_dir / f"{refid}.xml").write_text(
+            f'<doxygen><compounddef id="{refid}" kind="class">'
+            f"<compoundname>ns::C{i}</compoundname>"
+            f"<briefdescription><para>Class number {i}.</para></briefdescription>"
+            f"<detaileddescription><para>{'Lorem ipsum dolor sit amet. ' * 20}"
+            f"</para></detaileddescription>"
+            f'<sectiondef kind="public-func">{rows}</sectiondef>'
+            f'<location file="src/c{i}.h" line="1"/>'
+            f"</compounddef></doxygen>",
+            encoding="utf-8",
+        )
+    index.append("</doxygenindex>")
+    (xml_dir / "index.xml").write_text("".join(index), encoding="utf-8")
+
+
+def run_build(xml_dir: Path, workers: int) -> float:
+    db = xml_dir / "search_index.db"
+    if db.exists():
+        db.unlink()
+    index = DoxygenSearchIndex(str(xml_dir), workers=workers)
+    started = time.perf_counter()
+    index._build_index()  # pylint: disable=protected-access
+    return time.perf_counter() - started
+
+
+def build(xml_dir: Path, workers: int):
+    """Return (seconds, peak traced bytes); timed without tracemalloc running."""
+    elapsed = run_build(xml_dir, workers)
+    tracemalloc.start()
+    run_build(xml_dir, workers)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--compounds", type=int, default=5000)
+    parser.add_argument("--members", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=default_workers())
+    args = parser.parse_args()
+
+    tmp = Path(tempfile.mkdtemp())
+    try:
+        xml_dir = tmp / "repo" / "xml"
+        write_corpus(xml_dir, args.compounds, args.members)
+        print(f"{args.compounds} compounds x {args.members} members")
+        serial, serial_peak = build(xml_dir, 1)
+        print(f"  1 worker:   {serial:6.2f}s  peak {serial_peak / 2**20:6.1f} MiB")
+        if args.workers > 1:
+            parallel, peak = build(xml_dir, args.workers)
+            print(
+                f"  {args.workers} workers: {parallel:6.2f}s  peak "
+                f"{peak / 2**20:6.1f} MiB  ({serial / parallel:.1f}x)"
+            )
+        else:
+            print("  (one core available; parallel build not measured)")
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: "did you mean" lookups over a large synthetic symbol vocabulary.
+
+Builds a FuzzyNameIndex over N identifier-like names (heavily shared
+prefixes such as get/set, the hard case for prefix-based schemes) and
+times lookups of one- and two-edit typos against a linear scan with the
+same bounded edit distance.
+
+Usage:
+    python scripts/benchmark_fuzzy.py [--names 100000] [--queries 300]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from doxygen_mcp.fuzzy_index import FuzzyNameIndex, edit_distance  # noqa: E402
+
+WORDS = (
+    "get set value buffer index node widget render parse token stream update "
+    "handle create count manager factory config"
+).split()
+
+
+def make_names(count: int, rng: random.Random):
+    names = set()
+    while len(names) < count:
+        parts = [rng.choice(WORDS) for _ in range(3)]
+        names.add(
+            parts[0] + "".join(p.title() for p in parts[1:]) + str(rng.randint(0, 50))
+        )
+    return sorted(names)
+
+
+def make_typo(name: str, edits: int, rng: random.Random) -> str:
+    for _ in range(edits):
+        i = rng.randrange(len(name))
+        op = rng.choice(("drop", "swap", "replace", "insert"))
+        if op == "drop":
+            name = name[:i] + name[i + 1 :]
+        elif op == "swap" and i + 1 < len(name):
+            name = name[:i] + name[i + 1] + name[i] + name[i + 2 :]
+        elif op == "replace":
+            name = name[:i] + "x" + name[i + 1 :]
+        else:
+            name = name[:i] + "q" + name[i:]
+    return name
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--names", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    names = make_names(args.names, rng)
+
+    started = time.perf_counter()
+    index = FuzzyNameIndex((name, name) for name in names)
+    print(f"build: {len(index)} names in {time.perf_counter() - started:.2f}s")
+
+    for edits in (1, 2):
+        targets = rng.sample(names, args.queries)
+        queries = [make_typo(name, edits, rng) for name in targets]
+        started = time.perf_counter()
+        found = sum(
+            target.lower() in [term for _, term, _ in index.lookup(query)]
+            for query, target in zip(queries, targets)
+        )
+        per_query = (time.perf_counter() - started) / len(queries)
+        print(
+            f"{edits}-edit typos: {per_query * 1000:.3f} ms/lookup, "
+            f"target in top 5 for {100 * found / len(queries):.0f}%"
+        )
+
+    lowered = [name.lower() for name in names]
+    sample = queries[:10]
+    started = time.perf_counter()
+    for query in sample:
+        sorted(
+            (edit_distance(query.lower(), name, 2), name)
+            for name in lowered
+            if edit_distance(query.lower(), name, 2) <= 2
+        )
+    per_scan = (time.perf_counter() - started) / len(sample)
+    print(f"linear scan: {per_scan * 1000:.1f} ms/lookup")
+
+
+if __name__ == "__main__":
+    main()
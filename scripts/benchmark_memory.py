@@ -0,0 +1,191 @@
+"""
+Benchmark: memory of the engine's index model, old dict layout vs slotted.
+
+Generates a synthetic index.xml and measures, with tracemalloc, the retained
+size of the lookup maps built from it:
+
+* legacy: one {"kind", "refid", "name"} dict per compound, member rows with
+  a separate kind string per row (the layout before CompoundInfo),
+* current: DoxygenQueryEngine._process_compound (slotted CompoundInfo,
+  interned kinds).
+
+It also compares compound records with and without interned kind/file
+strings, as held by the shared compound cache.
+
+Usage:
+    python scripts/benchmark_memory.py [--compounds 20000] [--members 5]
+"""
+
+import argparse
+import gc
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from doxygen_mcp import xml_backend  # noqa: E402
+from doxygen_mcp.partial_index import PartialMatchIndex  # noqa: E402
+from doxygen_mcp.query_engine import DoxygenQueryEngine  # noqa: E402
+from doxygen_mcp.records import parse_compound_record  # noqa: E402
+
+KINDS = ("class", "struct", "namespace", "file")
+
+
+def fresh(value):
+    """Return an equal string that is a distinct object (as parsers produce)."""
+    return value[:1] + value[1:] if value else value
+
+
+def write_index(path: Path, compounds: int, members: int) -> None:
+    parts = ["<?xml version='1.0' encoding='UTF-8'?>\n<doxygenindex>\n"]
+    for i in range(compounds):
+        kind = KINDS[i % len(KINDS)]
+        name = f"src/mod{i}.h" if kind == "file" else f"ns::Type{i}"
+        parts.append(f'<compound refid="c{i}" kind="{kind}"><name>{name}</name>')
+        for m in range(members):
+            parts.append(
+                f'<member refid="c{i}_1m{m}" kind="function">'
+                f"<name>method{m}</name></member>"
+            )
+        parts.append("</compound>\n")
+    parts.append("</doxygenindex>\n")
+    path.write_text("".join(parts), encoding="utf-8")
+
+
+class LegacyModel:
+    """The pre-CompoundInfo lookup maps, reproduced for comparison."""
+
+    def __init__(self):
+        self.compounds = {}
+        self.lower_map = {}
+        self.file_map = {}
+        self.files = []
+        self.by_refid = {}
+        self.parent_map = {}
+        self.member_index = {}
+        self.partial_index = PartialMatchIndex()
+
+    def process_compound(self, elem):
+        name = elem.findtext("name")
+        refid = elem.get("refid")
+        kind = fresh(elem.get("kind"))
+        info = {"kind": kind, "refid": refid, "name": name}
+        self.compounds[name] = info
+        self.by_refid[refid] = info
+        if name.lower() not in self.lower_map:
+            self.partial_index.add(name.lower())
+        self.lower_map[name.lower()] = info
+        if kind == "file":
+            self.files.append((name, info))
+            self.file_map.setdefault(Path(name).name, []).append(info)
+        for member in elem.findall("member"):
+            member_refid = member.get("refid")
+            self.parent_map[member_refid] = refid
+            self.member_index.setdefault(member.findtext("name").lower(), []).append(
+                (member_refid, refid, fresh(member.get("kind")))
+            )
+
+
+def retained(build):
+    """Run build() and return (result, bytes still allocated afterwards)."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def load_legacy(index_path: Path):
+    model = LegacyModel()
+    for _, elem in xml_backend.iterparse(index_path, events=("end",)):
+        if elem.tag == "compound":
+            model.process_compound(elem)
+            elem.clear()
+    return model
+
+
+def load_current(index_path: Path):
+    engine = DoxygenQueryEngine(str(index_path.parent))
+    # pylint: disable=protected-access
+    for _, elem in xml_backend.iterparse(index_path, events=("end",)):
+        if elem.tag == "compound":
+            engine._process_compound(elem)
+            elem.clear()
+    return engine
+
+
+def record_xml(index: int, members: int) -> str:
+    rows = "".join(
+        f'<memberdef kind="function" id="c{index}_1m{m}"><name>m{m}</name>'
+        f'<location file="src/deep/path/module{index % 10}.cpp" line="{m}"/>'
+        f'<referencedby refid="x" compoundref="main_8c">main</referencedby>'
+        f"</memberdef>"
+        for m in range(members)
+    )
+    return (
+        f'<doxygen><compounddef id="c{index}" kind="class">'
+        f"<compoundname>T{index}</compoundname>"
+        f'<sectiondef kind="public-func">{rows}</sectiondef>'
+        f"</compounddef></doxygen>"
+    )
+
+
+def uninterned(record):
+    """Copy a record with distinct kind/file/compoundref string objects."""
+    members = []
+    for member in record["members"]:
+        copy = dict(member, kind=fresh(member["kind"]))
+        copy["location"] = dict(
+            member["location"], file=fresh(member["location"]["file"])
+        )
+        copy["referencedby"] = [
+            dict(ref, compoundref=fresh(ref["compoundref"]))
+            for ref in member["referencedby"]
+        ]
+        members.append(copy)
+    return dict(record, kind=fresh(record["kind"]), members=members)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--compounds", type=int, default=20000)
+    parser.add_argument("--members", type=int, default=5)
+    parser.add_argument("--records", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index_path = Path(tmp) / "index.xml"
+        write_index(index_path, args.compounds, args.members)
+
+        _, legacy = retained(lambda: load_legacy(index_path))
+        _, current = retained(lambda: load_current(index_path))
+        print(
+            f"index model: {args.compounds} compounds x {args.members} members\n"
+            f"  legacy dicts   {legacy / 2**20:8.2f} MiB\n"
+            f"  CompoundInfo   {current / 2**20:8.2f} MiB  "
+            f"({100 * (1 - current / legacy):.0f}% smaller)"
+        )
+
+        paths = []
+        for i in range(args.records):
+            path = Path(tmp) / f"c{i}.xml"
+            path.write_text(record_xml(i, 40), encoding="utf-8")
+            paths.append(path)
+        _, interned = retained(lambda: [parse_compound_record(p) for p in paths])
+        _, plain = retained(
+            lambda: [uninterned(parse_compound_record(p)) for p in paths]
+        )
+        print(
+            f"compound records: {args.records} x 40 members\n"
+            f"  plain strings  {plain / 2**20:8.2f} MiB\n"
+            f"  interned       {interned / 2**20:8.2f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark: legacy O(L^2) substring map vs. trigram PartialMatchIndex.
+
+Builds both structures over synthetic, C++-style compound names and reports
+build time, traced memory (tracemalloc) and query latency.
+
+Usage:
+    python scripts/benchmark_partial_index.py [--sizes 10000 50000 100000]
+                                              [--legacy-max 50000]
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from doxygen_mcp.partial_index import PartialMatchIndex  # noqa: E402
+
+NAMESPACES = ["std", "detail", "core", "net", "io", "impl", "util", "engine"]
+WORDS = ["buffer", "stream", "handler", "allocator", "traits", "vector", "node"]
+
+
+def make_names(count, seed=42):
+    rng = random.Random(seed)
+    names = []
+    for i in range(count):
+        scope = "::".join(rng.sample(NAMESPACES, rng.randint(1, 4)))
+        word = "_".join(rng.sample(WORDS, rng.randint(1, 3)))
+        names.append(f"{scope}::{word}_{i}")
+    return [n.lower() for n in names]
+
+
+def build_legacy(names):
+    substring_map = {}
+    for name in names:
+        for i in range(len(name)):
+            for j in range(i + 1, len(name) + 1):
+                sub = name[i:j]
+                if sub not in substring_map:
+                    substring_map[sub] = name
+    return substring_map
+
+
+def build_trigram(names):
+    index = PartialMatchIndex()
+    for name in names:
+        index.add(name)
+    return index
+
+
+def measure(builder, names):
+    # Time without tracing, then rebuild under tracemalloc for the memory figure.
+    start = time.perf_counter()
+    structure = builder(names)
+    elapsed = time.perf_counter() - start
+    del structure
+
+    tracemalloc.start()
+    structure = builder(names)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return structure, elapsed, current
+
+
+def time_queries(lookup, queries):
+    start = time.perf_counter()
+    for q in queries:
+        lookup(q)
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000, 100000])
+    parser.add_argument(
+        "--legacy-max",
+        type=int,
+        default=50000,
+        help="Skip the legacy map above this many names (it grows quadratically).",
+    )
+    args = parser.parse_args()
+
+    queries = ["vector", "detail::buffer", "handler_1", "io::", "traits_allocator"]
+
+    print(f"{'names':>8} | {'impl':<8} | {'build s':>8} | {'MiB':>9} | {'query us':>9}")
+    print("-" * 55)
+    for size in args.sizes:
+        names = make_names(size)
+
+        if size <= args.legacy_max:
+            legacy, elapsed, mem = measure(build_legacy, names)
+            q_us = time_queries(legacy.get, queries)
+            print(
+                f"{size:>8} | {'legacy':<8} | {elapsed:>8.2f} | "
+                f"{mem / 2**20:>9.1f} | {q_us:>9.1f}"
+            )
+            del legacy
+        else:
+            print(f"{size:>8} | {'legacy':<8} | {'skipped':>8} | {'-':>9} | {'-':>9}")
+
+        index, elapsed, mem = measure(build_trigram, names)
+        q_us = time_queries(index.search, queries)
+        print(
+            f"{size:>8} | {'trigram':<8} | {elapsed:>8.2f} | "
+            f"{mem / 2**20:>9.1f} | {q_us:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Benchmark: semantic_search throughput under concurrent tool calls.
+
+Builds a synthetic FTS5 index and fires queries from N concurrent
+`asyncio.to_thread` calls (the way the MCP tools run them), comparing:
+
+  before  rollback-journal DB, a new sqlite3 connection per query
+  after   WAL DB, pooled per-thread read-only connections
+
+Each mode is measured idle and while a writer thread keeps replacing rows
+(as a sync does), counting queries that failed or waited on a lock.
+
+Usage:
+    python scripts/benchmark_search_concurrency.py [--compounds 2000] [--calls 8]
+"""
+
+import argparse
+import asyncio
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from benchmark_fts_build import write_corpus  # noqa: E402
+
+from doxygen_mcp.search import DoxygenSearchIndex  # noqa: E402
+
+# Selective lookups, like the symbol and phrase queries tools usually send
+QUERIES = ["c17", "c1234 m3", '"step 3 of 42"', "c999", "m7 c250", "c42*"]
+SQL = (
+    "SELECT name, kind, refid, brief, filepath, parent, signature, "
+    "bm25(symbols, 10.0, 0.0, 0.0, 3.0, 2.0, 4.0, 1.0, 1.0) AS rank "
+    "FROM symbols WHERE symbols MATCH ? ORDER BY rank LIMIT 5"
+)
+
+
+def connect_per_query(db_path: Path):
+    """The previous search path: open, query, close."""
+
+    def search(query):
+        conn = sqlite3.connect(db_path)
+        try:
+            return conn.execute(SQL, (query,)).fetchall()
+        finally:
+            conn.close()
+
+    return search
+
+
+def writer_loop(db_path: Path, stop: threading.Event):
+    """Repeatedly replace a block of rows in one transaction, like a sync."""
+    conn = sqlite3.connect(db_path, timeout=30)
+    rows = conn.execute("SELECT * FROM entries WHERE id <= 2000").fetchall()
+    while not stop.is_set():
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("DELETE FROM entries WHERE id <= 2000")
+        conn.executemany(f"INSERT INTO entries VALUES ({', '.join('?' * 9)})", rows)
+        conn.commit()
+    conn.close()
+
+
+async def run_calls(search, calls: int, seconds: float):
+    """Return (queries/sec, failed queries, slowest query in seconds)."""
+    done = failed = 0
+    slowest = 0.0
+    deadline = time.perf_counter() + seconds
+
+    async def tool_call(worker: int):
+        nonlocal done, failed, slowest
+        i = worker
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                result = await asyncio.to_thread(search, QUERIES[i % len(QUERIES)])
+                if result and isinstance(result[0], dict) and "error" in result[0]:
+                    failed += 1
+            except sqlite3.Error:
+                failed += 1
+            slowest = max(slowest, time.perf_counter() - started)
+            done += 1
+            i += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(tool_call(w) for w in range(calls)))
+    return done / (time.perf_counter() - started), failed, slowest
+
+
+def measure(label: str, db_path: Path, search, calls: int, seconds: float):
+    for phase in ("idle", "writing"):
+        stop = threading.Event()
+        writer = None
+        if phase == "writing":
+            writer = threading.Thread(target=writer_loop, args=(db_path, stop))
+            writer.start()
+        try:
+            qps, failed, slowest = asyncio.run(run_calls(search, calls, seconds))
+        finally:
+            stop.set()
+            if writer is not None:
+                writer.join()
+        print(
+            f"  {label:6} {phase:7}: {qps:8.0f} queries/s  "
+            f"{failed:4d} failed  slowest {slowest * 1000:7.1f} ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--compounds", type=int, default=2000)
+    parser.add_argument("--members", type=int, default=20)
+    parser.add_argument("--calls", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    tmp = Path(tempfile.mkdtemp())
+    try:
+        xml_dir = tmp / "repo" / "xml"
+        write_corpus(xml_dir, args.compounds, args.members)
+        index = DoxygenSearchIndex(str(xml_dir), workers=1)
+        index._build_index()  # pylint: disable=protected-access
+
+        before_db = tmp / "before.db"
+        shutil.copy(index.db_path, before_db)
+        conn = sqlite3.connect(before_db)
+        conn.execute("PRAGMA journal_mode = DELETE")
+        conn.close()
+
+        print(
+            f"{args.compounds} compounds x {args.members} members, "
+            f"{args.calls} concurrent calls"
+        )
+        measure(
+            "before", before_db, connect_per_query(before_db), args.calls, args.seconds
+        )
+        measure("after", index.db_path, index.search, args.calls, args.seconds)
+        index.close()
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    main()
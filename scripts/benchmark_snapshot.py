@@ -0,0 +1,75 @@
+"""
+Benchmark: engine readiness from index.xml parsing vs. the binary snapshot.
+
+Generates a synthetic index.xml, then times DoxygenQueryEngine._load_index
+once with no snapshot (full iterparse) and once restoring from the snapshot.
+
+Usage:
+    python scripts/benchmark_snapshot.py [--compounds 50000] [--members 5]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from doxygen_mcp.query_engine import DoxygenQueryEngine  # noqa: E402
+from doxygen_mcp.snapshot import SNAPSHOT_FILENAME  # noqa: E402
+
+
+def write_index(xml_dir: Path, compounds: int, members: int) -> None:
+    with open(xml_dir / "index.xml", "w", encoding="utf-8") as f:
+        f.write("<?xml version='1.0' encoding='UTF-8' standalone='no'?>\n")
+        f.write('<doxygenindex version="1.9.4">\n')
+        for i in range(compounds):
+            kind = "file" if i % 10 == 0 else "class"
+            name = (
+                f"src/mod{i}/file{i}.h" if kind == "file" else f"ns{i % 50}::Class{i}"
+            )
+            f.write(f'  <compound refid="c{i}" kind="{kind}"><name>{name}</name>\n')
+            for m in range(members):
+                f.write(
+                    f'    <member refid="c{i}_1m{m}" kind="function">'
+                    f"<name>method{m}</name></member>\n"
+                )
+            f.write("  </compound>\n")
+        f.write("</doxygenindex>\n")
+
+
+def timed_load(xml_dir: Path) -> float:
+    engine = DoxygenQueryEngine(str(xml_dir))
+    start = time.perf_counter()
+    engine._load_index()  # pylint: disable=protected-access
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--compounds", type=int, default=50000)
+    parser.add_argument("--members", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        xml_dir = Path(tmp)
+        (xml_dir / ".git").mkdir()
+        write_index(xml_dir, args.compounds, args.members)
+
+        # Warm-up run builds the FTS database so later runs only stat it.
+        timed_load(xml_dir)
+
+        (xml_dir / SNAPSHOT_FILENAME).unlink()
+        parse_s = timed_load(xml_dir)
+        snapshot_s = timed_load(xml_dir)
+        size_mb = (xml_dir / SNAPSHOT_FILENAME).stat().st_size / 2**20
+
+    print(f"compounds={args.compounds} members/compound={args.members}")
+    print(f"index.xml parse (+snapshot write): {parse_s * 1000:8.1f} ms")
+    print(f"snapshot restore:                  {snapshot_s * 1000:8.1f} ms")
+    print(f"snapshot size:                     {size_mb:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark: call-site scanning with per-reference reads vs. the source cache.
+
+Simulates a symbol with many callers in one large file: for each reference,
+the old path read and split the whole file; the cached path slices the
+caller's line range out of the cached file.
+
+Usage:
+    python scripts/benchmark_source_cache.py [--lines 20000] [--refs 500]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from doxygen_mcp.source_cache import SourceCache  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=20000)
+    parser.add_argument("--refs", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    ranges = []
+    for _ in range(args.refs):
+        start = rng.randint(1, args.lines - 30)
+        ranges.append((start, start + 25))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "big.c"
+        path.write_text(
+            "".join(
+                f"int value_{i} = helper({i}); // line {i}\n" for i in range(args.lines)
+            ),
+            encoding="utf-8",
+        )
+
+        start_t = time.perf_counter()
+        for first, last in ranges:
+            with open(path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+            _ = [lines[i] for i in range(first - 1, min(len(lines), last))]
+        readlines_s = time.perf_counter() - start_t
+
+        cache = SourceCache()
+        start_t = time.perf_counter()
+        for first, last in ranges:
+            source = cache.get(path)
+            _ = [source.line(n) for n in range(first, min(source.line_count, last) + 1)]
+        cached_s = time.perf_counter() - start_t
+
+    print(f"lines={args.lines} references={args.refs}")
+    print(f"readlines per reference: {readlines_s * 1000:8.1f} ms")
+    print(f"source cache:            {cached_s * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
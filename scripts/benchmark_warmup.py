@@ -0,0 +1,109 @@
+"""
+Benchmark: full-index warmup time against the number of worker processes.
+
+Generates a synthetic Doxygen XML corpus (class compounds whose members call
+each other) plus its index.xml, then times DoxygenQueryEngine.warm_up with
+1, 2, 4, ... workers up to the core count and reports the speedup over the
+single-process run.
+
+Usage:
+    python scripts/benchmark_warmup.py [--files 2000] [--members 40]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from doxygen_mcp.cache import COMPOUND_CACHE  # noqa: E402
+from doxygen_mcp.query_engine import DoxygenQueryEngine  # noqa: E402
+from doxygen_mcp.warmup import default_workers  # noqa: E402
+
+
+def compound_xml(index: int, members: int, files: int) -> str:
+    parts = [
+        "<?xml version='1.0' encoding='UTF-8' standalone='no'?>\n",
+        f'<doxygen><compounddef id="class_c{index}" kind="class">\n',
+        f"  <compoundname>ns::Class{index}</compoundname>\n",
+        '  <sectiondef kind="public-func">\n',
+    ]
+    callee = (index + 1) % files
+    for m in range(members):
+        parts.append(
+            f'    <memberdef kind="function" id="class_c{index}_1m{m}">\n'
+            f"      <type>int</type><name>method{m}</name>\n"
+            f"      <argsstring>(int value)</argsstring>\n"
+            f"      <param><type>int</type><declname>value</declname></param>\n"
+            f"      <briefdescription><para>Method {m}.</para></briefdescription>\n"
+            f'      <location file="src/c{index}.cpp" line="{10 + m * 4}" '
+            f'bodystart="{10 + m * 4}" bodyend="{12 + m * 4}"/>\n'
+            f'      <references refid="class_c{callee}_1m{m}">method{m}</references>\n'
+            f"    </memberdef>\n"
+        )
+    parts.append("  </sectiondef>\n")
+    parts.append(f'  <location file="src/c{index}.h" line="5"/>\n')
+    parts.append("</compounddef></doxygen>\n")
+    return "".join(parts)
+
+
+def write_corpus(xml_dir: Path, files: int, members: int) -> None:
+    index = ["<?xml version='1.0' encoding='UTF-8'?>\n<doxygenindex>\n"]
+    for i in range(files):
+        (xml_dir / f"class_c{i}.xml").write_text(
+            compound_xml(i, members, files), encoding="utf-8"
+        )
+        index.append(
+            f'<compound refid="class_c{i}" kind="class">'
+            f"<name>ns::Class{i}</name></compound>\n"
+        )
+    index.append("</doxygenindex>\n")
+    (xml_dir / "index.xml").write_text("".join(index), encoding="utf-8")
+
+
+def time_warmup(xml_dir: Path, workers: int) -> float:
+    DoxygenQueryEngine.clear_cache()
+    COMPOUND_CACHE.clear()
+    engine = DoxygenQueryEngine(str(xml_dir))
+    engine._load_index()  # pylint: disable=protected-access
+    start = time.perf_counter()
+    engine.warm_up(workers=workers)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--members", type=int, default=40)
+    parser.add_argument("--max-workers", type=int, default=default_workers())
+    args = parser.parse_args()
+
+    counts = [1]
+    while counts[-1] * 2 <= args.max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != args.max_workers:
+        counts.append(args.max_workers)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        xml_dir = Path(tmp)
+        write_corpus(xml_dir, args.files, args.members)
+        print(
+            f"{args.files} compounds x {args.members} members, "
+            f"{default_workers()} cores available"
+        )
+
+        baseline = None
+        for workers in counts:
+            elapsed = time_warmup(xml_dir, workers)
+            baseline = baseline or elapsed
+            print(
+                f"  {workers:>3} workers {elapsed * 1000:9.1f} ms  "
+                f"{args.files / elapsed:8.0f} files/s  "
+                f"speedup {baseline / elapsed:5.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
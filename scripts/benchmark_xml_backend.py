@@ -0,0 +1,128 @@
+"""
+Benchmark: per-file parse throughput of the lxml and defusedxml backends.
+
+Generates synthetic Doxygen compound files (pretty-printed, with collaboration
+graphs and member lists as Doxygen emits them), copies them through the SNR
+minifier, then times xml_backend.parse over both sets with each backend.
+
+Usage:
+    python scripts/benchmark_xml_backend.py [--files 500] [--members 40]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from doxygen_mcp import xml_backend  # noqa: E402
+from doxygen_mcp.funnel import minify_xml_file  # noqa: E402
+
+
+def compound_xml(index: int, members: int) -> str:
+    parts = [
+        "<?xml version='1.0' encoding='UTF-8' standalone='no'?>\n",
+        '<doxygen version="1.9.4" xml:lang="en-US">\n',
+        f'  <compounddef id="class_c{index}" kind="class" prot="public">\n',
+        f"    <compoundname>ns::Class{index}</compoundname>\n",
+        '    <sectiondef kind="public-func">\n',
+    ]
+    for m in range(members):
+        parts.append(
+            f'      <memberdef kind="function" id="class_c{index}_1m{m}" '
+            f'prot="public" static="no" const="no" virt="non-virtual">\n'
+            f"        <type>int</type>\n"
+            f"        <definition>int ns::Class{index}::method{m}</definition>\n"
+            f"        <argsstring>(int value, const char *name)</argsstring>\n"
+            f"        <name>method{m}</name>\n"
+            f"        <param>\n          <type>int</type>\n"
+            f"          <declname>value</declname>\n        </param>\n"
+            f"        <briefdescription>\n          <para>Method {m}.</para>\n"
+            f"        </briefdescription>\n"
+            f"        <detaileddescription>\n"
+            f'          <para><parameterlist kind="param"><parameteritem>\n'
+            f"            <parameternamelist><parametername>value</parametername>"
+            f"</parameternamelist>\n"
+            f"            <parameterdescription><para>Input.</para>"
+            f"</parameterdescription>\n"
+            f"          </parameteritem></parameterlist></para>\n"
+            f"        </detaileddescription>\n"
+            f'        <location file="src/c{index}.h" line="{10 + m}" '
+            f'bodystart="{10 + m}" bodyend="{12 + m}"/>\n'
+            f'        <referencedby refid="main_8c_1main" compoundref="main_8c" '
+            f'startline="{m}">main</referencedby>\n'
+            f"      </memberdef>\n"
+        )
+    parts.append("    </sectiondef>\n")
+    parts.append("    <briefdescription>\n    </briefdescription>\n")
+    parts.append("    <collaborationgraph>\n")
+    for n in range(members):
+        parts.append(
+            f'      <node id="{n}"><label>Class{n}</label>'
+            f'<link refid="class_c{n}"/></node>\n'
+        )
+    parts.append("    </collaborationgraph>\n    <listofallmembers>\n")
+    for m in range(members):
+        parts.append(
+            f'      <member refid="class_c{index}_1m{m}" prot="public" '
+            f'virt="non-virtual"><scope>ns::Class{index}</scope>'
+            f"<name>method{m}</name></member>\n"
+        )
+    parts.append("    </listofallmembers>\n")
+    parts.append(f'    <location file="src/c{index}.h" line="5"/>\n')
+    parts.append("  </compounddef>\n</doxygen>\n")
+    return "".join(parts)
+
+
+def time_parse(files, backend: str) -> float:
+    os.environ["DOXYGEN_XML_BACKEND"] = backend
+    start = time.perf_counter()
+    for path in files:
+        xml_backend.parse(path)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=500)
+    parser.add_argument("--members", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    backends = ["defusedxml"]
+    if xml_backend._lxml_etree is not None:  # pylint: disable=protected-access
+        backends.append("lxml")
+    else:
+        print("lxml is not installed; only the defusedxml backend is measured.")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        raw_dir = Path(tmp) / "raw"
+        min_dir = Path(tmp) / "minified"
+        raw_dir.mkdir()
+        for i in range(args.files):
+            (raw_dir / f"class_c{i}.xml").write_text(
+                compound_xml(i, args.members), encoding="utf-8"
+            )
+        shutil.copytree(raw_dir, min_dir)
+        for path in min_dir.iterdir():
+            minify_xml_file(str(path))
+
+        for label, directory in (("unminified", raw_dir), ("minified", min_dir)):
+            files = sorted(directory.iterdir())
+            avg_kib = sum(f.stat().st_size for f in files) / len(files) / 1024
+            print(f"{label}: {len(files)} files, {avg_kib:.1f} KiB avg")
+            for backend in backends:
+                best = min(time_parse(files, backend) for _ in range(args.repeat))
+                print(
+                    f"  {backend:<11} {best * 1000:8.1f} ms total  "
+                    f"{len(files) / best:8.0f} files/s  "
+                    f"{best / len(files) * 1e6:7.1f} us/file"
+                )
+
+
+if __name__ == "__main__":
+    main()
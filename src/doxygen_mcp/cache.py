@@ -0,0 +1,176 @@
+"""
+Shared, byte-budgeted cache for parsed compound data.
+
+Replaces per-method ``functools.lru_cache`` on engine instances: entries are
+keyed by an engine namespace so a refreshed engine can drop exactly its own
+entries, eviction is least-recently-used by estimated size rather than by
+entry count, and hit/miss/eviction counters are exposed for sizing.
+"""
+
+import itertools
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Set, Tuple
+
+DEFAULT_CACHE_MB = 256
+
+CacheKey = Tuple[str, Hashable]
+
+
+def estimate_size(obj: Any) -> int:
+    """Estimate the deep memory footprint of plain data and slotted records."""
+    seen: Set[int] = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        else:
+            slots = getattr(type(item), "__slots__", ())
+            stack.extend(getattr(item, slot) for slot in slots if hasattr(item, slot))
+    return total
+
+
+def estimate_sampled_size(container: Any, sample: int = 64) -> int:
+    """
+    Estimate the deep size of a large dict or list from its first `sample`
+    items, scaled to its length. Other objects are measured in full.
+    """
+    if isinstance(container, dict):
+        items = list(itertools.islice(container.items(), sample))
+    elif isinstance(container, (list, tuple)):
+        items = list(itertools.islice(container, sample))
+    else:
+        return estimate_size(container)
+    if not items:
+        return sys.getsizeof(container)
+    per_item = estimate_size(items) - sys.getsizeof(items)
+    return sys.getsizeof(container) + per_item * len(container) // len(items)
+
+
+def budget_from_env() -> int:
+    """Read the cache budget in bytes from DOXYGEN_CACHE_MB."""
+    raw = os.environ.get("DOXYGEN_CACHE_MB")
+    try:
+        megabytes = float(raw) if raw else DEFAULT_CACHE_MB
+    except ValueError:
+        megabytes = DEFAULT_CACHE_MB
+    return max(0, int(megabytes * 1024 * 1024))
+
+
+class CompoundCache:
+    """Thread-safe LRU cache bounded by the estimated byte size of its entries."""
+
+    def __init__(self, budget_bytes: int):
+        self.budget_bytes = budget_bytes
+        self._entries: "OrderedDict[CacheKey, Tuple[Any, int]]" = OrderedDict()
+        self._by_namespace: Dict[str, Set[CacheKey]] = {}
+        self._used_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, namespace: str, key: Hashable) -> Optional[Any]:
+        """Return a cached value (marking it recently used), or None."""
+        cache_key = (namespace, key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(cache_key)
+            self.hits += 1
+            return entry[0]
+
+    def contains(self, namespace: str, key: Hashable) -> bool:
+        """Check for an entry without touching recency or hit/miss counters."""
+        with self._lock:
+            return (namespace, key) in self._entries
+
+    def put(
+        self, namespace: str, key: Hashable, value: Any, size: Optional[int] = None
+    ) -> bool:
+        """Insert a value, evicting least-recently-used entries to stay in budget."""
+        if size is None:
+            size = estimate_size(value)
+        if size > self.budget_bytes:
+            return False
+
+        cache_key = (namespace, key)
+        with self._lock:
+            self._discard(cache_key)
+            self._entries[cache_key] = (value, size)
+            self._by_namespace.setdefault(namespace, set()).add(cache_key)
+            self._used_bytes += size
+
+            while self._used_bytes > self.budget_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+                self.evictions += 1
+        return True
+
+    def _discard(self, cache_key: CacheKey) -> None:
+        """Remove one entry; the caller holds the lock."""
+        entry = self._entries.pop(cache_key, None)
+        if entry is None:
+            return
+        self._used_bytes -= entry[1]
+        keys = self._by_namespace.get(cache_key[0])
+        if keys is not None:
+            keys.discard(cache_key)
+            if not keys:
+                del self._by_namespace[cache_key[0]]
+
+    def invalidate(self, namespace: str) -> int:
+        """Drop every entry belonging to a namespace. Returns the number dropped."""
+        with self._lock:
+            keys = list(self._by_namespace.get(namespace, ()))
+            for cache_key in keys:
+                self._discard(cache_key)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self._by_namespace.clear()
+            self._used_bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def resize(self, budget_bytes: int) -> None:
+        """Change the budget, evicting immediately if it shrank."""
+        with self._lock:
+            self.budget_bytes = budget_bytes
+            while self._used_bytes > self.budget_bytes and self._entries:
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return occupancy and hit/miss/eviction counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "budget_bytes": self.budget_bytes,
+                "used_bytes": self._used_bytes,
+                "entries": len(self._entries),
+                "namespaces": len(self._by_namespace),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+# Process-wide cache shared by every query engine.
+COMPOUND_CACHE = CompoundCache(budget_from_env())
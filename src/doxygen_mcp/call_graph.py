@@ -0,0 +1,248 @@
+"""
+In-memory call graph over Doxygen member references.
+
+Member refids are mapped to dense integer ids and the ``references`` (callee)
+and ``referencedby`` (caller) relations are stored in compressed-sparse-row
+form: one offsets array per direction plus a flat target array. Multi-hop
+traversals, fan-in/fan-out counts and reachability then run over integer
+arrays without touching any XML.
+"""
+
+from array import array
+from collections import deque
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+def _to_csr(node_count: int, edges: List[Tuple[int, int]]) -> Tuple[array, array]:
+    """Build (offsets, targets) from edges, keeping per-source insertion order."""
+    offsets = array("I", [0]) * (node_count + 1)
+    for src, _ in edges:
+        offsets[src + 1] += 1
+    for i in range(node_count):
+        offsets[i + 1] += offsets[i]
+
+    targets = array("I", [0]) * len(edges)
+    cursor = offsets[:-1]
+    for src, dst in edges:
+        targets[cursor[src]] = dst
+        cursor[src] += 1
+    return offsets, targets
+
+
+class CallGraph:
+    """Immutable CSR call graph with per-node location attributes."""
+
+    def __init__(
+        self,
+        refids: List[str],
+        attrs: Dict[str, Any],
+        forward: Tuple[array, array],
+        reverse: Tuple[array, array],
+    ):
+        self.refids = refids
+        self._ids = {refid: i for i, refid in enumerate(refids)}
+        self.names: List[str] = attrs["names"]
+        self.kinds: List[str] = attrs["kinds"]
+        self.files: List[str] = attrs["files"]
+        self.lines: array = attrs["lines"]
+        self.bodystarts: array = attrs["bodystarts"]
+        self.bodyends: array = attrs["bodyends"]
+        # Nodes seen only as reference targets have no member record.
+        self.is_member: array = attrs["is_member"]
+        self._fwd_offsets, self._fwd_targets = forward
+        self._rev_offsets, self._rev_targets = reverse
+
+    def __len__(self) -> int:
+        return len(self.refids)
+
+    @property
+    def edge_count(self) -> int:
+        """Number of distinct caller -> callee edges."""
+        return len(self._fwd_targets)
+
+    def node_id(self, refid: str) -> Optional[int]:
+        """Return the integer id of a refid, or None if it is not in the graph."""
+        return self._ids.get(refid)
+
+    def callees(self, node: int) -> array:
+        """Ids of members referenced by a node, in source order."""
+        return self._fwd_targets[self._fwd_offsets[node] : self._fwd_offsets[node + 1]]
+
+    def callers(self, node: int) -> array:
+        """Ids of members that reference a node."""
+        return self._rev_targets[self._rev_offsets[node] : self._rev_offsets[node + 1]]
+
+    def fan_out(self, node: int) -> int:
+        """Number of distinct callees of a node."""
+        return self._fwd_offsets[node + 1] - self._fwd_offsets[node]
+
+    def fan_in(self, node: int) -> int:
+        """Number of distinct callers of a node."""
+        return self._rev_offsets[node + 1] - self._rev_offsets[node]
+
+    def reachable(
+        self, node: int, max_depth: Optional[int] = None, reverse: bool = False
+    ) -> List[Tuple[int, int]]:
+        """
+        Breadth-first reachability from a node.
+
+        Returns (node id, depth) pairs excluding the start node. With
+        ``reverse=True`` the walk follows callers instead of callees.
+        """
+        offsets, targets = (
+            (self._rev_offsets, self._rev_targets)
+            if reverse
+            else (self._fwd_offsets, self._fwd_targets)
+        )
+        seen = {node}
+        result: List[Tuple[int, int]] = []
+        queue = deque([(node, 0)])
+        while queue:
+            current, depth = queue.popleft()
+            if max_depth is not None and depth >= max_depth:
+                continue
+            for nxt in targets[offsets[current] : offsets[current + 1]]:
+                if nxt not in seen:
+                    seen.add(nxt)
+                    result.append((nxt, depth + 1))
+                    queue.append((nxt, depth + 1))
+        return result
+
+    def node(self, node: int) -> Dict[str, Any]:
+        """Return the attributes of a node as a dict."""
+        return {
+            "refid": self.refids[node],
+            "name": self.names[node],
+            "kind": self.kinds[node],
+            "file": self.files[node],
+            "line": self.lines[node],
+            "bodystart": self.bodystarts[node],
+            "bodyend": self.bodyends[node],
+            "is_member": bool(self.is_member[node]),
+        }
+
+
+def _int(value: Any) -> int:
+    """Parse an optional integer attribute, defaulting to 0."""
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+class CallGraphBuilder:
+    """Accumulates members and reference edges, then freezes a `CallGraph`."""
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._refids: List[str] = []
+        self._names: List[str] = []
+        self._kinds: List[str] = []
+        self._files: List[str] = []
+        self._file_intern: Dict[str, str] = {}
+        self._lines = array("i")
+        self._bodystarts = array("i")
+        self._bodyends = array("i")
+        self._is_member = array("b")
+        # Set when a member was registered from a file compound; a class or
+        # namespace listing of the same member gives a better qualified name.
+        self._from_file: Set[int] = set()
+        self._forward: List[Tuple[int, int]] = []
+        self._edge_set: Set[Tuple[int, int]] = set()
+
+    def _node(self, refid: str) -> int:
+        """Return the id for a refid, allocating an attribute-less node if new."""
+        node = self._ids.get(refid)
+        if node is None:
+            node = self._ids[refid] = len(self._refids)
+            self._refids.append(refid)
+            self._names.append("")
+            self._kinds.append("")
+            self._files.append("")
+            self._lines.append(0)
+            self._bodystarts.append(0)
+            self._bodyends.append(0)
+            self._is_member.append(0)
+        return node
+
+    def add_compound(self, record: Dict[str, Any]) -> None:
+        """Add every member of a compound record and its reference edges."""
+        parent_name = record.get("name") or ""
+        parent_is_file = record.get("kind") == "file"
+
+        for member in record["members"]:
+            refid = member.get("refid")
+            if not refid:
+                continue
+            node = self._node(refid)
+
+            if not self._is_member[node] or (
+                node in self._from_file and not parent_is_file
+            ):
+                name = member.get("name") or ""
+                loc = member.get("location") or {}
+                file_name = loc.get("file") or ""
+                self._names[node] = (
+                    f"{parent_name}::{name}"
+                    if parent_name and not parent_is_file
+                    else name
+                )
+                self._kinds[node] = member.get("kind") or ""
+                if file_name or not self._files[node]:
+                    self._files[node] = self._file_intern.setdefault(
+                        file_name, file_name
+                    )
+                self._lines[node] = _int(loc.get("line"))
+                if loc.get("bodystart") or not self._bodystarts[node]:
+                    self._bodystarts[node] = _int(loc.get("bodystart"))
+                    self._bodyends[node] = _int(loc.get("bodyend"))
+                self._is_member[node] = 1
+                if parent_is_file:
+                    self._from_file.add(node)
+                else:
+                    self._from_file.discard(node)
+
+            for ref in member.get("references") or ():
+                if ref.get("refid"):
+                    callee = self._node(ref["refid"])
+                    self._note_body(callee, ref)
+                    self._add_edge(node, callee)
+            for ref in member.get("referencedby") or ():
+                if ref.get("refid"):
+                    caller = self._node(ref["refid"])
+                    self._note_body(caller, ref)
+                    self._add_edge(caller, node)
+
+    def _note_body(self, node: int, ref: Dict[str, Any]) -> None:
+        """
+        Fill in a node's file and body span from a reference naming it, for
+        members whose own record lacks them (or has not been added yet).
+        """
+        if not self._files[node] and ref.get("compoundref"):
+            file_name = ref["compoundref"]
+            self._files[node] = self._file_intern.setdefault(file_name, file_name)
+        if not self._bodystarts[node] and ref.get("startline"):
+            self._bodystarts[node] = _int(ref["startline"])
+            self._bodyends[node] = _int(ref.get("endline"))
+
+    def _add_edge(self, caller: int, callee: int) -> None:
+        edge = (caller, callee)
+        if edge not in self._edge_set:
+            self._edge_set.add(edge)
+            self._forward.append(edge)
+
+    def build(self) -> CallGraph:
+        """Freeze the accumulated data into CSR arrays."""
+        count = len(self._refids)
+        forward = _to_csr(count, self._forward)
+        reverse = _to_csr(count, [(dst, src) for src, dst in self._forward])
+        attrs = {
+            "names": self._names,
+            "kinds": self._kinds,
+            "files": self._files,
+            "lines": self._lines,
+            "bodystarts": self._bodystarts,
+            "bodyends": self._bodyends,
+            "is_member": self._is_member,
+        }
+        return CallGraph(self._refids, attrs, forward, reverse)
@@ -0,0 +1,53 @@
+"""
+Advisory inter-process file locks.
+
+Used to keep several server processes on one machine from rebuilding the
+same on-disk index at once. Locks are taken on a separate ``.lock`` file,
+with ``fcntl.flock`` on POSIX and ``msvcrt.locking`` on Windows.
+"""
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Union
+
+if sys.platform == "win32":
+    import msvcrt  # pylint: disable=import-error
+
+    def _lock(fd: int) -> None:
+        while True:
+            try:
+                # LK_LOCK itself retries for ~10s before giving up
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                time.sleep(0.1)
+
+    def _unlock(fd: int) -> None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _lock(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+
+    def _unlock(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+@contextmanager
+def exclusive_file_lock(lock_path: Union[str, Path]) -> Iterator[None]:
+    """Hold an exclusive lock on lock_path, blocking until it is available."""
+    fd = os.open(str(lock_path), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        _lock(fd)
+        try:
+            yield
+        finally:
+            _unlock(fd)
+    finally:
+        os.close(fd)
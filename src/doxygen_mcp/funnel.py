@@ -10,13 +10,13 @@ import subprocess
 import sys
 from pathlib import Path
 
-import defusedxml.ElementTree as ET
+from . import xml_backend
 
 
 def minify_xml_file(filepath):
     """Minifies a Doxygen XML file while preserving AI-critical metadata."""
     try:
-        tree = ET.parse(filepath)
+        tree = xml_backend.parse(filepath)
         root = tree.getroot()
         if root is None:
             return False
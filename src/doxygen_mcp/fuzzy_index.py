@@ -0,0 +1,143 @@
+"""
+Typo-tolerant name lookup for "did you mean" suggestions.
+
+A symmetric-delete (SymSpell-style) dictionary: each indexed name is stored
+under itself and every string obtained by deleting one of its characters.
+A query generates its own deletes (up to two characters); a stored name is
+a candidate when both sides reach the same string, and candidates are then
+verified with a bounded edit distance. This finds every name within one
+edit of the query, plus two-edit typos where the query has the extra or
+swapped characters, while touching only a handful of names per lookup.
+
+Storing only single deletes keeps the dictionary at ~len(name) entries per
+name; entries are packed hash/term-id integers in one sorted array rather
+than a dict of strings, so 100k names cost tens of MB instead of hundreds.
+"""
+
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+MAX_DISTANCE = 2
+
+_ID_BITS = 24
+_ID_MASK = (1 << _ID_BITS) - 1
+_HASH_MASK = (1 << (64 - _ID_BITS)) - 1
+
+
+def _deletes(text: str, max_distance: int) -> Set[str]:
+    """Return text and every string formed by deleting up to max_distance chars."""
+    found = {text}
+    frontier = [text]
+    for _ in range(max_distance):
+        next_frontier = []
+        for item in frontier:
+            for i in range(len(item)):
+                deleted = item[:i] + item[i + 1 :]
+                if deleted not in found:
+                    found.add(deleted)
+                    next_frontier.append(deleted)
+        frontier = next_frontier
+    return found
+
+
+def _key(text: str) -> int:
+    return hash(text) & _HASH_MASK
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Optimal string alignment distance (Levenshtein plus adjacent
+    transpositions), or max_distance + 1 once it is known to exceed the bound.
+    """
+    over = max_distance + 1
+    if abs(len(a) - len(b)) > max_distance:
+        return over
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [over] * len(b)
+        # Only cells within the diagonal band can stay under the bound
+        lo = max(1, i - max_distance)
+        hi = min(len(b), i + max_distance)
+        row_min = i if lo == 1 else over
+        for j in range(lo, hi + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (
+                i > 1
+                and j > 1
+                and a[i - 1] == b[j - 2]
+                and a[i - 2] == b[j - 1]
+                and previous2[j - 2] + 1 < value
+            ):
+                value = previous2[j - 2] + 1
+            current[j] = value
+            row_min = min(row_min, value)
+        if row_min > max_distance:
+            return over
+        previous2, previous = previous, current
+    return min(previous[len(b)], over)
+
+
+class FuzzyNameIndex:
+    """Immutable symmetric-delete index over lower-cased names with payloads."""
+
+    def __init__(self, items: Iterable[Tuple[str, Any]]):
+        self._terms: List[str] = []
+        self._payloads: List[List[Any]] = []
+        term_ids: Dict[str, int] = {}
+        for term, payload in items:
+            term = term.lower()
+            term_id = term_ids.get(term)
+            if term_id is None:
+                term_id = term_ids[term] = len(self._terms)
+                self._terms.append(term)
+                self._payloads.append([])
+            self._payloads[term_id].append(payload)
+
+        entries = []
+        for term_id, term in enumerate(self._terms):
+            entries.append(_key(term) << _ID_BITS | term_id)
+            entries.extend(
+                _key(term[:i] + term[i + 1 :]) << _ID_BITS | term_id
+                for i in range(len(term))
+            )
+        entries.sort()
+        self._entries = array("Q", entries)
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def _candidates(self, key: int) -> Iterable[int]:
+        entries = self._entries
+        i = bisect_left(entries, key << _ID_BITS)
+        while i < len(entries) and entries[i] >> _ID_BITS == key:
+            yield entries[i] & _ID_MASK
+            i += 1
+
+    def lookup(
+        self, query: str, limit: int = 5, max_distance: int = MAX_DISTANCE
+    ) -> List[Tuple[int, str, List[Any]]]:
+        """
+        Return up to `limit` (distance, name, payloads) close to query,
+        closest first, then shortest name, then alphabetical.
+        """
+        query = query.lower()
+        bound = max(0, min(max_distance, MAX_DISTANCE))
+        seen: Set[int] = set()
+        matches = []
+        for text in _deletes(query, bound):
+            for term_id in self._candidates(_key(text)):
+                if term_id in seen:
+                    continue
+                seen.add(term_id)
+                term = self._terms[term_id]
+                distance = edit_distance(query, term, bound)
+                if distance <= bound:
+                    matches.append((distance, len(term), term, term_id))
+        matches.sort()
+        return [
+            (distance, term, self._payloads[term_id])
+            for distance, _, term, term_id in matches[:limit]
+        ]
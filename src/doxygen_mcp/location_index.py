@@ -0,0 +1,171 @@
+"""
+Source-location lookups for Doxygen members.
+
+`LocationIndex` maps a normalized file path to the sorted declaration lines
+of the members defined there, so "what is defined at file:line" is a dict
+lookup plus a bisect instead of a scan over every compound.
+`FileIntervalIndex` answers "which symbol encloses this line" for one file
+from its members' body ranges.
+"""
+
+import posixpath
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def normalize_source_path(path: str) -> str:
+    """Normalize a source path for use as an index key (POSIX separators)."""
+    normalized = posixpath.normpath(path.replace("\\", "/"))
+    return "" if normalized == "." else normalized
+
+
+class LocationIndex:
+    """File path -> sorted (line, member refid) lookup table."""
+
+    def __init__(self):
+        self._pending: Dict[str, List[Tuple[int, str]]] = {}
+        self._lines: Dict[str, array] = {}
+        self._refids: Dict[str, List[str]] = {}
+        self._by_basename: Dict[str, List[str]] = {}
+
+    def add(self, file_path: str, line: int, refid: str) -> None:
+        """Record that `refid` is declared at `file_path:line`."""
+        key = normalize_source_path(file_path)
+        if key and line > 0:
+            self._pending.setdefault(key, []).append((line, refid))
+
+    def freeze(self) -> "LocationIndex":
+        """Sort the accumulated entries; call once after the last `add`."""
+        for key, entries in self._pending.items():
+            entries.sort()
+            self._lines[key] = array("I", [line for line, _ in entries])
+            self._refids[key] = [refid for _, refid in entries]
+            self._by_basename.setdefault(posixpath.basename(key), []).append(key)
+        self._pending = {}
+        return self
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def resolve_file(self, file_path: str) -> Optional[str]:
+        """
+        Return the indexed key for a path.
+
+        Tries the exact normalized path first, then indexed paths sharing the
+        basename: the longest indexed path that is a suffix of the input (for
+        absolute inputs), else the single indexed path ending with the input.
+        Ambiguous inputs resolve to None.
+        """
+        key = normalize_source_path(file_path)
+        if key in self._lines:
+            return key
+
+        candidates = self._by_basename.get(posixpath.basename(key))
+        if not candidates:
+            return None
+
+        suffixes = [c for c in candidates if key.endswith("/" + c)]
+        if suffixes:
+            return max(suffixes, key=len)
+        extensions = [c for c in candidates if c.endswith("/" + key)]
+        if len(extensions) == 1:
+            return extensions[0]
+        if not extensions and len(candidates) == 1:
+            return candidates[0]
+        return None
+
+    def at(self, file_path: str, line: int) -> Optional[str]:
+        """Return the refid of the first member declared exactly at file:line."""
+        key = self.resolve_file(file_path)
+        if key is None:
+            return None
+        lines = self._lines[key]
+        pos = bisect_left(lines, line)
+        if pos < len(lines) and lines[pos] == line:
+            return self._refids[key][pos]
+        return None
+
+    def preceding(self, file_path: str, line: int) -> Optional[Tuple[int, str]]:
+        """Return (line, refid) of the last member declared at or before `line`."""
+        key = self.resolve_file(file_path)
+        if key is None:
+            return None
+        lines = self._lines[key]
+        pos = bisect_right(lines, line) - 1
+        if pos < 0:
+            return None
+        return lines[pos], self._refids[key][pos]
+
+
+class FileIntervalIndex:
+    """
+    Innermost-enclosing-symbol lookup over the body ranges of one file.
+
+    Source ranges nest (a method inside a class inside a namespace), so the
+    ranges are sorted by start and each one records its nearest enclosing
+    range. A query bisects to the last range starting at or before the line
+    and walks outwards until a range contains it: O(log n + nesting depth).
+    Lines outside every range fall back to the closest preceding declaration.
+    """
+
+    def __init__(self, symbols: List[Dict[str, Any]]):
+        # (start, -end, insertion order, symbol)
+        spans: List[Tuple[int, int, int, Dict[str, Any]]] = []
+        # (declaration line, insertion order, symbol)
+        declarations: List[Tuple[int, int, Dict[str, Any]]] = []
+        for symbol in symbols:
+            loc = symbol.get("location") or {}
+            line = _as_int(loc.get("line"))
+            start = _as_int(loc.get("bodystart")) or line
+            end = _as_int(loc.get("bodyend"))
+            if start <= 0:
+                continue
+            if line > 0:
+                declarations.append((line, len(declarations), symbol))
+            if end < start:
+                end = start
+            # Longer range first on equal starts so it becomes the parent.
+            spans.append((start, -end, len(spans), symbol))
+
+        spans.sort(key=lambda s: (s[0], s[1], s[2]))
+        self._starts = array("I", [s[0] for s in spans])
+        self._ends = array("I", [-s[1] for s in spans])
+        self._symbols = [s[3] for s in spans]
+        self._parents = array("i", [-1]) * len(spans)
+
+        stack: List[int] = []
+        for i, start in enumerate(self._starts):
+            while stack and self._ends[stack[-1]] < start:
+                stack.pop()
+            if stack:
+                self._parents[i] = stack[-1]
+            stack.append(i)
+
+        declarations.sort(key=lambda d: (d[0], d[1]))
+        self._decl_lines = array("I", [d[0] for d in declarations])
+        self._decl_symbols = [d[2] for d in declarations]
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    def lookup(self, line: int) -> Optional[Dict[str, Any]]:
+        """Return the innermost symbol whose body contains `line`."""
+        i = bisect_right(self._starts, line) - 1
+        while i >= 0:
+            if self._ends[i] >= line:
+                return self._symbols[i]
+            i = self._parents[i]
+
+        pos = bisect_right(self._decl_lines, line) - 1
+        if pos >= 0:
+            return self._decl_symbols[pos]
+        return None
+
+
+def _as_int(value: Any) -> int:
+    """Parse an optional integer attribute, defaulting to 0."""
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
@@ -0,0 +1,67 @@
+"""
+Compact in-memory model of the compounds listed in index.xml.
+
+Every compound used to be a three-key dict shared by several lookup maps;
+on large projects those dicts dominated the engine's footprint. A slotted
+`CompoundInfo` stores the same fields in a fraction of the memory and keeps
+read-only dict-style access (``info["refid"]``, ``info.get("kind")``) for
+existing callers. Kind and file strings repeat across thousands of entries
+and are interned so each distinct value is stored once.
+"""
+
+import sys
+from typing import Any, Dict, Iterator, Optional
+
+
+def intern_optional(value: Optional[str]) -> Optional[str]:
+    """Intern a string attribute value, passing None through."""
+    return sys.intern(value) if value else value
+
+
+class CompoundInfo:
+    """Name, kind and refid of one compound."""
+
+    __slots__ = ("name", "kind", "refid")
+
+    def __init__(self, name: str, kind: Optional[str], refid: Optional[str]):
+        self.name = name
+        self.kind = intern_optional(kind)
+        self.refid = refid
+
+    def __getitem__(self, key: str) -> Any:
+        if key in CompoundInfo.__slots__:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in CompoundInfo.__slots__
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(CompoundInfo.__slots__)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in CompoundInfo.__slots__:
+            return getattr(self, key)
+        return default
+
+    def keys(self):
+        return CompoundInfo.__slots__
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"kind": self.kind, "refid": self.refid, "name": self.name}
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CompoundInfo):
+            return (self.name, self.kind, self.refid) == (
+                other.name,
+                other.kind,
+                other.refid,
+            )
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"CompoundInfo({self.name!r}, {self.kind!r}, {self.refid!r})"
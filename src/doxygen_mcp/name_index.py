@@ -0,0 +1,91 @@
+"""
+Kind-partitioned, sorted compound name lists for listing and pagination.
+
+Listing every class, namespace or file used to scan the full compound map
+on each call. `SortedNameIndex` sorts the names of each kind once, so a
+full listing is a list copy and a page is a binary search plus a slice.
+Pages use keyset cursors (the last name returned), which stay valid when
+the index is reloaded between requests: the next page simply starts after
+that name in the new listing.
+"""
+
+import base64
+import binascii
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, List, Optional
+
+from .model import CompoundInfo
+
+DEFAULT_PAGE_SIZE = 200
+MAX_PAGE_SIZE = 1000
+
+# Sorts after every character that can appear in a symbol name; used as the
+# exclusive upper bound of a prefix range.
+_PREFIX_END = "\U0010ffff"
+
+
+def encode_cursor(name: str) -> str:
+    """Encode the last name of a page as an opaque cursor."""
+    return base64.urlsafe_b64encode(name.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> str:
+    """Decode a cursor produced by `encode_cursor`."""
+    try:
+        return base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+    except (UnicodeError, binascii.Error, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+class SortedNameIndex:
+    """Compound names sorted per kind, plus one sorted list over all kinds."""
+
+    def __init__(self, infos: Iterable[CompoundInfo]):
+        by_kind: Dict[str, List[str]] = {}
+        for info in infos:
+            by_kind.setdefault(info.kind or "", []).append(info.name)
+        for names in by_kind.values():
+            names.sort()
+        self._by_kind = by_kind
+        self._all = sorted(name for names in by_kind.values() for name in names)
+
+    def kinds(self) -> List[str]:
+        """Return the compound kinds present, sorted."""
+        return sorted(self._by_kind)
+
+    def names(self, kind: Optional[str] = None) -> List[str]:
+        """Return the sorted names of one kind (or of every kind). Do not mutate."""
+        if kind is None:
+            return self._all
+        return self._by_kind.get(kind, [])
+
+    def count(self, kind: Optional[str] = None) -> int:
+        return len(self.names(kind))
+
+    def page(
+        self,
+        kind: Optional[str] = None,
+        prefix: str = "",
+        cursor: Optional[str] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> Dict[str, Any]:
+        """
+        Return one page of names of `kind` starting with `prefix`.
+
+        `cursor` is the `next_cursor` of the previous page; it is None on the
+        last page. `total` counts every name matching kind and prefix.
+        """
+        page_size = max(1, min(int(page_size), MAX_PAGE_SIZE))
+        names = self.names(kind)
+        lo = bisect_left(names, prefix)
+        hi = bisect_left(names, prefix + _PREFIX_END, lo) if prefix else len(names)
+        start = lo
+        if cursor:
+            start = max(lo, bisect_right(names, decode_cursor(cursor), lo, hi))
+        end = min(start + page_size, hi)
+        items = names[start:end]
+        return {
+            "items": items,
+            "total": hi - lo,
+            "next_cursor": encode_cursor(items[-1]) if end < hi else None,
+        }
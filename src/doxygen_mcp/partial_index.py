@@ -0,0 +1,115 @@
+"""
+Partial-match name index for the Doxygen query engine.
+
+Stores trigram postings over lower-cased symbol names so substring lookups
+stay linear in the size of the index instead of quadratic in name length.
+"""
+
+import heapq
+from array import array
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Characters that separate scope components or words inside symbol names.
+# A match starting right after one of these is treated as a "closer" hit.
+_BOUNDARY_CHARS = frozenset(":./\\<>,_ ")
+
+
+def _trigrams(text: str) -> Iterable[str]:
+    """Yield the distinct trigrams of a string."""
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def _rank(name: str, query: str, demoted: bool) -> Tuple[int, int, int, int, int, str]:
+    """
+    Sort key: names whose last scope component is the query first, then
+    boundary matches, then names not demoted by the caller, then shortest
+    name, then earliest hit.
+    """
+    pos = name.find(query)
+    at_boundary = pos == 0 or name[pos - 1] in _BOUNDARY_CHARS
+    return (
+        0 if name.rsplit("::", 1)[-1] == query else 1,
+        0 if at_boundary else 1,
+        1 if demoted else 0,
+        len(name) - len(query),
+        pos,
+        name,
+    )
+
+
+class PartialMatchIndex:
+    """Trigram postings index for ranked substring lookups over names."""
+
+    def __init__(self):
+        self._names: List[str] = []
+        self._postings: Dict[str, array] = {}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, name: str) -> None:
+        """Index a (lower-cased) name."""
+        name_id = len(self._names)
+        self._names.append(name)
+        for gram in _trigrams(name):
+            posting = self._postings.get(gram)
+            if posting is None:
+                posting = self._postings[gram] = array("I")
+            posting.append(name_id)
+
+    def to_state(self) -> Dict[str, Any]:
+        """Export the index as plain data (for persistent snapshots)."""
+        return {
+            "names": self._names,
+            "postings": {g: p.tobytes() for g, p in self._postings.items()},
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "PartialMatchIndex":
+        """Rebuild an index from data produced by `to_state`."""
+        index = cls()
+        index._names = list(state["names"])
+        for gram, raw in state["postings"].items():
+            posting = array("I")
+            posting.frombytes(raw)
+            index._postings[gram] = posting
+        return index
+
+    def _candidates(self, query: str) -> Iterable[int]:
+        """Return ids of names that may contain the query."""
+        if len(query) < 3:
+            # Too short for trigram filtering; verify every name instead.
+            return range(len(self._names))
+
+        # Every match must appear in the rarest trigram's posting list, and the
+        # caller verifies the full substring, so intersecting the rest is moot.
+        shortest = None
+        for gram in _trigrams(query):
+            posting = self._postings.get(gram)
+            if posting is None:
+                return ()
+            if shortest is None or len(posting) < len(shortest):
+                shortest = posting
+        return shortest or ()
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        demote: Optional[Callable[[str], bool]] = None,
+    ) -> List[str]:
+        """
+        Return up to `limit` indexed names containing `query`, best match first.
+
+        `demote` marks names that should lose to otherwise equally close ones.
+        """
+        if not query or limit <= 0:
+            return []
+
+        names = self._names
+        matches = [names[i] for i in self._candidates(query) if query in names[i]]
+        return heapq.nsmallest(
+            limit,
+            matches,
+            key=lambda n: _rank(n, query, demote is not None and demote(n)),
+        )
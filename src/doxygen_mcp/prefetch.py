@@ -0,0 +1,195 @@
+"""
+Low-priority background prefetch of compound records.
+
+After an engine is served, a daemon thread parses compound XML files into the
+shared compound cache so early queries find their records already parsed.
+Compounds are taken in priority order:
+
+0. classes and namespaces declared in files that were just prefetched,
+1. file compounds whose source file was modified most recently,
+2. everything else, highest fan-in first (summed over the compound's members
+   when the call graph is built, otherwise approximated by member count).
+
+The thread backs off whenever the engine served a foreground record request
+within the idle interval, and stops once the cache is nearly full so it never
+evicts entries that foreground requests put there. On Linux the thread is
+also reniced to the lowest CPU priority; other platforms only get the idle
+back-off.
+"""
+
+import heapq
+import logging
+import os
+import sys
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from .cache import COMPOUND_CACHE
+
+if TYPE_CHECKING:
+    from .query_engine import DoxygenQueryEngine
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IDLE_SECONDS = 0.05
+# Stop prefetching once the shared cache holds this share of its budget.
+DEFAULT_FILL_RATIO = 0.9
+
+_TIER_INNER, _TIER_RECENT_FILE, _TIER_REST = 0, 1, 2
+
+
+def prefetch_enabled() -> bool:
+    """Return True when DOXYGEN_PREFETCH asks for background prefetching."""
+    val = os.environ.get("DOXYGEN_PREFETCH", "")
+    return bool(val) and val.lower() not in ("false", "0", "no", "off")
+
+
+def _lower_thread_priority() -> None:
+    """
+    Renice the calling thread. Linux only: it applies niceness per thread,
+    while elsewhere the thread id would be taken as a process id.
+    """
+    if not sys.platform.startswith("linux"):
+        return
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+    except (AttributeError, OSError):
+        pass
+
+
+class Prefetcher:
+    """Daemon thread that parses one engine's compounds into the shared cache."""
+
+    def __init__(
+        self,
+        engine: "DoxygenQueryEngine",
+        idle_seconds: float = DEFAULT_IDLE_SECONDS,
+        fill_ratio: float = DEFAULT_FILL_RATIO,
+    ):
+        self.engine = engine
+        self.idle_seconds = idle_seconds
+        self.fill_ratio = fill_ratio
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="doxygen-prefetch", daemon=True
+        )
+        self.prefetched = 0
+        self.skipped = 0
+        self.errors = 0
+        self.state = "pending"
+
+    def start(self) -> "Prefetcher":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Ask the thread to stop after the compound it is parsing."""
+        self._stop.set()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "prefetched": self.prefetched,
+            "skipped": self.skipped,
+            "errors": self.errors,
+        }
+
+    def plan(self) -> List[Tuple[int, float, str]]:
+        """Return the initial (tier, rank, refid) heap of compounds to parse."""
+        # pylint: disable=protected-access
+        engine = self.engine
+        compounds = list(engine._compound_by_refid.items())
+
+        scores: Dict[str, int] = {}
+        graph = engine._call_graph
+        parents = engine._member_parent_map
+        if graph is not None:
+            for node, refid in enumerate(graph.refids):
+                parent = parents.get(refid)
+                if parent is not None:
+                    scores[parent] = scores.get(parent, 0) + graph.fan_in(node)
+        else:
+            for parent in parents.values():
+                scores[parent] = scores.get(parent, 0) + 1
+
+        heap = []
+        repo_files = None
+        for refid, info in compounds:
+            if info.get("kind") == "file":
+                if repo_files is None:
+                    repo_files = engine.get_repo_files()
+                path = repo_files.find(info.get("name") or "")
+                try:
+                    mtime = path.stat().st_mtime if path is not None else None
+                except OSError:
+                    mtime = None
+                if mtime is not None:
+                    heap.append((_TIER_RECENT_FILE, -mtime, refid))
+                    continue
+            heap.append((_TIER_REST, -scores.get(refid, 0), refid))
+        heapq.heapify(heap)
+        return heap
+
+    def _wait_for_idle(self) -> None:
+        """Sleep while the engine is serving foreground record requests."""
+        while not self._stop.is_set():
+            last = self.engine._last_foreground  # pylint: disable=protected-access
+            busy_for = self.idle_seconds - (time.monotonic() - last)
+            if busy_for <= 0:
+                return
+            self._stop.wait(busy_for)
+
+    def _cache_full(self) -> bool:
+        stats = COMPOUND_CACHE.stats()
+        return stats["used_bytes"] >= stats["budget_bytes"] * self.fill_ratio
+
+    def _run(self) -> None:
+        # pylint: disable=protected-access
+        _lower_thread_priority()
+        self.state = "running"
+        try:
+            heap = self.plan()
+            done = set()
+            namespace = self.engine._cache_namespace
+            while heap and not self._stop.is_set():
+                if self._cache_full():
+                    self.state = "cache_full"
+                    return
+                self._wait_for_idle()
+                if self._stop.is_set():
+                    break
+
+                _, _, refid = heapq.heappop(heap)
+                if refid in done:
+                    continue
+                done.add(refid)
+                if COMPOUND_CACHE.contains(namespace, ("record", refid)):
+                    self.skipped += 1
+                    continue
+
+                record = self.engine._prefetch_record(refid)
+                if record is None:
+                    self.errors += 1
+                    continue
+                self.prefetched += 1
+                for inner in record["inner_classes"] + record["inner_namespaces"]:
+                    if inner not in done:
+                        heapq.heappush(heap, (_TIER_INNER, self.prefetched, inner))
+                # Let a waiting foreground thread take the GIL.
+                time.sleep(0)
+            self.state = "stopped" if self._stop.is_set() else "done"
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Compound prefetch failed: %s", e)
+            self.state = "failed"
+        finally:
+            logger.info(
+                "Prefetch %s: %d parsed, %d already cached, %d errors",
+                self.state,
+                self.prefetched,
+                self.skipped,
+                self.errors,
+            )
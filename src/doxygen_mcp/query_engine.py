@@ -7,116 +7,512 @@ symbols, structures, and documentation.
 
 import ast
 import asyncio
+import itertools
 import logging
+import os
 import re
 import subprocess
-from concurrent.futures import ThreadPoolExecutor
-from functools import lru_cache
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, ClassVar, Dict, List, Optional, Tuple
 
-import defusedxml.ElementTree as ET
-
+from . import xml_backend
+from .cache import COMPOUND_CACHE, estimate_sampled_size
+from .call_graph import CallGraph, CallGraphBuilder
+from .fuzzy_index import FuzzyNameIndex
+from .location_index import FileIntervalIndex, LocationIndex
+from .model import CompoundInfo, intern_optional
+from .name_index import DEFAULT_PAGE_SIZE, SortedNameIndex
+from .partial_index import PartialMatchIndex
+from .prefetch import Prefetcher, prefetch_enabled
+from .records import element_location, element_text, parse_compound_record
+from .registry import EngineRegistry, index_stat_fingerprint, retire_engine
+from .repo_files import RepoFileIndex
 from .search import DoxygenSearchIndex
+from .snapshot import (
+    SNAPSHOT_FILENAME,
+    index_fingerprint,
+    load_snapshot,
+    pack_repeated,
+    unpack_repeated,
+    write_snapshot,
+)
+from .source_cache import SOURCE_CACHE
+from .warmup import default_workers, parse_compounds, warmup_mode
 
 logger = logging.getLogger(__name__)
 
+# Record-only member fields that are not part of the details payload.
+_RECORD_ONLY_MEMBER_KEYS = frozenset(("params", "documented_params"))
+
+
+def _detail_member(member: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a record member into the shape returned by compound details."""
+    return {k: v for k, v in member.items() if k not in _RECORD_ONLY_MEMBER_KEYS}
+
 
 class DoxygenQueryEngine:
     """Engine for querying Doxygen XML documentation."""
 
-    _cache: ClassVar[Dict[str, "DoxygenQueryEngine"]] = {}
+    # Absolute XML directory -> engine, validated against index.xml on lookup
+    _cache: ClassVar[EngineRegistry] = EngineRegistry()
+    # Absolute XML directory -> in-progress load shared by concurrent create()s
+    _pending: ClassVar[Dict[str, "Future[DoxygenQueryEngine]"]] = {}
+    _pending_lock: ClassVar[threading.Lock] = threading.Lock()
+    _instance_ids: ClassVar["itertools.count[int]"] = itertools.count(1)
+    # Files whose interval index is kept for cursor lookups
+    _MAX_FILE_INTERVALS: ClassVar[int] = 256
 
     def __init__(self, xml_dir: str):
         """Initialize the query engine with an XML directory."""
         # Resolve path once during initialization to avoid repeated syscalls
         self.xml_dir = Path(xml_dir).resolve()
         self.index_path = self.xml_dir / "index.xml"
+        self.snapshot_path = self.xml_dir / SNAPSHOT_FILENAME
+        # Set by the engine registry: how many engines were loaded for xml_dir
+        self.generation = 0
+        # Bumped whenever a lazily built index grows the engine, so the
+        # registry knows to re-estimate its memory; see estimated_memory()
+        self.memory_epoch = 0
+        # Key prefix for this engine's entries in the shared compound cache
+        self._cache_namespace = f"{self.xml_dir}#{next(self._instance_ids)}"
+        # Set once the registry replaces or evicts this engine; requests still
+        # running on it then stop writing to the shared cache
+        self._retired = False
+
+        self.search_index = DoxygenSearchIndex(
+            str(self.xml_dir), record_loader=self.get_compound_record
+        )
 
-        self.search_index = DoxygenSearchIndex(str(self.xml_dir))
-
-        self.compounds: Dict[str, Any] = {}
+        self.compounds: Dict[str, CompoundInfo] = {}
         # Optimization indices
-        self._lower_map: Dict[str, Any] = {}  # lower_case_name -> info
-        self._substring_map: Dict[str, Any] = (
-            {}
-        )  # substring -> info for O(1) partial match
-        self._file_map: Dict[str, List[Dict[str, Any]]] = {}  # basename -> list of info
-        self._files: List[Tuple[str, Dict[str, Any]]] = (
-            []
-        )  # list of (name, info) for kind="file"
-        self._member_parent_map: Dict[str, str] = {}  # member refid -> compound refid
+        self._lower_map: Dict[str, CompoundInfo] = {}  # lower_case_name -> info
+        # Trigram index over lower-cased names for ranked partial matches
+        self._partial_index = PartialMatchIndex()
+        self._file_map: Dict[str, List[CompoundInfo]] = {}  # basename -> infos
+        self._files: List[CompoundInfo] = []  # infos of kind="file", in index order
+        # Per-kind sorted names, built on first listing; see _names()
+        self._name_index: Optional[SortedNameIndex] = None
+        self._compound_by_refid: Dict[str, CompoundInfo] = {}  # refid -> info
+        # Guards materializing the member maps deferred by a snapshot restore
+        self._members_lock = threading.Lock()
+        self._member_parent_map = {}  # member refid -> compound refid
+        # lower-cased member name -> [(member refid, parent refid, kind)]
+        self._member_index = {}
+        # Built together on first use from every compound record; see
+        # get_call_graph() and get_location_index()
+        self._call_graph: Optional[CallGraph] = None
+        self._location_index: Optional[LocationIndex] = None
+        self._record_indices_lock = threading.Lock()
+        # Typo-tolerant index over compound and member names; see get_fuzzy_index()
+        self._fuzzy_index: Optional[FuzzyNameIndex] = None
+        self._fuzzy_index_lock = threading.Lock()
+        # basename -> interval index over that file's symbols (LRU-bounded)
+        self._file_intervals: "OrderedDict[str, FileIntervalIndex]" = OrderedDict()
+        self._file_intervals_lock = threading.Lock()
+        # Repository file listing for resolving Doxygen paths; see get_repo_files()
+        self._repo_files: Optional[RepoFileIndex] = None
+        self._repo_files_lock = threading.Lock()
+        # Monotonic time of the last foreground record access; the background
+        # prefetcher backs off while this is recent
+        self._last_foreground = 0.0
+        self._prefetcher: Optional[Prefetcher] = None
+
+    def _materialize_members(self):
+        """Build the member maps from rows deferred by a snapshot restore."""
+        if self._member_rows_pending is None:
+            return
+        with self._members_lock:
+            pending = self._member_rows_pending
+            if pending is None:
+                return
+            packed_names, refids, packed_parents, packed_kinds = pending
+            names = unpack_repeated(packed_names)
+            parents = unpack_repeated(packed_parents)
+            kinds = unpack_repeated(packed_kinds)
+
+            parent_map = dict(zip(refids, parents))
+            member_index: Dict[str, List[Tuple[str, str, str]]] = {}
+            for name, refid, parent, kind in zip(names, refids, parents, kinds):
+                entry = (refid, parent, kind)
+                bucket = member_index.get(name)
+                if bucket is None:
+                    member_index[name] = [entry]
+                else:
+                    bucket.append(entry)
+            # Publish the maps before clearing pending: a thread that sees
+            # pending=None without taking the lock must find them built
+            self._member_parent_dict = parent_map
+            self._member_index_dict = member_index
+            self._member_rows_pending = None
+            self.memory_epoch += 1
+
+    @property
+    def _member_parent_map(self) -> Dict[str, str]:
+        """Member refid -> compound refid (materialized lazily after a restore)."""
+        self._materialize_members()
+        return self._member_parent_dict
+
+    @_member_parent_map.setter
+    def _member_parent_map(self, value: Dict[str, str]):
+        self._member_rows_pending = None
+        self._member_parent_dict = value
+
+    @property
+    def _member_index(self) -> Dict[str, List[Tuple[str, str, str]]]:
+        """Lower-cased member name -> [(member refid, parent refid, kind)]."""
+        self._materialize_members()
+        return self._member_index_dict
+
+    @_member_index.setter
+    def _member_index(self, value: Dict[str, List[Tuple[str, str, str]]]):
+        self._member_rows_pending = None
+        self._member_index_dict = value
 
     @classmethod
     async def create(cls, xml_dir: str) -> "DoxygenQueryEngine":
-        """Factory method to create or retrieve a cached engine instance."""
+        """
+        Factory method to create or retrieve a cached engine instance.
+
+        Loading is single-flight per directory: concurrent callers await the
+        load already in progress instead of starting their own.
+        """
+        xml_path = str(Path(xml_dir).absolute())
+        # While a reload is in flight the current generation keeps serving
+        engine = cls._cache.lookup(xml_path, stale_ok=xml_path in cls._pending)
+        if engine is not None:
+            return engine
+
+        with cls._pending_lock:
+            future = cls._pending.get(xml_path)
+            if future is None:
+                future = cls._start_load(xml_dir, xml_path)
+        return await asyncio.wrap_future(future)
+
+    @classmethod
+    async def reserve_reload(cls, xml_dir: str) -> "Future[DoxygenQueryEngine]":
+        """
+        Publish a pending load for xml_dir before its XML is rewritten.
+
+        Until `reload(xml_dir, reserved)` runs it, create() keeps serving the
+        registered engine (or waits for this load) instead of starting a cold
+        load of half-written XML. The caller must always pass the returned
+        future to reload(), or every later create() waits forever.
+        """
         xml_path = str(Path(xml_dir).absolute())
-        if xml_path in cls._cache:
-            return cls._cache[xml_path]
+        while True:
+            with cls._pending_lock:
+                in_flight = cls._pending.get(xml_path)
+                if in_flight is None:
+                    future: "Future[DoxygenQueryEngine]" = Future()
+                    cls._pending[xml_path] = future
+                    return future
+            # A load that started earlier may have read the old XML; let it
+            # finish, then load again.
+            try:
+                await asyncio.wrap_future(in_flight)
+            except Exception:  # pylint: disable=broad-exception-caught
+                pass
+
+    @classmethod
+    async def reload(
+        cls,
+        xml_dir: str,
+        reserved: "Optional[Future[DoxygenQueryEngine]]" = None,
+    ) -> "DoxygenQueryEngine":
+        """
+        Load a new engine generation from the current XML and swap it in.
+
+        The registered engine keeps answering create() until the new one is
+        fully loaded; registration then replaces it atomically and retires
+        the old generation. Pass the future from `reserve_reload()` when the
+        XML was rewritten after reserving.
+        """
+        xml_path = str(Path(xml_dir).absolute())
+        future = reserved if reserved is not None else await cls.reserve_reload(xml_dir)
+        # The load runs to completion even if this caller is cancelled
+        asyncio.get_running_loop().run_in_executor(
+            None, cls._load_engine, xml_dir, xml_path, future
+        )
+        return await asyncio.wrap_future(future)
+
+    @classmethod
+    def _start_load(cls, xml_dir: str, xml_path: str) -> "Future[DoxygenQueryEngine]":
+        """Publish a pending load and run it in the background; hold _pending_lock."""
+        future: "Future[DoxygenQueryEngine]" = Future()
+        cls._pending[xml_path] = future
+        # The load runs to completion (and resolves the future for every
+        # waiter) even if the caller that started it is cancelled.
+        asyncio.get_running_loop().run_in_executor(
+            None, cls._load_engine, xml_dir, xml_path, future
+        )
+        return future
 
-        self = cls(xml_dir)
-        # pylint: disable=no-member
-        await asyncio.to_thread(self._load_index)
-        cls._cache[xml_path] = self
-        return self
+    @classmethod
+    def _load_engine(
+        cls, xml_dir: str, xml_path: str, future: "Future[DoxygenQueryEngine]"
+    ):
+        """Load and register an engine, resolving the shared creation future."""
+        self = error = None
+        try:
+            self = cls(xml_dir)
+            # Fingerprint before loading so a rewrite during the load is noticed
+            fingerprint = index_stat_fingerprint(self.index_path)
+            self._load_index()
+            if warmup_mode() == "full":
+                self.warm_up()
+            cls._cache.register(xml_path, self, fingerprint)
+            if prefetch_enabled():
+                self.start_prefetch()
+        except BaseException as e:  # pylint: disable=broad-exception-caught
+            error = e
+
+        # Unpublish before resolving, so no later caller joins a finished load
+        with cls._pending_lock:
+            if cls._pending.get(xml_path) is future:
+                del cls._pending[xml_path]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(self)
 
     @classmethod
     def clear_cache(cls, xml_dir: Optional[str] = None):
         """Clear the engine instance cache."""
         if xml_dir:
             xml_path = str(Path(xml_dir).absolute())
-            if xml_path in cls._cache:
-                del cls._cache[xml_path]
+            engine = cls._cache.pop(xml_path, None)
+            if engine is not None:
+                retire_engine(engine)
         else:
+            for engine in cls._cache.values():
+                retire_engine(engine)
             cls._cache.clear()
 
+    def start_prefetch(self, **kwargs) -> Prefetcher:
+        """Start (or return the running) background compound prefetcher."""
+        if self._prefetcher is None:
+            self._prefetcher = Prefetcher(self, **kwargs).start()
+        return self._prefetcher
+
+    def stop_prefetch(self):
+        """Signal the background prefetcher, if any, to stop."""
+        if self._prefetcher is not None:
+            self._prefetcher.stop()
+
+    def estimated_memory(self) -> int:
+        """
+        Approximate bytes held by this engine's indices (not the shared caches),
+        including the lazily built ones as they currently stand.
+        """
+        total = estimate_sampled_size(self.compounds)
+        # These share their info dicts with self.compounds
+        for alias in (self._lower_map, self._compound_by_refid, self._file_map):
+            total += sys.getsizeof(alias)
+        if self._member_rows_pending is not None:
+            total += sum(estimate_sampled_size(p) for p in self._member_rows_pending)
+        else:
+            total += estimate_sampled_size(self._member_parent_dict)
+            total += estimate_sampled_size(self._member_index_dict)
+        with self._file_intervals_lock:
+            intervals = list(self._file_intervals.values())
+        for index in (
+            self._partial_index,
+            self._call_graph,
+            self._location_index,
+            self._fuzzy_index,
+            self._name_index,
+            self._repo_files,
+            *intervals,
+        ):
+            if index is not None:
+                total += sum(estimate_sampled_size(v) for v in vars(index).values())
+        return total
+
+    def release_cached_compounds(self) -> int:
+        """Drop this engine's entries from the shared compound cache."""
+        return COMPOUND_CACHE.invalidate(self._cache_namespace)
+
+    def retire(self):
+        """
+        Take this engine out of service: stop background work, make further
+        shared-cache writes no-ops, drop its cached compounds and close its
+        search connections. Requests already running on it still complete.
+        """
+        self._retired = True
+        self.stop_prefetch()
+        self.release_cached_compounds()
+        self.search_index.close()
+
+    def _cache_put(self, key: Tuple[str, str], value: Dict[str, Any]):
+        """Store a parsed result in the shared cache unless retired."""
+        if self._retired:
+            return
+        COMPOUND_CACHE.put(self._cache_namespace, key, value)
+        if self._retired:
+            # Retired while storing: nothing may outlive the release
+            self.release_cached_compounds()
+
+    def _cached_compound(self, kind: str, refid: str, parse) -> Dict[str, Any]:
+        """Return a parsed compound result through the shared cache."""
+        key = (kind, refid)
+        result = COMPOUND_CACHE.get(self._cache_namespace, key)
+        if result is None:
+            result = parse(refid)
+            # Errors (missing or malformed files) may be fixed by a rebuild.
+            if "error" not in result:
+                self._cache_put(key, result)
+        return result
+
+    def _register_compound(self, name: str, kind: str, refid: str) -> bool:
+        """Add a compound to the lookup maps. Returns True for a new lower-cased name."""
+        info = CompoundInfo(name, kind, refid)
+        self.compounds[name] = info
+        self._compound_by_refid[refid] = info
+
+        # Build optimization indices
+        lower_name = name.lower()
+        is_new = lower_name not in self._lower_map
+        self._lower_map[lower_name] = info
+
+        if kind == "file":
+            self._files.append(info)
+            file_name = Path(name).name
+            if file_name not in self._file_map:
+                self._file_map[file_name] = []
+            self._file_map[file_name].append(info)
+
+        return is_new
+
     def _process_compound(self, elem):
         """Helper to process a single compound element from index.xml."""
         name_elem = elem.find("name")
         if name_elem is not None and name_elem.text:
             name = name_elem.text
-            kind = elem.get("kind")
             refid = elem.get("refid")
-            info = {
-                "kind": kind,
-                "refid": refid,
-            }
-            self.compounds[name] = info
-
-            # Build optimization indices
-            lower_name = name.lower()
-            self._lower_map[lower_name] = info
-
-            # Suffix/substring index for fast O(1) partial matches
-            for i in range(len(lower_name)):
-                for j in range(i + 1, len(lower_name) + 1):
-                    sub = lower_name[i:j]
-                    if sub not in self._substring_map:
-                        self._substring_map[sub] = info
-
-            if kind == "file":
-                self._files.append((name, info))
-                file_name = Path(name).name
-                if file_name not in self._file_map:
-                    self._file_map[file_name] = []
-                self._file_map[file_name].append(info)
-
-            # Map member refids to parent compound refid
+            if self._register_compound(name, elem.get("kind"), refid):
+                self._partial_index.add(name.lower())
+
+            # Map member refids to parent compound refid and index them by name
             for member_elem in elem.findall("member"):
                 member_refid = member_elem.get("refid")
                 if member_refid:
                     self._member_parent_map[member_refid] = refid
+                    member_name = member_elem.findtext("name")
+                    if member_name:
+                        self._member_index.setdefault(member_name.lower(), []).append(
+                            (
+                                member_refid,
+                                refid,
+                                intern_optional(member_elem.get("kind")) or "",
+                            )
+                        )
+
+    def _reset_index(self):
+        """Drop all index-derived lookup structures."""
+        self.compounds = {}
+        self._lower_map = {}
+        self._partial_index = PartialMatchIndex()
+        self._file_map = {}
+        self._files = []
+        self._name_index = None
+        self._compound_by_refid = {}
+        self._member_parent_map = {}
+        self._member_index = {}
+        self._call_graph = None
+        self._location_index = None
+        self._fuzzy_index = None
+        self._file_intervals = OrderedDict()
+        self.memory_epoch += 1
+
+    def _export_state(self) -> Dict[str, Any]:
+        """Export the index-derived structures as plain data for a snapshot."""
+        infos = list(self.compounds.values())
+        return {
+            "names": [i.name for i in infos],
+            "kinds": [i.kind for i in infos],
+            "refids": [i.refid for i in infos],
+            # Rows grouped by name keep each refid's relative order, so replaying
+            # them rebuilds the same "last parent wins" member map. Names, parents
+            # and kinds repeat heavily and are dictionary-encoded.
+            "member_names": pack_repeated(
+                [n for n, rows in self._member_index.items() for _ in rows]
+            ),
+            "member_refids": [
+                r[0] for rows in self._member_index.values() for r in rows
+            ],
+            "member_parents": pack_repeated(
+                [r[1] for rows in self._member_index.values() for r in rows]
+            ),
+            "member_kinds": pack_repeated(
+                [r[2] for rows in self._member_index.values() for r in rows]
+            ),
+            "partial_index": self._partial_index.to_state(),
+        }
+
+    def _import_state(self, state: Dict[str, Any]) -> bool:
+        """Restore the index-derived structures from snapshot data."""
+        try:
+            names = state["names"]
+            infos = [
+                CompoundInfo(name, kind, refid)
+                for name, kind, refid in zip(
+                    names, state["kinds"], state["refids"], strict=True
+                )
+            ]
+            # Bulk-build the maps; dict() keeps the last duplicate like
+            # _register_compound does.
+            self.compounds = dict(zip(names, infos))
+            self._compound_by_refid = dict(zip(state["refids"], infos))
+            self._lower_map = dict(zip([n.lower() for n in names], infos))
+            for info in infos:
+                if info.kind == "file":
+                    self._files.append(info)
+                    file_name = os.path.basename(info.name)
+                    self._file_map.setdefault(file_name, []).append(info)
+            rows = (
+                state["member_names"],
+                state["member_refids"],
+                state["member_parents"],
+                state["member_kinds"],
+            )
+            row_count = len(rows[1])
+            for table, raw in (rows[0], rows[2], rows[3]):
+                if len(raw) != row_count * 4 or not isinstance(table, list):
+                    raise ValueError("member row columns differ in length")
+            # Building dicts over every member is the costliest part of a
+            # restore on large projects, so defer it to the first member lookup.
+            self._member_rows_pending = rows
+            self._partial_index = PartialMatchIndex.from_state(state["partial_index"])
+            return True
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # Any malformed or foreign payload falls back to parsing index.xml
+            logger.warning("Discarding malformed index snapshot: %s", e)
+            self._reset_index()
+            return False
 
     def _load_index(self):
-        """Load and parse the Doxygen index.xml file."""
+        """Load the Doxygen index from a valid snapshot, or parse index.xml."""
         if not self.index_path.exists():
             return
 
         self.search_index.initialize()
 
+        state = load_snapshot(self.snapshot_path, self.index_path)
+        if state is not None and self._import_state(state):
+            self._start_fuzzy_build()
+            return
+
         try:
+            # Fingerprint before parsing so a mid-parse rewrite invalidates it
+            fingerprint = index_fingerprint(self.index_path, with_digest=True)
+
             # Use iterparse to handle large XML files with minimal memory usage
-            context = ET.iterparse(self.index_path, events=("end",))
+            context = xml_backend.iterparse(self.index_path, events=("end",))
 
             for _, elem in context:
                 if elem.tag == "compound":
@@ -125,46 +521,151 @@ class DoxygenQueryEngine:
 
         except Exception as e:  # pylint: disable=broad-exception-caught
             logger.error("Error loading index: %s", e)
+            return
 
-    def query_symbol(self, symbol_name: str) -> Optional[Dict[str, Any]]:
-        """Query a class or namespace by name"""
+        write_snapshot(self.snapshot_path, fingerprint, self._export_state())
+        self._start_fuzzy_build()
+
+    def _start_fuzzy_build(self):
+        """
+        Build the fuzzy name index in a background thread as the index loads.
+
+        Engine readiness stays at snapshot speed on large projects, and a
+        lookup miss arriving before the build finishes waits for it instead
+        of starting its own.
+        """
+        threading.Thread(
+            target=self._build_fuzzy_index, name="doxygen-fuzzy-index", daemon=True
+        ).start()
+
+    def _build_fuzzy_index(self):
+        if self._retired:
+            return
+        try:
+            self.get_fuzzy_index()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # Lookups retry the build on demand
+            logger.warning("Background fuzzy index build failed: %s", e)
+
+    def find_partial_matches(
+        self, symbol_name: str, limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Return compounds whose name contains symbol_name, closest match first;
+        files lose ties so a bare class name does not resolve to its header.
+        """
+        lower_map = self._lower_map
+        lower_names = self._partial_index.search(
+            symbol_name.lower(),
+            limit,
+            demote=lambda n: lower_map[n].kind == "file",
+        )
+        return [self._lower_map[n] for n in lower_names]
+
+    def get_fuzzy_index(self) -> FuzzyNameIndex:
+        """
+        Return the typo-tolerant name index, waiting for the build started
+        by _load_index (or running it, if none was started) when not ready.
+        """
+        index = self._fuzzy_index
+        if index is None:
+            with self._fuzzy_index_lock:
+                if self._fuzzy_index is None:
+                    self._fuzzy_index = FuzzyNameIndex(self._fuzzy_terms())
+                    self.memory_epoch += 1
+                    logger.info(
+                        "Built fuzzy name index: %d names", len(self._fuzzy_index)
+                    )
+                index = self._fuzzy_index
+        return index
+
+    def _fuzzy_terms(self):
+        """Yield (name, payload) for every compound, its unscoped name and member."""
+        for info in self.compounds.values():
+            yield info.name, info
+            short = info.name.rsplit("::", 1)[-1]
+            if short != info.name:
+                yield short, info
+        for member_name, rows in self._member_index.items():
+            yield member_name, rows
+
+    def suggest_symbols(self, symbol_name: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Return the compound and member names closest to symbol_name by edit
+        distance, as "did you mean" candidates for a failed lookup.
+        """
+        # Two edits turn short names into unrelated ones
+        max_distance = 1 if len(symbol_name) < 5 else 2
+        suggestions: List[Dict[str, Any]] = []
+        seen = set()
+        for distance, term, payloads in self.get_fuzzy_index().lookup(
+            symbol_name, limit, max_distance
+        ):
+            for payload in payloads:
+                if isinstance(payload, CompoundInfo):
+                    key = payload.refid
+                    entry = {"name": payload.name, "kind": payload.kind}
+                else:
+                    # Member rows [(member refid, parent refid, kind)]; member
+                    # names are only kept lower-cased
+                    member_refid, parent_refid, kind = payload[0]
+                    key = member_refid
+                    parent = self._compound_by_refid.get(parent_refid)
+                    entry = {"name": term, "kind": kind}
+                    if parent is not None:
+                        entry["scope"] = parent.name
+                if key in seen:
+                    continue
+                seen.add(key)
+                entry["distance"] = distance
+                suggestions.append(entry)
+        return suggestions[:limit]
+
+    def _resolve_compound(self, symbol_name: str) -> Optional[Dict[str, Any]]:
+        """Resolve a compound by exact, case-insensitive, then ranked partial match."""
         # Exact match first
         if symbol_name in self.compounds:
-            return self._fetch_compound_details(self.compounds[symbol_name]["refid"])
+            return self.compounds[symbol_name]
 
         # Case-insensitive exact match (O(1) optimization)
         lower_name = symbol_name.lower()
         if lower_name in self._lower_map:
-            return self._fetch_compound_details(self._lower_map[lower_name]["refid"])
+            return self._lower_map[lower_name]
 
-        # Partial match (O(1) lookup using substring map)
-        if lower_name in self._substring_map:
-            return self._fetch_compound_details(
-                self._substring_map[lower_name]["refid"]
-            )
+        # Partial match via the trigram index, best-ranked candidate wins
+        matches = self.find_partial_matches(symbol_name, limit=1)
+        if matches:
+            return matches[0]
 
         return None
 
+    def query_symbol(self, symbol_name: str) -> Optional[Dict[str, Any]]:
+        """Query a class or namespace by name"""
+        info = self._resolve_compound(symbol_name)
+        if not info:
+            return None
+        return self._fetch_compound_details(info["refid"])
+
+    def query_symbols(
+        self, symbol_names: List[str]
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Query several symbols at once, resolving distinct names in parallel."""
+        unique = list(dict.fromkeys(symbol_names))
+        if len(unique) <= 1:
+            return {name: self.query_symbol(name) for name in unique}
+        with ThreadPoolExecutor(max_workers=min(len(unique), 8)) as executor:
+            return dict(zip(unique, executor.map(self.query_symbol, unique)))
+
     def get_symbol_connections(self, symbol_name: str) -> Optional[Dict[str, Any]]:
         """Retrieve the call graph (references/referencedby) for a symbol."""
-        refid = None
-        if symbol_name in self.compounds:
-            refid = self.compounds[symbol_name]["refid"]
-        else:
-            lower_name = symbol_name.lower()
-            if lower_name in self._lower_map:
-                refid = self._lower_map[lower_name]["refid"]
-            elif lower_name in self._substring_map:
-                refid = self._substring_map[lower_name]["refid"]
-
-        if not refid:
+        info = self._resolve_compound(symbol_name)
+        if not info or not info["refid"]:
             return None
 
-        return self._fetch_compound_connections(refid)
+        return self._fetch_compound_connections(info["refid"])
 
-    @lru_cache(maxsize=128)
-    def _fetch_compound_connections(self, refid: str) -> Dict[str, Any]:
-        """Fetch connection metadata (references, referencedby, inheritance)."""
+    def _load_compound_record(self, refid: str) -> Dict[str, Any]:
+        """Return the parsed record for a compound ID, or an {"error": ...} dict."""
         try:
             xml_file = (self.xml_dir / f"{refid}.xml").resolve()
             xml_file.relative_to(self.xml_dir)
@@ -175,53 +676,78 @@ class DoxygenQueryEngine:
             return {"error": f"Details file {xml_file} not found"}
 
         try:
-            tree = ET.parse(xml_file)
-            xml_root = tree.getroot()
-            compounddef = xml_root.find("compounddef")
-
-            if compounddef is None:
-                return {"error": "No compounddef found"}
-
-            name_elem = compounddef.find("compoundname")
-            name_text = name_elem.text if name_elem is not None else ""
-
-            connections = {
-                "name": name_text,
-                "kind": compounddef.get("kind"),
-                "base_classes": [
-                    p.text for p in compounddef.findall("basecompoundref")
-                ],
-                "derived_classes": [
-                    p.text for p in compounddef.findall("derivedcompoundref")
-                ],
-                "members": [],
-            }
+            record = parse_compound_record(xml_file)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            return {"error": f"Error parsing {xml_file}: {e}"}
 
-            for section in compounddef.findall("sectiondef"):
-                for member in section.findall("memberdef"):
-                    self._process_member_connections(member, connections)
+        if record is None:
+            return {"error": "No compounddef found"}
+        return record
+
+    def _compound_record(self, refid: str) -> Dict[str, Any]:
+        """Return a cached compound record (or error dict), noting member parents."""
+        self._last_foreground = time.monotonic()
+        record = self._cached_compound("record", refid, self._load_compound_record)
+        if "error" not in record:
+            self._note_member_parents(refid, record)
+        return record
+
+    def _store_record(self, refid: str, record: Dict[str, Any]):
+        """Put a record parsed outside the request path into the shared cache."""
+        self._cache_put(("record", refid), record)
+        self._note_member_parents(refid, record)
+
+    def _prefetch_record(self, refid: str) -> Optional[Dict[str, Any]]:
+        """Parse and cache a record for the prefetcher; None on error."""
+        record = self._load_compound_record(refid)
+        if "error" in record:
+            return None
+        self._store_record(refid, record)
+        return record
+
+    def _note_member_parents(self, refid: str, record: Dict[str, Any]):
+        """Register a record's members under their compound, first one wins."""
+        # index.xml may not list members; learn their parents from records.
+        parent_map = self._member_parent_map
+        for member in record["members"]:
+            if member["refid"] and member["refid"] not in parent_map:
+                parent_map[member["refid"]] = refid
+
+    def get_compound_record(self, refid: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the canonical parsed record of a compound, parsing its XML at most
+        once while it stays in the shared cache. Returns None on any error.
+        """
+        record = self._compound_record(refid)
+        return None if "error" in record else record
 
-            return connections
-        except Exception as e:
-            return {"error": f"Error parsing {xml_file}: {e}"}
+    def _fetch_compound_connections(self, refid: str) -> Dict[str, Any]:
+        """Fetch connection metadata (references, referencedby, inheritance)."""
+        record = self._compound_record(refid)
+        if "error" in record:
+            return record
 
-    def _process_member_connections(self, member, connections):
-        """Helper to process member connections."""
-        mem_name_elem = member.find("name")
-        mem_name = mem_name_elem.text if mem_name_elem is not None else ""
-        mem_info = {
-            "name": mem_name,
-            "kind": member.get("kind"),
-            "references": [
-                ref.text for ref in member.findall("references") if ref.text
-            ],
-            "referencedby": [
-                ref.text for ref in member.findall("referencedby") if ref.text
-            ],
-        }
+        members = []
+        for member in record["members"]:
+            references = [r["name"] for r in member["references"] if r["name"]]
+            referencedby = [r["name"] for r in member["referencedby"] if r["name"]]
+            if references or referencedby:
+                members.append(
+                    {
+                        "name": member["name"],
+                        "kind": member["kind"],
+                        "references": references,
+                        "referencedby": referencedby,
+                    }
+                )
 
-        if mem_info["references"] or mem_info["referencedby"]:
-            connections["members"].append(mem_info)
+        return {
+            "name": record["name"],
+            "kind": record["kind"],
+            "base_classes": list(record["base_classes"]),
+            "derived_classes": list(record["derived_classes"]),
+            "members": members,
+        }
 
     def get_file_structure(self, file_path: str) -> List[Dict[str, Any]]:
         """Identify all symbols defined in a specific file"""
@@ -233,98 +759,76 @@ class DoxygenQueryEngine:
         if candidates:
             refid = candidates[0]["refid"]
         else:
-            for name, info in self._files:
-                if name.endswith(file_name):
-                    refid = info["refid"]
+            for info in self._files:
+                if info.name.endswith(file_name):
+                    refid = info.refid
                     break
 
         if not refid:
             return []
 
-        # 2. Parse the file XML to find inner classes and namespaces
-        xml_file = (self.xml_dir / f"{refid}.xml").resolve()
-        if not xml_file.exists():
+        # 2. Read the file record to find inner classes and namespaces
+        record = self.get_compound_record(refid)
+        if record is None:
             return []
 
         members = []
-        try:
-            tree = ET.parse(xml_file)
-            xml_root = tree.getroot()
-            compounddef = xml_root.find("compounddef")
-            if compounddef is not None:
-                # Get direct members (like namespace-level functions/variables)
-                for section in compounddef.findall("sectiondef"):
-                    for member in section.findall("memberdef"):
-                        m_wrapper = {"members": []}
-                        self._process_member_details(member, m_wrapper)
-                        if m_wrapper["members"]:
-                            m = m_wrapper["members"][0]
-                            m["full_name"] = m["name"]
-                            m["is_class_member"] = False
-                            members.append(m)
-
-                # Collect all refids for parallel loading
-                class_refids = [
-                    ic.get("refid")
-                    for ic in compounddef.findall("innerclass")
-                    if ic.get("refid")
-                ]
-                ns_refids = [
-                    ins.get("refid")
-                    for ins in compounddef.findall("innernamespace")
-                    if ins.get("refid")
-                ]
-                all_refids = class_refids + ns_refids
-
-                # Fetch details in parallel
-                if all_refids:
-                    with ThreadPoolExecutor(
-                        max_workers=min(len(all_refids), 8)
-                    ) as executor:
-                        details_list = list(
-                            executor.map(self._fetch_compound_details, all_refids)
-                        )
-                    details_map = dict(zip(all_refids, details_list))
-                else:
-                    details_map = {}
-
-                # Get members of inner classes defined in this file
-                for class_refid in class_refids:
-                    class_details = details_map.get(class_refid)
-                    if class_details and "members" in class_details:
-                        # Add the class itself as a symbol
-                        members.append(
-                            {
-                                "name": class_details["name"],
-                                "full_name": class_details["name"],
-                                "kind": class_details["kind"],
-                                "type": "",
-                                "args": "",
-                                "location": class_details.get("location") or {},
-                                "brief": class_details.get("brief") or "",
-                                "is_class_member": False,
-                            }
-                        )
-                        # Add class members
-                        for m in class_details["members"]:
-                            m["full_name"] = f"{class_details['name']}::{m['name']}"
-                            m["is_class_member"] = True
-                            members.append(m)
-
-                # Get members of inner namespaces defined in this file
-                for ns_refid in ns_refids:
-                    ns_details = details_map.get(ns_refid)
-                    if ns_details and "members" in ns_details:
-                        for m in ns_details["members"]:
-                            loc = m.get("location") or {}
-                            m_file = loc.get("file", "")
-                            if m_file and Path(m_file).name == file_name:
-                                m["full_name"] = f"{ns_details['name']}::{m['name']}"
-                                m["is_class_member"] = False
-                                members.append(m)
-
-        except Exception as e:
-            logger.error("Error parsing file structure for %s: %s", file_path, e)
+        # Get direct members (like namespace-level functions/variables)
+        for member in record["members"]:
+            m = _detail_member(member)
+            m["full_name"] = m["name"]
+            m["is_class_member"] = False
+            members.append(m)
+
+        # Collect all refids for parallel loading
+        class_refids = record["inner_classes"]
+        ns_refids = record["inner_namespaces"]
+        all_refids = class_refids + ns_refids
+
+        # Fetch details in parallel
+        if all_refids:
+            with ThreadPoolExecutor(max_workers=min(len(all_refids), 8)) as executor:
+                details_list = list(
+                    executor.map(self._fetch_compound_details, all_refids)
+                )
+            details_map = dict(zip(all_refids, details_list))
+        else:
+            details_map = {}
+
+        # Get members of inner classes defined in this file
+        for class_refid in class_refids:
+            class_details = details_map.get(class_refid)
+            if class_details and "members" in class_details:
+                # Add the class itself as a symbol
+                members.append(
+                    {
+                        "name": class_details["name"],
+                        "full_name": class_details["name"],
+                        "kind": class_details["kind"],
+                        "type": "",
+                        "args": "",
+                        "location": class_details.get("location") or {},
+                        "brief": class_details.get("brief") or "",
+                        "is_class_member": False,
+                    }
+                )
+                # Add class members
+                for m in class_details["members"]:
+                    m["full_name"] = f"{class_details['name']}::{m['name']}"
+                    m["is_class_member"] = True
+                    members.append(m)
+
+        # Get members of inner namespaces defined in this file
+        for ns_refid in ns_refids:
+            ns_details = details_map.get(ns_refid)
+            if ns_details and "members" in ns_details:
+                for m in ns_details["members"]:
+                    loc = m.get("location") or {}
+                    m_file = loc.get("file", "")
+                    if m_file and Path(m_file).name == file_name:
+                        m["full_name"] = f"{ns_details['name']}::{m['name']}"
+                        m["is_class_member"] = False
+                        members.append(m)
 
         # Deduplicate members by name, kind, file, and line
         seen = set()
@@ -338,119 +842,103 @@ class DoxygenQueryEngine:
 
         return deduped
 
-    @lru_cache(maxsize=128)
+    def get_symbol_at_location(
+        self, file_path: str, line_number: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return the innermost symbol whose body encloses file_path:line_number,
+        or the closest symbol declared above it.
+        """
+        file_name = Path(file_path).name
+        with self._file_intervals_lock:
+            index = self._file_intervals.get(file_name)
+            if index is not None:
+                self._file_intervals.move_to_end(file_name)
+        if index is None:
+            symbols = [
+                symbol
+                for symbol in self.get_file_structure(file_path)
+                if (symbol.get("location") or {}).get("file")
+                and Path(symbol["location"]["file"]).name == file_name
+            ]
+            index = FileIntervalIndex(symbols)
+            with self._file_intervals_lock:
+                self._file_intervals[file_name] = index
+                while len(self._file_intervals) > self._MAX_FILE_INTERVALS:
+                    self._file_intervals.popitem(last=False)
+                self.memory_epoch += 1
+        return index.lookup(line_number)
+
     def _fetch_compound_details(self, refid: str) -> Dict[str, Any]:
         """Fetch and parse detailed information for a specific compound ID."""
-        try:
-            xml_file = (self.xml_dir / f"{refid}.xml").resolve()
-            xml_file.relative_to(self.xml_dir)
-        except (ValueError, RuntimeError):
-            return {"error": f"Security Error: Access denied to path '{refid}'"}
-
-        if not xml_file.exists():
-            return {"error": f"Details file {xml_file} not found"}
-
-        try:
-            tree = ET.parse(xml_file)
-            xml_root = tree.getroot()
-            compounddef = xml_root.find("compounddef")
-
-            if compounddef is None:
-                return {"error": "No compounddef found"}
-
-            name_elem = compounddef.find("compoundname")
-            name_text = name_elem.text if name_elem is not None else ""
-
-            details = {
-                "name": name_text,
-                "kind": compounddef.get("kind"),
-                "location": self._get_location(compounddef),
-                "brief": self._get_text_recursive(compounddef.find("briefdescription")),
-                "detailed": self._get_text_recursive(
-                    compounddef.find("detaileddescription")
-                ),
-                "members": [],
-            }
-
-            for section in compounddef.findall("sectiondef"):
-                for member in section.findall("memberdef"):
-                    self._process_member_details(member, details)
-                    m_id = member.get("id")
-                    if m_id:
-                        self._member_parent_map[m_id] = refid
-
-            return details
-        except Exception as e:  # pylint: disable=broad-exception-caught
-            return {"error": f"Error parsing {xml_file}: {e}"}
-
-    def _process_member_details(self, member, details):
-        """Helper to process member details."""
-        m_name_elem = member.find("name")
-        m_name = m_name_elem.text if m_name_elem is not None else ""
-        details["members"].append(
-            {
-                "refid": member.get("id"),
-                "name": m_name,
-                "kind": member.get("kind"),
-                "type": self._get_text_recursive(member.find("type")),
-                "args": self._get_text_recursive(member.find("argsstring")),
-                "location": self._get_location(member),
-                "brief": self._get_text_recursive(member.find("briefdescription")),
-                "referencedby": [
-                    {
-                        "name": ref.text or "",
-                        "refid": ref.get("refid"),
-                        "compoundref": ref.get("compoundref"),
-                        "startline": ref.get("startline"),
-                        "endline": ref.get("endline"),
-                    }
-                    for ref in member.findall("referencedby")
-                ],
-                "references": [
-                    {
-                        "name": ref.text or "",
-                        "refid": ref.get("refid"),
-                        "compoundref": ref.get("compoundref"),
-                        "startline": ref.get("startline"),
-                        "endline": ref.get("endline"),
-                    }
-                    for ref in member.findall("references")
-                ],
-            }
-        )
+        record = self._compound_record(refid)
+        if "error" in record:
+            return record
+
+        return {
+            "name": record["name"],
+            "kind": record["kind"],
+            "location": record["location"],
+            "brief": record["brief"],
+            "detailed": record["detailed"],
+            "members": [_detail_member(m) for m in record["members"]],
+        }
 
     def _get_location(self, element) -> Dict[str, Any]:
         """Extract location information from an XML element."""
-        loc = element.find("location")
-        if loc is not None:
-            return {
-                "file": loc.get("file"),
-                "line": loc.get("line"),
-                "column": loc.get("column"),
-                "bodystart": loc.get("bodystart"),
-                "bodyend": loc.get("bodyend"),
-            }
-        return {}
+        return element_location(element)
 
     def _get_text_recursive(self, element) -> str:
         """Recursively extract text from an XML element and its children."""
-        if element is None:
-            return ""
-        return "".join(element.itertext()).strip()
+        return element_text(element)
+
+    def _names(self) -> SortedNameIndex:
+        """Return the sorted per-kind name lists, building them on first use."""
+        index = self._name_index
+        if index is None:
+            index = self._name_index = SortedNameIndex(list(self.compounds.values()))
+            self.memory_epoch += 1
+        return index
 
     def list_all_symbols(self, kind_filter: Optional[str] = None) -> List[str]:
-        """List all symbols, optionally filtered by kind (e.g., 'class', 'namespace')."""
-        if kind_filter:
-            return [
-                name
-                for name, info in self.compounds.items()
-                if info["kind"] == kind_filter
-            ]
-        return list(self.compounds.keys())
+        """List all symbols (sorted), optionally filtered by kind (e.g., 'class')."""
+        return list(self._names().names(kind_filter or None))
+
+    def count_symbols(self, kind_filter: Optional[str] = None) -> int:
+        """Count symbols, optionally filtered by kind, without listing them."""
+        return self._names().count(kind_filter or None)
+
+    def list_symbols_page(
+        self,
+        kind: Optional[str] = None,
+        prefix: Optional[str] = None,
+        namespace: Optional[str] = None,
+        cursor: Optional[str] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> Dict[str, Any]:
+        """
+        Return one page of sorted symbol names.
+
+        Names are filtered by kind, by `namespace` (names scoped inside it,
+        e.g. "ns" matches "ns::Widget" and "ns::detail::Impl") and by a
+        case-sensitive `prefix` within that scope. Pass the returned
+        `next_cursor` back to get the following page.
+        """
+        scope = f"{namespace.rstrip(':')}::" if namespace else ""
+        page = self._names().page(
+            kind=kind or None,
+            prefix=scope + (prefix or ""),
+            cursor=cursor,
+            page_size=page_size,
+        )
+        page["kind"] = kind or "all"
+        return page
 
-    def semantic_search(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+    def semantic_search(
+        self, query: str, limit: int = 5, kinds: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
         """Perform a semantic search across the Doxygen FTS5 index."""
-        return self.search_index.search(query, limit)
+        return self.search_index.search(query, limit, kinds)
 
     def find_symbol_definitions(self, symbol_name: str) -> List[Dict[str, Any]]:
         """Locate definitions of a symbol (compound or member)."""
@@ -475,25 +963,20 @@ class DoxygenQueryEngine:
             )
 
         # 2. Check if matches a member name
-        # Scan all compounds for matching members
-        for name, info in self.compounds.items():
+        member_target_name = parts[-1] if qualified else symbol_name
+        target_lower = member_target_name.lower()
+
+        for name, info in self._member_candidate_parents(target_lower):
             # If qualified, the parent compound name must match the qualifier parts
-            if qualified:
-                parent_match = True
-                for part in parts[:-1]:
-                    if part.lower() not in name.lower():
-                        parent_match = False
-                        break
-                if not parent_match:
-                    continue
-                member_target_name = parts[-1]
-            else:
-                member_target_name = symbol_name
+            if qualified and not all(
+                part.lower() in name.lower() for part in parts[:-1]
+            ):
+                continue
 
             details = self._fetch_compound_details(info["refid"])
             if details and "members" in details:
                 for member in details["members"]:
-                    if member["name"].lower() == member_target_name.lower():
+                    if member["name"].lower() == target_lower:
                         results.append(
                             {
                                 "name": member["name"],
@@ -511,6 +994,30 @@ class DoxygenQueryEngine:
 
         return results
 
+    def _member_candidate_parents(
+        self, member_name_lower: str
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Return (name, info) of the compounds that may define a member name.
+
+        Uses the member table built from index.xml, so only compounds that list
+        the member are parsed. Indices without <member> entries (hand-written or
+        stripped) fall back to considering every compound.
+        """
+        if not self._member_index:
+            return list(self.compounds.items())
+
+        parents = []
+        seen = set()
+        for _, parent_refid, _ in self._member_index.get(member_name_lower, ()):
+            if parent_refid in seen:
+                continue
+            seen.add(parent_refid)
+            info = self._compound_by_refid.get(parent_refid)
+            if info:
+                parents.append((info["name"], info))
+        return parents
+
     def find_references(self, symbol_name: str) -> List[Dict[str, Any]]:
         """Find all call sites / occurrences of a symbol in the workspace."""
         results: List[Dict[str, Any]] = []
@@ -519,9 +1026,13 @@ class DoxygenQueryEngine:
         if not definitions:
             return []
 
+        graph = self.get_call_graph()
         for def_info in definitions:
             if def_info.get("is_member"):
-                referenced_by_list = self._get_member_referenced_by(def_info)
+                referenced_by_list = self._graph_referenced_by(graph, def_info)
+                if referenced_by_list is None:
+                    # No graph node: the member has no refid of its own
+                    referenced_by_list = self._get_member_referenced_by(def_info)
                 for ref in referenced_by_list:
                     results.extend(self._process_reference_call_site(ref, def_info))
             else:
@@ -543,6 +1054,31 @@ class DoxygenQueryEngine:
 
         return []
 
+    def _graph_referenced_by(
+        self, graph: CallGraph, def_info: Dict[str, Any]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Build referencedby entries for a member from the call graph, or return
+        None if the graph has no node for it.
+        """
+        node = graph.node_id(def_info.get("refid") or "")
+        if node is None:
+            return None
+
+        refs = []
+        for caller in graph.callers(node):
+            attrs = graph.node(caller)
+            refs.append(
+                {
+                    "name": attrs["name"],
+                    "refid": attrs["refid"],
+                    "file": attrs["file"] or None,
+                    "startline": attrs["bodystart"] or attrs["line"] or None,
+                    "endline": attrs["bodyend"] or None,
+                }
+            )
+        return refs
+
     def _get_compound_derived_classes(
         self, def_info: Dict[str, Any]
     ) -> List[Dict[str, Any]]:
@@ -563,7 +1099,10 @@ class DoxygenQueryEngine:
             if not file_path_str:
                 continue
 
-            abs_path = (self.search_index.repo_root / file_path_str).resolve()
+            abs_path = (
+                self._resolve_source_path(file_path_str)
+                or (self.search_index.repo_root / file_path_str).resolve()
+            )
             results.append(
                 {
                     "file": str(abs_path),
@@ -575,13 +1114,37 @@ class DoxygenQueryEngine:
 
         return results
 
+    def get_repo_files(self) -> RepoFileIndex:
+        """Return the repository file index, scanning the repo on first use."""
+        repo_root = self.search_index.repo_root
+        index = self._repo_files
+        if index is not None and index.root == repo_root:
+            return index
+        with self._repo_files_lock:
+            if self._repo_files is None or self._repo_files.root != repo_root:
+                self._repo_files = RepoFileIndex.scan(repo_root)
+                self.memory_epoch += 1
+            return self._repo_files
+
+    def _resolve_source_path(self, file_path: str) -> Optional[Path]:
+        """Resolve a Doxygen location path to an existing file in the repository."""
+        abs_path = (self.search_index.repo_root / file_path).resolve()
+        if abs_path.exists():
+            return abs_path
+
+        abs_path = (self.xml_dir.parent / file_path).resolve()
+        if abs_path.exists():
+            return abs_path
+
+        return self.get_repo_files().find(file_path)
+
     def _resolve_reference_file_path(self, ref: Dict[str, Any]) -> Optional[Path]:
         """Resolve the absolute file path for a reference."""
-        file_path_str = None
+        file_path_str = ref.get("file")
         ref_refid = ref.get("refid")
 
         # 1. Look up parent compound of caller
-        if ref_refid and ref_refid in self._member_parent_map:
+        if not file_path_str and ref_refid and ref_refid in self._member_parent_map:
             caller_parent_refid = self._member_parent_map[ref_refid]
             caller_parent_details = self._fetch_compound_details(caller_parent_refid)
             if caller_parent_details and caller_parent_details.get("location"):
@@ -595,19 +1158,7 @@ class DoxygenQueryEngine:
             return None
 
         # Resolve to absolute path in repository
-        abs_path = (self.search_index.repo_root / file_path_str).resolve()
-        if abs_path.exists():
-            return abs_path
-
-        abs_path = (self.xml_dir.parent / file_path_str).resolve()
-        if abs_path.exists():
-            return abs_path
-
-        found_files = list(self.search_index.repo_root.rglob(Path(file_path_str).name))
-        if found_files:
-            return found_files[0]
-
-        return None
+        return self._resolve_source_path(file_path_str)
 
     def _process_reference_call_site(
         self, ref: Dict[str, Any], def_info: Dict[str, Any]
@@ -626,14 +1177,12 @@ class DoxygenQueryEngine:
 
         found_lines = []
         try:
-            with open(abs_path, "r", encoding="utf-8") as f:
-                lines = f.readlines()
-
+            source = SOURCE_CACHE.get(abs_path)
             scan_start = max(0, start_line - 1)
-            scan_end = min(len(lines), end_line)
+            scan_end = min(source.line_count, end_line)
 
             for idx in range(scan_start, scan_end):
-                line_content = lines[idx]
+                line_content = source.line(idx + 1)
                 if word_pattern.search(line_content):
                     found_lines.append(
                         {
@@ -660,17 +1209,9 @@ class DoxygenQueryEngine:
 
     def get_file_skeleton(self, file_path: str) -> str:
         """Generate a skeletal version of the source file (signatures only, bodies stripped)."""
-        file_name = Path(file_path).name
-
-        abs_path = (self.search_index.repo_root / file_path).resolve()
-        if not abs_path.exists():
-            abs_path = (self.xml_dir.parent / file_path).resolve()
-            if not abs_path.exists():
-                found_files = list(self.search_index.repo_root.rglob(file_name))
-                if found_files:
-                    abs_path = found_files[0]
-                else:
-                    return f"❌ Error: File '{file_path}' not found in workspace."
+        abs_path = self._resolve_source_path(file_path)
+        if abs_path is None:
+            return f"❌ Error: File '{file_path}' not found in workspace."
 
         members = self.get_file_structure(file_path)
         if not members:
@@ -736,17 +1277,11 @@ class DoxygenQueryEngine:
         return "\n".join(lines)
 
     def get_source_snippet(self, file_path: str, bodystart: int, bodyend: int) -> str:
-        abs_path = (self.search_index.repo_root / file_path).resolve()
-        if not abs_path.exists():
-            abs_path = (self.xml_dir.parent / file_path).resolve()
-            if not abs_path.exists():
-                return ""
+        abs_path = self._resolve_source_path(file_path)
+        if abs_path is None:
+            return ""
         try:
-            content = abs_path.read_text(encoding="utf-8")
-            lines = content.splitlines()
-            start = max(0, bodystart - 1)
-            end = min(len(lines), bodyend)
-            return "\n".join(lines[start:end])
+            return "\n".join(SOURCE_CACHE.get(abs_path).lines(bodystart, bodyend))
         except Exception:
             return ""
 
@@ -767,6 +1302,163 @@ class DoxygenQueryEngine:
                         return m
         return None
 
+    def get_call_graph(self) -> CallGraph:
+        """
+        Return the member call graph, building it on first use.
+
+        Building reads every compound record once; the graph then lives as
+        long as this engine, i.e. for one index generation.
+        """
+        if self._call_graph is None:
+            self._build_record_indices()
+        return self._call_graph
+
+    def get_location_index(self) -> LocationIndex:
+        """Return the file:line -> member refid index, building it on first use."""
+        if self._location_index is None:
+            self._build_record_indices()
+        return self._location_index
+
+    def _sweep_records(self):
+        """Yield every valid compound record, without filling the shared cache."""
+        for refid in list(self._compound_by_refid):
+            # Reuse cached records, but don't flood the shared cache with a
+            # one-off sweep over every compound.
+            record = COMPOUND_CACHE.get(self._cache_namespace, ("record", refid))
+            if record is None:
+                record = self._load_compound_record(refid)
+            if "error" not in record:
+                yield record
+
+    def _build_record_indices(self, records=None) -> bool:
+        """
+        Build the call graph and location index in one pass over all records.
+
+        Returns False without consuming `records` if both are already built.
+        """
+        with self._record_indices_lock:
+            if self._call_graph is not None and self._location_index is not None:
+                return False
+
+            builder = CallGraphBuilder()
+            locations = LocationIndex()
+            for record in self._sweep_records() if records is None else records:
+                builder.add_compound(record)
+                for member in record["members"]:
+                    loc = member["location"]
+                    if member["refid"] and loc.get("file") and loc.get("line"):
+                        try:
+                            line = int(loc["line"])
+                        except ValueError:
+                            continue
+                        locations.add(loc["file"], line, member["refid"])
+
+            graph = builder.build()
+            logger.info(
+                "Built call graph: %d nodes, %d edges", len(graph), graph.edge_count
+            )
+            self._location_index = locations.freeze()
+            self._call_graph = graph
+            self.memory_epoch += 1
+            return True
+
+    def warm_up(self, workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Parse every compound XML file up front, in parallel worker processes.
+
+        Parsed records are put into the shared compound cache (as far as its
+        budget allows) and the call graph and location index are built from
+        the same stream, so later full sweeps need no XML parsing at all. The
+        fuzzy name index is built too, so the first lookup miss is fast.
+        """
+        workers = workers or default_workers()
+        started = time.perf_counter()
+        items = []
+        for refid in list(self._compound_by_refid):
+            try:
+                xml_file = (self.xml_dir / f"{refid}.xml").resolve()
+                xml_file.relative_to(self.xml_dir)
+            except (ValueError, RuntimeError):
+                continue
+            if xml_file.exists():
+                items.append((refid, str(xml_file)))
+
+        stats = {"compounds": len(items), "parsed": 0, "errors": 0}
+
+        def records():
+            for refid, record, error in parse_compounds(items, workers):
+                if record is None:
+                    logger.debug("Warmup skipped %s: %s", refid, error)
+                    stats["errors"] += 1
+                    continue
+                stats["parsed"] += 1
+                self._store_record(refid, record)
+                yield record
+
+        stream = records()
+        if not self._build_record_indices(stream):
+            for _ in stream:
+                pass
+
+        graph = self._call_graph
+        fuzzy = self.get_fuzzy_index()
+        stats.update(
+            {
+                "workers": workers,
+                "seconds": round(time.perf_counter() - started, 3),
+                "graph_nodes": len(graph),
+                "graph_edges": graph.edge_count,
+                "fuzzy_names": len(fuzzy),
+            }
+        )
+        logger.info(
+            "Warmed up %d compounds in %.2fs with %d workers",
+            stats["parsed"],
+            stats["seconds"],
+            workers,
+        )
+        return stats
+
+    def get_call_stats(self, symbol_name: str, max_depth: int = 3) -> Dict[str, Any]:
+        """Fan-in/fan-out and transitive reachability for a member symbol."""
+        graph = self.get_call_graph()
+        nodes = [
+            node
+            for node in (
+                graph.node_id(d.get("refid") or "")
+                for d in self.find_symbol_definitions(symbol_name)
+                if d.get("is_member")
+            )
+            if node is not None
+        ]
+        if not nodes:
+            return {"error": f"No member named '{symbol_name}' in the call graph."}
+
+        results = []
+        for node in nodes:
+            callees = graph.reachable(node, max_depth=max_depth)
+            callers = graph.reachable(node, max_depth=max_depth, reverse=True)
+            attrs = graph.node(node)
+            results.append(
+                {
+                    "name": attrs["name"],
+                    "refid": attrs["refid"],
+                    "file": attrs["file"],
+                    "line": attrs["line"],
+                    "fan_in": graph.fan_in(node),
+                    "fan_out": graph.fan_out(node),
+                    "callers": [
+                        graph.names[c] or graph.refids[c] for c in graph.callers(node)
+                    ],
+                    "callees": [
+                        graph.names[c] or graph.refids[c] for c in graph.callees(node)
+                    ],
+                    "reachable_callees": len(callees),
+                    "reachable_callers": len(callers),
+                }
+            )
+        return {"symbol": symbol_name, "max_depth": max_depth, "definitions": results}
+
     def trace_call_path(self, entry_symbol: str, max_depth: int = 3) -> str:
         defs = self.find_symbol_definitions(entry_symbol)
         if not defs:
@@ -780,6 +1472,7 @@ class DoxygenQueryEngine:
         if not target:
             target = defs[0]
 
+        graph = self.get_call_graph()
         visited = set()
         steps = []
 
@@ -788,8 +1481,8 @@ class DoxygenQueryEngine:
                 return
             visited.add(refid)
 
-            m = self.get_member_by_refid(refid)
-            if not m:
+            node = graph.node_id(refid)
+            if node is None or not graph.is_member[node]:
                 comp_details = self._fetch_compound_details(refid)
                 if comp_details and "error" not in comp_details:
                     loc = comp_details.get("location") or {}
@@ -810,52 +1503,33 @@ class DoxygenQueryEngine:
                             )
                 return
 
-            loc = m.get("location") or {}
-            file_path = loc.get("file")
-            bodystart_str = loc.get("bodystart")
-            bodyend_str = loc.get("bodyend")
-
-            if file_path and bodystart_str and bodyend_str:
-                try:
-                    bodystart = int(bodystart_str)
-                    bodyend = int(bodyend_str)
-                    if bodystart > 0 and bodyend >= bodystart:
-                        snippet = self.get_source_snippet(file_path, bodystart, bodyend)
-                        if snippet:
-                            full_name = m.get("full_name") or m["name"]
-                            steps.append(
-                                {
-                                    "name": full_name,
-                                    "file": file_path,
-                                    "start": bodystart,
-                                    "end": bodyend,
-                                    "code": snippet,
-                                }
-                            )
-                except ValueError:
-                    pass
+            file_path = graph.files[node]
+            bodystart = graph.bodystarts[node]
+            bodyend = graph.bodyends[node]
+            if file_path and bodystart > 0 and bodyend >= bodystart:
+                snippet = self.get_source_snippet(file_path, bodystart, bodyend)
+                if snippet:
+                    steps.append(
+                        {
+                            "name": graph.names[node],
+                            "file": file_path,
+                            "start": bodystart,
+                            "end": bodyend,
+                            "code": snippet,
+                        }
+                    )
 
-            refs = m.get("references") or []
-            for r in refs:
-                callee_refid = r.get("refid")
-                if callee_refid:
-                    trace(callee_refid, depth + 1)
+            for callee in graph.callees(node):
+                trace(graph.refids[callee], depth + 1)
 
         entry_refid = target.get("refid")
         if entry_refid:
             if ":" in entry_refid:
-                for parent_ref, parent_info in self.compounds.items():
-                    p_details = self._fetch_compound_details(parent_info["refid"])
-                    if p_details and "members" in p_details:
-                        for m in p_details["members"]:
-                            loc = m.get("location") or {}
-                            loc_str = f"{loc.get('file')}:{loc.get('line')}"
-                            if loc_str == entry_refid:
-                                entry_refid = m.get("refid")
-                                break
-                        else:
-                            continue
-                        break
+                # Synthetic "file:line" id for members without a refid
+                file_path, _, line = entry_refid.rpartition(":")
+                entry_refid = None
+                if line.isdigit():
+                    entry_refid = self.get_location_index().at(file_path, int(line))
 
             if entry_refid:
                 trace(entry_refid, 1)
@@ -0,0 +1,138 @@
+"""
+Canonical compound records parsed from Doxygen ``<refid>.xml`` files.
+
+A record holds everything the engine, the parity auditor and the search
+index read from a compound file, so each file is parsed once and every
+consumer works from the same plain-data result. Records contain only dicts,
+lists and strings, which keeps them cheap to size, cache and pickle; kinds and
+file paths repeat across members and are interned.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from . import xml_backend
+from .model import intern_optional
+
+
+def element_text(element) -> str:
+    """Return the concatenated, stripped text of an element (or "")."""
+    if element is None:
+        return ""
+    return "".join(element.itertext()).strip()
+
+
+def element_location(element) -> Dict[str, Any]:
+    """Extract location attributes from an element's <location> child."""
+    loc = element.find("location")
+    if loc is None:
+        return {}
+    return {
+        "file": intern_optional(loc.get("file")),
+        "line": loc.get("line"),
+        "column": loc.get("column"),
+        "bodystart": loc.get("bodystart"),
+        "bodyend": loc.get("bodyend"),
+    }
+
+
+def _refs(member, tag: str) -> List[Dict[str, Any]]:
+    """Extract <references>/<referencedby> entries of a member."""
+    return [
+        {
+            "name": ref.text or "",
+            "refid": ref.get("refid"),
+            "compoundref": intern_optional(ref.get("compoundref")),
+            "startline": ref.get("startline"),
+            "endline": ref.get("endline"),
+        }
+        for ref in member.findall(tag)
+    ]
+
+
+def _param_names(member) -> List[str]:
+    """Names of a member's signature parameters (declname, else defname)."""
+    names = []
+    for param in member.findall("param"):
+        for tag in ("declname", "defname"):
+            node = param.find(tag)
+            if node is not None and node.text:
+                names.append(node.text)
+                break
+    return names
+
+
+def _documented_params(member) -> List[str]:
+    """Parameter names documented with @param in a member's description."""
+    names: List[str] = []
+    detailed = member.find("detaileddescription")
+    if detailed is None:
+        return names
+    for paramlist in detailed.iter("parameterlist"):
+        if paramlist.get("kind") != "param":
+            continue
+        # Direct children only, as Doxygen lays them out
+        for name_node in paramlist.findall(
+            "parameteritem/parameternamelist/parametername"
+        ):
+            if name_node.text:
+                names.append(name_node.text.strip())
+    return names
+
+
+def _member_record(member) -> Dict[str, Any]:
+    """Build the record of one <memberdef>."""
+    name_elem = member.find("name")
+    return {
+        "refid": member.get("id"),
+        "name": name_elem.text if name_elem is not None else "",
+        "kind": intern_optional(member.get("kind")),
+        "type": element_text(member.find("type")),
+        "args": element_text(member.find("argsstring")),
+        "location": element_location(member),
+        "brief": element_text(member.find("briefdescription")),
+        "referencedby": _refs(member, "referencedby"),
+        "references": _refs(member, "references"),
+        "params": _param_names(member),
+        "documented_params": _documented_params(member),
+    }
+
+
+def parse_compound_record(xml_file: Path) -> Optional[Dict[str, Any]]:
+    """
+    Parse a compound XML file into a record.
+
+    Returns None when the file has no <compounddef>. Parse and I/O errors
+    propagate to the caller.
+    """
+    root = xml_backend.parse(xml_file).getroot()
+    compounddef = root.find("compounddef") if root is not None else None
+    if compounddef is None:
+        return None
+
+    name_elem = compounddef.find("compoundname")
+    return {
+        "refid": compounddef.get("id"),
+        "name": name_elem.text if name_elem is not None else "",
+        "kind": intern_optional(compounddef.get("kind")),
+        "location": element_location(compounddef),
+        "brief": element_text(compounddef.find("briefdescription")),
+        "detailed": element_text(compounddef.find("detaileddescription")),
+        "base_classes": [p.text for p in compounddef.findall("basecompoundref")],
+        "derived_classes": [p.text for p in compounddef.findall("derivedcompoundref")],
+        "inner_classes": [
+            ic.get("refid")
+            for ic in compounddef.findall("innerclass")
+            if ic.get("refid")
+        ],
+        "inner_namespaces": [
+            ins.get("refid")
+            for ins in compounddef.findall("innernamespace")
+            if ins.get("refid")
+        ],
+        "members": [
+            _member_record(member)
+            for section in compounddef.findall("sectiondef")
+            for member in section.findall("memberdef")
+        ],
+    }
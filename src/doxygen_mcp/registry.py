@@ -0,0 +1,220 @@
+"""
+Registry of loaded query engines.
+
+Replaces the plain class-level dict of engines. Each entry remembers the
+stat fingerprint (size, mtime, inode) of the index.xml it was loaded from;
+`lookup` re-stats the file and drops the engine if docs were regenerated
+underneath it, so the caller transparently loads a fresh one. Every engine
+registered for a directory gets the next "generation" number. Engines are
+kept in least-recently-used order and evicted once their estimated memory
+exceeds DOXYGEN_ENGINE_MEMORY_MB; estimates are refreshed as engines build
+their lazy indices.
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .query_engine import DoxygenQueryEngine
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ENGINE_MEMORY_MB = 1024
+
+Fingerprint = Optional[Tuple[int, int, int]]
+
+
+def index_stat_fingerprint(index_path: Path) -> Fingerprint:
+    """Return (size, mtime_ns, inode) of an index.xml, or None if it is missing."""
+    try:
+        st = os.stat(index_path)
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime_ns, st.st_ino)
+
+
+def memory_cap_from_env() -> int:
+    """Read the engine memory cap in bytes from DOXYGEN_ENGINE_MEMORY_MB (0 = none)."""
+    raw = os.environ.get("DOXYGEN_ENGINE_MEMORY_MB")
+    try:
+        megabytes = float(raw) if raw else DEFAULT_ENGINE_MEMORY_MB
+    except ValueError:
+        megabytes = DEFAULT_ENGINE_MEMORY_MB
+    return max(0, int(megabytes * 1024 * 1024))
+
+
+class _Entry:
+    __slots__ = ("engine", "fingerprint", "size_bytes", "memory_epoch")
+
+    def __init__(self, engine: "DoxygenQueryEngine", fingerprint: Fingerprint):
+        self.engine = engine
+        self.fingerprint = fingerprint
+        self.size_bytes = 0
+        # engine.memory_epoch when size_bytes was estimated
+        self.memory_epoch = -1
+
+    def refresh_size(self):
+        """Re-estimate the engine if it built indices since the last estimate."""
+        epoch = self.engine.memory_epoch
+        if epoch != self.memory_epoch:
+            self.size_bytes = self.engine.estimated_memory()
+            self.memory_epoch = epoch
+
+
+class EngineRegistry(MutableMapping):
+    """
+    Thread-safe, LRU-ordered map of absolute XML directory -> engine.
+
+    Plain mapping access (``registry[path]``, ``get``, ``in``, ``pop``) does
+    not check freshness and is kept for existing callers; `lookup` and
+    `register` implement the validated, memory-bounded behaviour.
+    """
+
+    def __init__(self, memory_cap_bytes: Optional[int] = None):
+        self.memory_cap_bytes = (
+            memory_cap_from_env() if memory_cap_bytes is None else memory_cap_bytes
+        )
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.RLock()
+        self.reloads = 0
+        self.evictions = 0
+
+    # -- Mapping protocol ----------------------------------------------------
+
+    def __getitem__(self, path: str) -> "DoxygenQueryEngine":
+        with self._lock:
+            return self._entries[path].engine
+
+    def __setitem__(self, path: str, engine: "DoxygenQueryEngine") -> None:
+        self.register(path, engine, index_stat_fingerprint(engine.index_path))
+
+    def __delitem__(self, path: str) -> None:
+        with self._lock:
+            del self._entries[path]
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # -- Registry operations -------------------------------------------------
+
+    def lookup(
+        self, path: str, stale_ok: bool = False
+    ) -> Optional["DoxygenQueryEngine"]:
+        """
+        Return the engine for path if its index.xml is unchanged, else None.
+
+        A stale engine is dropped (and its cached compounds released) so the
+        caller loads the new index generation, unless `stale_ok` is set
+        because a replacement is already being loaded.
+        """
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None:
+                return None
+            fresh = (
+                stale_ok
+                or index_stat_fingerprint(entry.engine.index_path) == entry.fingerprint
+            )
+            if fresh:
+                self._entries.move_to_end(path)
+                # Lazy indices built by earlier calls may have grown the total
+                evicted = self._evict_over_cap(keep=path)
+            else:
+                del self._entries[path]
+                self.reloads += 1
+                evicted = [entry.engine]
+
+        if not fresh:
+            logger.info("index.xml changed under %s; reloading engine", path)
+        for old in evicted:
+            retire_engine(old)
+        return entry.engine if fresh else None
+
+    def register(
+        self, path: str, engine: "DoxygenQueryEngine", fingerprint: Fingerprint
+    ) -> int:
+        """
+        Register an engine loaded from an index.xml with the given fingerprint
+        (taken before loading, so a concurrent rewrite is caught on next use).
+        Returns the engine's generation number.
+        """
+        entry = _Entry(engine, fingerprint)
+        entry.refresh_size()
+        with self._lock:
+            generation = self._generations.get(path, 0) + 1
+            self._generations[path] = generation
+            engine.generation = generation
+            previous = self._entries.pop(path, None)
+            self._entries[path] = entry
+            evicted = self._evict_over_cap(keep=path)
+        if previous is not None and previous.engine is not engine:
+            retire_engine(previous.engine)
+        for old in evicted:
+            retire_engine(old)
+        return generation
+
+    def _evict_over_cap(self, keep: str):
+        """
+        Pop least-recently-used engines over the cap; the caller holds the lock.
+
+        Engines that built lazy indices (call graph, fuzzy index, member maps,
+        ...) since their last estimate are re-estimated first; the others keep
+        their cached estimate, so this stays cheap however many are loaded.
+        """
+        if not self.memory_cap_bytes:
+            return []
+        for entry in self._entries.values():
+            entry.refresh_size()
+        evicted = []
+        total = sum(entry.size_bytes for entry in self._entries.values())
+        for path in list(self._entries):
+            if total <= self.memory_cap_bytes:
+                break
+            if path == keep:
+                continue
+            entry = self._entries.pop(path)
+            total -= entry.size_bytes
+            self.evictions += 1
+            evicted.append(entry.engine)
+            logger.info("Evicted engine for %s (~%d bytes)", path, entry.size_bytes)
+        return evicted
+
+    def generation(self, path: str) -> int:
+        """Return the latest generation registered for path (0 if none)."""
+        with self._lock:
+            return self._generations.get(path, 0)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-engine generation and memory estimate, plus registry counters."""
+        with self._lock:
+            for entry in self._entries.values():
+                entry.refresh_size()
+            engines = {
+                path: {
+                    "generation": entry.engine.generation,
+                    "estimated_bytes": entry.size_bytes,
+                }
+                for path, entry in self._entries.items()
+            }
+            return {
+                "engines": engines,
+                "estimated_bytes": sum(e.size_bytes for e in self._entries.values()),
+                "memory_cap_bytes": self.memory_cap_bytes,
+                "reloads": self.reloads,
+                "evictions": self.evictions,
+            }
+
+
+def retire_engine(engine: "DoxygenQueryEngine") -> None:
+    """Take a replaced, evicted or cleared engine out of service."""
+    engine.retire()
@@ -0,0 +1,107 @@
+"""
+Index of the source files in a repository.
+
+Built once per engine from ``git ls-files`` (tracked plus untracked,
+non-ignored files) or, outside git, a pruned directory walk. Lookups by
+basename or trailing path components then replace recursive ``rglob``
+searches when a Doxygen location does not resolve directly.
+"""
+
+import logging
+import os
+import posixpath
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Directories skipped by the fallback walk (git honours .gitignore instead).
+_WALK_IGNORE_DIRS = frozenset(
+    {"build", "node_modules", "html", "latex", "__pycache__", "venv"}
+)
+
+
+def _git_files(root: Path) -> Optional[List[str]]:
+    """List repository files via git, or None if git is unavailable."""
+    if not (root / ".git").exists():
+        return None
+    try:
+        result = subprocess.run(
+            ["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard"],
+            cwd=str(root),
+            capture_output=True,
+            check=True,
+            timeout=60,
+            shell=False,
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.debug("git ls-files failed in %s: %s", root, e)
+        return None
+    output = result.stdout.decode("utf-8", errors="surrogateescape")
+    return [path for path in output.split("\0") if path]
+
+
+def _walk_files(root: Path) -> List[str]:
+    """List files under root with a pruned os.walk."""
+    paths = []
+    for dirpath, dirs, files in os.walk(root):
+        dirs[:] = [
+            d for d in dirs if d not in _WALK_IGNORE_DIRS and not d.startswith(".")
+        ]
+        rel_dir = os.path.relpath(dirpath, root)
+        for name in files:
+            rel = name if rel_dir == "." else os.path.join(rel_dir, name)
+            paths.append(rel.replace(os.sep, "/"))
+    return paths
+
+
+class RepoFileIndex:
+    """Basename and path-suffix lookup over a repository's files."""
+
+    def __init__(self, root: Path, paths: List[str]):
+        self.root = root
+        self._by_basename: Dict[str, List[str]] = {}
+        for path in paths:
+            self._by_basename.setdefault(posixpath.basename(path), []).append(path)
+        for candidates in self._by_basename.values():
+            # Shallowest path first, then alphabetical, for stable results.
+            candidates.sort(key=lambda p: (p.count("/"), p))
+        self.file_count = len(paths)
+
+    @classmethod
+    def scan(cls, root: Path) -> "RepoFileIndex":
+        """Index the files under root, preferring git's view of the tree."""
+        paths = _git_files(root)
+        if paths is None:
+            paths = _walk_files(root)
+        return cls(root, paths)
+
+    def find(self, file_path: str) -> Optional[Path]:
+        """
+        Return the absolute path of the repository file best matching file_path.
+
+        Files whose path ends with all components of file_path win; otherwise
+        a file with the same basename is accepted only if it is the only one,
+        rather than guessing across directories. Files deleted since the scan
+        (git still lists them until the deletion is staged) are skipped.
+        """
+        normalized = posixpath.normpath(file_path.replace("\\", "/")).lstrip("/")
+        candidates = [
+            candidate
+            for candidate in self._by_basename.get(posixpath.basename(normalized), ())
+            if (self.root / candidate).exists()
+        ]
+        if not candidates:
+            return None
+
+        if "/" in normalized:
+            for candidate in candidates:
+                if candidate == normalized or candidate.endswith("/" + normalized):
+                    return self.root / candidate
+            for candidate in candidates:
+                if normalized.endswith("/" + candidate):
+                    return self.root / candidate
+        if len(candidates) == 1:
+            return self.root / candidates[0]
+        return None
@@ -157,7 +157,7 @@ def generate_report_html(project_path: Path, xml_dir: str) -> str:
     """Generate visual architecture review HTML report content."""
     import hashlib
 
-    engine = DoxygenQueryEngine._cache.get(str(Path(xml_dir).absolute()))
+    engine = DoxygenQueryEngine._cache.lookup(str(Path(xml_dir).absolute()))
     if not engine:
         # Fallback if cache not hit
         import asyncio
@@ -1,26 +1,501 @@
 """
 Semantic Search Engine using SQLite FTS5 for Doxygen MCP.
 Provides fast conceptual search across code and specifications.
+
+The index is maintained incrementally: every source (a compound XML file or
+a repository documentation file) is recorded with the stat and content
+fingerprints its rows were built from, so a sync after a delta refresh only
+re-parses the sources that actually changed.
+
+A sync is a streaming pipeline: index.xml is iterparsed, changed compound
+files are fingerprinted and parsed in a process pool (`map_batches`), and a
+dedicated writer thread applies the resulting rows in bounded batches inside
+one transaction. Memory stays flat and parsing scales with cores.
+
+The database is in WAL mode, so searches keep reading the last committed
+state while a sync writes. Searches run on per-thread read-only connections
+that are opened once and reused (`_ReaderPool`).
+
+Full builds never touch the live database: they are written to a shadow
+file, verified, and swapped in with `os.replace`. Each sync stores a
+manifest (index.xml fingerprint, row counts, duration) that decides whether
+the index is current.
 """
 
+import hashlib
+import json
 import logging
 import os
+import queue
 import sqlite3
+import threading
+import time
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
-import defusedxml.ElementTree as ET
+from . import xml_backend
+from .file_lock import exclusive_file_lock
+from .records import parse_compound_record
+from .snapshot import fingerprint_matches, index_fingerprint
+from .warmup import default_workers, map_batches
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever the table layout or row contents change; older databases
+# are then rebuilt instead of synced.
+SCHEMA_VERSION = 2
+
+_IGNORE_DIRS = {
+    ".git",
+    "build",
+    "node_modules",
+    "html",
+    "latex",
+    ".venv",
+    "__pycache__",
+}
+_DOC_EXTENSIONS = {".md", ".yaml", ".yml", ".txt"}
+
+_INSERT_ROW = (
+    "INSERT INTO entries "
+    "(id, name, kind, refid, parent, signature, brief, detailed, filepath) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+# Row contents live once in `entries`; `symbols` is an external-content FTS5
+# index over it, kept in step by triggers. kind, refid and parent's
+# qualified name are only filtered on or displayed, so they are not indexed.
+_SCHEMA = """
+    CREATE TABLE entries (
+        id INTEGER PRIMARY KEY,
+        name TEXT, kind TEXT, refid TEXT, parent TEXT, signature TEXT,
+        brief TEXT, detailed TEXT, filepath TEXT
+    );
+    CREATE VIRTUAL TABLE symbols USING fts5(
+        name, kind UNINDEXED, refid UNINDEXED, parent, signature,
+        brief, detailed, filepath,
+        content='entries', content_rowid='id'
+    );
+    CREATE TRIGGER entries_ai AFTER INSERT ON entries BEGIN
+        INSERT INTO symbols (
+            rowid, name, kind, refid, parent, signature, brief, detailed, filepath
+        ) VALUES (
+            new.id, new.name, new.kind, new.refid, new.parent, new.signature,
+            new.brief, new.detailed, new.filepath
+        );
+    END;
+    CREATE TRIGGER entries_ad AFTER DELETE ON entries BEGIN
+        INSERT INTO symbols (
+            symbols, rowid, name, kind, refid, parent, signature, brief,
+            detailed, filepath
+        ) VALUES (
+            'delete', old.id, old.name, old.kind, old.refid, old.parent,
+            old.signature, old.brief, old.detailed, old.filepath
+        );
+    END;
+    -- One entry per indexed source ("compound:<refid>", "doc:<path>"):
+    -- the stat and content fingerprints its rows were built from, and the
+    -- contiguous id range [first_row, first_row + row_count) they occupy
+    CREATE TABLE sources (
+        key TEXT PRIMARY KEY, stat TEXT NOT NULL, digest TEXT NOT NULL,
+        first_row INTEGER NOT NULL DEFAULT 0, row_count INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+# bm25 weights in symbols column order: a hit in a name outranks one in a
+# signature or brief, which outranks one in body text.
+_BM25_WEIGHTS = (10.0, 0.0, 0.0, 3.0, 2.0, 4.0, 1.0, 1.0)
+
+# Member kinds given their own rows; other members (friends, signals, ...)
+# are only found through their compound.
+INDEXED_MEMBER_KINDS = frozenset({"function", "variable", "enum", "typedef"})
+
+# Settings for the writer connection
+_WRITER_PRAGMAS = (
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",
+)
+# Syncs into the live WAL database must survive a power loss; a shadow build
+# is discarded if interrupted, so it skips fsyncs entirely.
+_DURABLE_SYNC = "PRAGMA synchronous = NORMAL"
+_SHADOW_SYNC = "PRAGMA synchronous = OFF"
+
+# Settings for pooled search connections; the DB is memory-mapped so hot
+# pages are shared with the OS page cache instead of copied per connection.
+MMAP_SIZE = 256 * 1024 * 1024
+_READER_PRAGMAS = (
+    "PRAGMA query_only = ON",
+    f"PRAGMA mmap_size = {MMAP_SIZE}",
+)
+
+# Sources per write batch, and batches queued ahead of the writer thread
+BATCH_SIZE = 500
+QUEUED_BATCHES = 4
+
+# (name, kind, refid, parent, signature, brief, detailed, filepath)
+Row = Tuple[str, str, str, str, str, str, str, str]
+# (key, stat fingerprint, refid, kind, name, compound XML path or None,
+#  digest stored by the last sync or None)
+CompoundItem = Tuple[str, str, str, str, str, Optional[str], Optional[str]]
+# (key, stat fingerprint, content digest, rows or None if content is unchanged)
+SourceResult = Tuple[str, str, str, Optional[List[Row]]]
+
+
+def _stat_fingerprint(path: Optional[Path]) -> str:
+    try:
+        st = path.stat()  # type: ignore[union-attr]
+    except (OSError, AttributeError):
+        return "missing"
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+
+def _read_bytes(path: Optional[Any]) -> bytes:
+    try:
+        with open(path, "rb") as f:  # type: ignore[arg-type]
+            return f.read()
+    except (OSError, TypeError):
+        return b""
+
+
+def _compound_header(kind: str, name: str) -> str:
+    # index.xml contributes the name and kind, so they are fingerprinted too
+    return f"{kind}\0{name}"
+
+
+def parse_compound_file(refid: str, path: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Parse a compound XML file into a record, or None if it cannot be read."""
+    if path is None or not os.path.exists(path):
+        return None
+    try:
+        return parse_compound_record(Path(path))
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        logger.warning("Failed to parse %s.xml: %s", refid, e)
+        return None
+
+
+def compound_rows_batch(
+    batch: List[CompoundItem],
+    load: Callable[[str, Optional[str]], Optional[Dict[str, Any]]] = (
+        parse_compound_file
+    ),
+) -> List[SourceResult]:
+    """Fingerprint and parse changed compounds; runs in worker processes."""
+    results: List[SourceResult] = []
+    defined: Dict[str, bool] = {}
+
+    def has_compound(path: Optional[str], refid: str) -> bool:
+        if path is None:
+            return True
+        found = defined.get(refid)
+        if found is None:
+            xml_file = os.path.join(os.path.dirname(path), f"{refid}.xml")
+            found = defined[refid] = os.path.exists(xml_file)
+        return found
+
+    for key, stat, refid, kind, name, path, old_digest in batch:
+        header = _compound_header(kind, name).encode("utf-8")
+        digest = hashlib.blake2b(header + b"\0" + _read_bytes(path)).hexdigest()
+        if digest == old_digest:
+            results.append((key, stat, digest, None))
+            continue
+        record = load(refid, path)
+        if record is None:
+            rows = [(name, kind, refid, "", "", "", "", "")]
+        else:
+            rows = compound_rows(name, kind, refid, record, partial(has_compound, path))
+        results.append((key, stat, digest, rows))
+    return results
+
+
+def compound_rows(
+    name: str,
+    kind: str,
+    refid: str,
+    record: Dict[str, Any],
+    has_compound: Callable[[str], bool],
+) -> List[Row]:
+    """
+    Rows for a compound and its members.
+
+    Members are listed in every compound that groups them (a namespace
+    function also appears in its file). A member id is prefixed by its
+    defining compound's id, so a member is left to that compound when it has
+    an XML file of its own. Members of undocumented namespaces have none and
+    are stored under every compound listing them, so they stay searchable
+    while any of those compounds does; search() deduplicates them by refid.
+    """
+    filepath = record["location"].get("file") or ""
+    rows = [(name, kind, refid, "", "", record["brief"], record["detailed"], filepath)]
+    for member in record["members"]:
+        member_refid = member["refid"] or ""
+        if member["kind"] not in INDEXED_MEMBER_KINDS:
+            continue
+        owner = member_refid.rpartition("_1")[0]
+        if owner and owner != refid and has_compound(owner):
+            continue
+        signature = " ".join(
+            part for part in (member["type"], member["name"] + member["args"]) if part
+        )
+        rows.append(
+            (
+                member["name"],
+                member["kind"],
+                member_refid,
+                name,
+                signature,
+                member["brief"],
+                "",
+                member["location"].get("file") or filepath,
+            )
+        )
+    return rows
+
+
+class _RowBatch:
+    """One batch of row replacements for the symbols table and its bookkeeping."""
+
+    __slots__ = ("stale", "rows", "sources", "touched", "removed")
+
+    def __init__(self):
+        self.stale: List[Tuple[str]] = []
+        self.rows: List[Tuple[Any, ...]] = []
+        self.sources: List[Tuple[str, str, str, int, int]] = []
+        self.touched: List[Tuple[str, str, str]] = []
+        self.removed: List[Tuple[str]] = []
+
+    def __len__(self) -> int:
+        return len(self.stale) + len(self.sources) + len(self.touched)
+
+    def apply(self, conn):
+        cursor = conn.cursor()
+        if self.stale:
+            cursor.executemany(
+                "DELETE FROM entries WHERE id >= "
+                "(SELECT first_row FROM sources WHERE key = ?1) AND id < "
+                "(SELECT first_row + row_count FROM sources WHERE key = ?1)",
+                self.stale,
+            )
+        if self.rows:
+            cursor.executemany(_INSERT_ROW, self.rows)
+        if self.sources:
+            cursor.executemany(
+                "INSERT OR REPLACE INTO sources "
+                "(key, stat, digest, first_row, row_count) VALUES (?, ?, ?, ?, ?)",
+                self.sources,
+            )
+        if self.touched:
+            cursor.executemany(
+                "UPDATE sources SET stat = ?, digest = ? WHERE key = ?", self.touched
+            )
+        if self.removed:
+            cursor.executemany("DELETE FROM sources WHERE key = ?", self.removed)
+
+
+class _IndexWriter:
+    """
+    Applies row batches on a dedicated thread and connection, all in one
+    transaction that is committed by `close()`. `finalize(conn)` runs inside
+    that transaction just before the commit.
+
+    The queue is bounded, so producers block once the writer falls behind.
+    """
+
+    _COMMIT = object()
+    _ABORT = object()
+
+    def __init__(
+        self,
+        db_path: Path,
+        next_rowid: int,
+        optimize: bool = False,
+        finalize: Optional[Callable[[sqlite3.Connection], None]] = None,
+        durable: bool = True,
+    ):
+        self.next_rowid = next_rowid
+        self._finalize = finalize
+        self._batch = _RowBatch()
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=QUEUED_BATCHES)
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(db_path, optimize, durable),
+            name="fts-index-writer",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def set_source(self, key: str, stat: str, digest: str):
+        """Record new fingerprints for a source whose rows are still current."""
+        self._batch.touched.append((stat, digest, key))
+        self._maybe_flush()
+
+    def replace(self, key: str, stat: str, digest: str, rows: List[Row]):
+        """Replace every row of a source."""
+        self._batch.stale.append((key,))
+        first_row = self.next_rowid
+        for row in rows:
+            self._batch.rows.append((self.next_rowid, *row))
+            self.next_rowid += 1
+        self._batch.sources.append((key, stat, digest, first_row, len(rows)))
+        self._maybe_flush()
+
+    def remove(self, key: str):
+        """Drop a source and its rows."""
+        self._batch.stale.append((key,))
+        self._batch.removed.append((key,))
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        if len(self._batch) >= BATCH_SIZE:
+            self._put(self._batch)
+            self._batch = _RowBatch()
+
+    def _put(self, item: Any):
+        if self._error is not None:
+            raise self._error
+        self._queue.put(item)
+
+    def close(self, commit: bool = True):
+        """Flush, then commit (or roll back) and wait for the writer thread."""
+        try:
+            if commit and self._batch:
+                self._put(self._batch)
+        finally:
+            self._queue.put(self._COMMIT if commit else self._ABORT)
+            self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def _run(self, db_path: Path, optimize: bool, durable: bool):
+        conn = sqlite3.connect(db_path)
+        try:
+            conn.execute(_DURABLE_SYNC if durable else _SHADOW_SYNC)
+            for pragma in _WRITER_PRAGMAS:
+                conn.execute(pragma)
+            while True:
+                item = self._queue.get()
+                if item is self._ABORT:
+                    conn.rollback()
+                    return
+                if item is self._COMMIT:
+                    break
+                item.apply(conn)
+            if optimize:
+                # Merge the b-trees left by a bulk load into one per term
+                conn.execute("INSERT INTO symbols (symbols) VALUES ('optimize')")
+            if self._finalize is not None:
+                self._finalize(conn)
+            conn.commit()
+            # Fold the WAL back in while no search holds an old snapshot
+            conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        except BaseException as e:  # pylint: disable=broad-exception-caught
+            self._error = e
+            conn.rollback()
+            # Keep consuming so producers never block on a dead writer
+            while self._queue.get() not in (self._COMMIT, self._ABORT):
+                pass
+        finally:
+            conn.close()
+
+
+def _write_manifest(
+    conn: sqlite3.Connection, fingerprint: Dict[str, Any], started: float
+):
+    """Record what a sync was built from and produced, inside its transaction."""
+    rows, sources = conn.execute(
+        "SELECT (SELECT count(*) FROM entries), (SELECT count(*) FROM sources)"
+    ).fetchone()
+    manifest = {
+        "schema_version": SCHEMA_VERSION,
+        "fingerprint": fingerprint,
+        "rows": rows,
+        "sources": sources,
+        "duration_s": round(time.perf_counter() - started, 3),
+        "synced_at": time.time(),
+    }
+    conn.execute(
+        "INSERT OR REPLACE INTO meta (key, value) VALUES ('manifest', ?)",
+        (json.dumps(manifest),),
+    )
+
+
+class _ReaderPool:
+    """
+    Read-only SQLite connections, one per thread, reused across searches.
+
+    A connection is reopened when the database file is replaced or written
+    (a rebuild creates a new file that may reuse the old inode number), so a
+    thread never keeps reading a deleted index, and after close(), which
+    bumps the pool generation.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+        self._generation = 0
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            f"{self.db_path.as_uri()}?mode=ro", uri=True, check_same_thread=False
+        )
+        for pragma in _READER_PRAGMAS:
+            conn.execute(pragma)
+        with self._lock:
+            self._connections.append(conn)
+        return conn
+
+    def _discard(self, conn: sqlite3.Connection):
+        with self._lock:
+            if conn in self._connections:
+                self._connections.remove(conn)
+        conn.close()
+
+    def get(self) -> sqlite3.Connection:
+        """Return this thread's connection, reopening it if the file changed."""
+        st = self.db_path.stat()
+        identity = (st.st_dev, st.st_ino, st.st_ctime_ns, self._generation)
+        cached = getattr(self._local, "cached", None)
+        if cached is not None:
+            if cached[0] == identity:
+                return cached[1]
+            if cached[0][3] == self._generation:
+                self._discard(cached[1])
+        conn = self._open()
+        self._local.cached = (identity, conn)
+        return conn
+
+    def close(self):
+        """Close every pooled connection (threads reopen on their next search)."""
+        with self._lock:
+            self._generation += 1
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+
 
 class DoxygenSearchIndex:
     """FTS5-based search index for Doxygen symbols and repository context."""
 
-    def __init__(self, xml_dir: str):
+    def __init__(
+        self,
+        xml_dir: str,
+        record_loader: Optional[Callable[[str], Optional[Dict[str, Any]]]] = None,
+        workers: Optional[int] = None,
+    ):
         self.xml_dir = Path(xml_dir).resolve()
+        # refid -> compound record; lets the engine share its parsed records
+        # when compounds are parsed in this process
+        self.record_loader = record_loader
+        # Parser processes for large syncs (default: every available core)
+        self.workers = workers
         self.index_xml = self.xml_dir / "index.xml"
         self.db_path = self.xml_dir / "search_index.db"
+        self.lock_path = self.xml_dir / "search_index.db.lock"
+        self._readers = _ReaderPool(self.db_path)
 
         # Determine repo root by going up until we find .git
         self.repo_root = self.xml_dir
@@ -30,208 +505,404 @@ class DoxygenSearchIndex:
                 break
 
     def get_connection(self):
-        """Get an SQLite connection."""
+        """Get a read-write SQLite connection."""
         return sqlite3.connect(self.db_path)
 
+    def close(self):
+        """Close the pooled search connections."""
+        self._readers.close()
+
     def initialize(self) -> bool:
-        """Check if index needs rebuilding, and rebuild if necessary."""
+        """Check if index needs updating, and bring it up to date if necessary."""
         if not self.index_xml.exists():
             logger.warning("No index.xml found in %s", self.xml_dir)
             return False
 
-        needs_rebuild = False
-        if not self.db_path.exists():
-            needs_rebuild = True
-        else:
-            db_mtime = self.db_path.stat().st_mtime
-            idx_mtime = self.index_xml.stat().st_mtime
-            if idx_mtime > db_mtime:
-                needs_rebuild = True
-
-        if needs_rebuild:
-            self._build_index()
+        if self._needs_rebuild():
+            # Serialize updates across server processes sharing this xml_dir
+            with exclusive_file_lock(self.lock_path):
+                # Another process may have updated it while we waited
+                if not self.db_path.exists():
+                    self._build_index()
+                elif self._needs_rebuild():
+                    self._update_index()
 
         return True
 
-    def _parse_detailed_xml(self, refid: str):
-        """Parse detailed XML for a compound to extract descriptions and filepath."""
-        xml_file = self.xml_dir / f"{refid}.xml"
-        brief = ""
-        detailed = ""
-        filepath = ""
-
-        if not xml_file.exists():
-            return brief, detailed, filepath
+    def _needs_rebuild(self) -> bool:
+        """Return True if the database is missing or was synced from another index.xml."""
+        manifest = self.manifest()
+        if manifest is None:
+            return True
+        return not fingerprint_matches(manifest.get("fingerprint", {}), self.index_xml)
 
+    def manifest(self) -> Optional[Dict[str, Any]]:
+        """
+        Return the manifest stored by the last build or sync: the index.xml
+        fingerprint it was synced from, row and source counts, and duration.
+        """
+        if not self.db_path.exists():
+            return None
         try:
-            ct_tree = ET.parse(xml_file)
-            ct_root = ct_tree.getroot()
-            if ct_root is not None:
-                compounddef = ct_root.find("compounddef")
-                if compounddef is not None:
-                    brief = self._get_node_text(compounddef, "briefdescription")
-                    detailed = self._get_node_text(compounddef, "detaileddescription")
-                    loc = compounddef.find("location")
-                    if loc is not None:
-                        filepath = loc.get("file", "")
-        except Exception as e:
-            logger.warning("Failed to parse %s: %s", xml_file.name, e)
-
-        return brief, detailed, filepath
+            row = (
+                self._readers.get()
+                .execute("SELECT value FROM meta WHERE key = 'manifest'")
+                .fetchone()
+            )
+            return None if row is None else json.loads(row[0])
+        except (sqlite3.Error, OSError, ValueError):
+            return None
 
-    def _get_node_text(self, parent, tag):
-        """Helper to extract text from a subnode."""
-        node = parent.find(tag)
-        if node is not None:
-            return "".join(node.itertext()).strip()
-        return ""
+    def _load_record(self, refid: str, path: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Return the compound record for refid, or None if it cannot be read."""
+        if self.record_loader is not None:
+            return self.record_loader(refid)
+        return parse_compound_file(refid, path)
 
-    def _build_index(self):
-        """Parse XML and broader context to build the FTS5 index."""
+    def _build_index(self) -> Dict[str, int]:
+        """
+        Rebuild the FTS5 index from scratch into a shadow file, verify it and
+        atomically swap it into place. The live database keeps serving
+        searches until the swap; a failed or interrupted build leaves it as is.
+        """
         logger.info("Building SQLite FTS5 search index at %s", self.db_path)
-
-        if self.db_path.exists():
+        shadow = self.xml_dir / "search_index.db.building"
+        self._drop_database(shadow)
+        try:
+            conn = sqlite3.connect(shadow)
             try:
-                self.db_path.unlink()
-            except Exception as e:
-                logger.error("Failed to delete old db: %s", e)
+                self._create_schema(conn)
+                conn.commit()
+            finally:
+                conn.close()
+            stats = self._sync_into(shadow, {}, 1, durable=False)
+            self._verify(shadow, stats["added"])
+            self._swap_in(shadow)
+        except BaseException:
+            self._drop_database(shadow)
+            raise
+        return stats
+
+    @staticmethod
+    def _drop_database(db_path: Path):
+        # A leftover -wal/-shm must not be paired with a new database
+        for suffix in ("", "-journal", "-wal", "-shm"):
+            path = db_path.with_name(db_path.name + suffix)
+            if path.exists():
+                try:
+                    path.unlink()
+                except Exception as e:
+                    logger.error("Failed to delete old db: %s", e)
+
+    def _update_index(self) -> Dict[str, int]:
+        """
+        Sync the index with index.xml and the repository docs.
 
+        Only sources (compound XML files, documentation files) whose content
+        fingerprint changed since the last sync are re-parsed and have their
+        rows replaced; sources that disappeared are deleted. A database from
+        an older schema is rebuilt from scratch.
+        """
         conn = self.get_connection()
-        cursor = conn.cursor()
+        try:
+            if not self._schema_is_current(conn):
+                conn.close()
+                return self._build_index()
+            known = {
+                key: (stat, digest)
+                for key, stat, digest in conn.execute(
+                    "SELECT key, stat, digest FROM sources"
+                )
+            }
+            next_rowid = conn.execute(
+                "SELECT coalesce(max(id), 0) + 1 FROM entries"
+            ).fetchone()[0]
+        finally:
+            conn.close()
+        return self._sync_into(self.db_path, known, next_rowid)
+
+    def _sync_into(
+        self,
+        db_path: Path,
+        known: Dict[str, Tuple[str, str]],
+        next_rowid: int,
+        durable: bool = True,
+    ) -> Dict[str, int]:
+        """
+        Run one sync against db_path in a single transaction; `durable=False`
+        only for a shadow file that is discarded if the sync is interrupted.
+        """
+        started = time.perf_counter()
+        try:
+            # Taken before parsing, so a mid-sync rewrite of index.xml is
+            # picked up by the next sync
+            fingerprint = index_fingerprint(self.index_xml, with_digest=True)
+        except OSError:
+            fingerprint = {}
+        writer = _IndexWriter(
+            db_path,
+            next_rowid,
+            optimize=not known,
+            finalize=partial(_write_manifest, fingerprint=fingerprint, started=started),
+            durable=durable,
+        )
+        try:
+            stats = self._sync(known, writer)
+        except BaseException:
+            writer.close(commit=False)
+            raise
+        writer.close()
+        logger.info(
+            "FTS5 index sync complete in %.2fs: %d added, %d updated, "
+            "%d removed, %d unchanged",
+            time.perf_counter() - started,
+            stats["added"],
+            stats["updated"],
+            stats["removed"],
+            stats["unchanged"],
+        )
+        return stats
 
-        cursor.execute(
-            """
-            CREATE VIRTUAL TABLE symbols USING fts5(
-                name, kind, refid, brief, detailed, filepath
-            )
+    @staticmethod
+    def _verify(db_path: Path, expected_sources: int):
+        """
+        Check a freshly built database before it goes live, then switch it to
+        WAL. It is built in rollback mode so the bulk load skips the WAL copy.
         """
+        conn = sqlite3.connect(db_path)
+        try:
+            result = conn.execute("PRAGMA integrity_check").fetchone()[0]
+            if result != "ok":
+                raise sqlite3.DatabaseError(f"Integrity check failed: {result}")
+            # Raises if the full-text index disagrees with its content table
+            conn.execute(
+                "INSERT INTO symbols (symbols, rank) VALUES ('integrity-check', 1)"
+            )
+            rows, recorded, sources = conn.execute(
+                "SELECT (SELECT count(*) FROM entries), "
+                "(SELECT coalesce(sum(row_count), 0) FROM sources), "
+                "(SELECT count(*) FROM sources)"
+            ).fetchone()
+            manifest = json.loads(
+                conn.execute(
+                    "SELECT value FROM meta WHERE key = 'manifest'"
+                ).fetchone()[0]
+            )
+            if not rows == recorded == manifest["rows"] or not (
+                sources == expected_sources == manifest["sources"]
+            ):
+                raise sqlite3.DatabaseError(
+                    f"Row counts disagree: {rows} rows ({recorded} recorded, "
+                    f"{manifest['rows']} in manifest), {sources} sources "
+                    f"({expected_sources} synced, {manifest['sources']} in manifest)"
+                )
+            # Ends the implicit transaction opened by the FTS check above
+            conn.commit()
+            # Persistent: readers see the last commit while a sync writes
+            conn.execute("PRAGMA journal_mode = WAL")
+        finally:
+            conn.close()
+
+    def _swap_in(self, shadow: Path):
+        """Atomically replace the live database with a verified shadow build."""
+        try:
+            self._replace_database(shadow)
+        except PermissionError:
+            # Windows will not replace open files: close our readers and retry
+            self._readers.close()
+            self._replace_database(shadow)
+        logger.info("Swapped new FTS5 search index into %s", self.db_path)
+
+    def _replace_database(self, shadow: Path):
+        # Connections still on the old file keep their open -wal/-shm; a new
+        # connection to the new file must not find and replay them
+        for suffix in ("-wal", "-shm"):
+            self.db_path.with_name(self.db_path.name + suffix).unlink(missing_ok=True)
+        os.replace(shadow, self.db_path)
+
+    @staticmethod
+    def _schema_is_current(conn) -> bool:
+        try:
+            row = conn.execute(
+                "SELECT value FROM meta WHERE key = 'schema_version'"
+            ).fetchone()
+        except sqlite3.Error:
+            return False
+        return row is not None and row[0] == str(SCHEMA_VERSION)
+
+    @staticmethod
+    def _create_schema(conn):
+        conn.executescript(_SCHEMA)
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES ('schema_version', ?)",
+            (str(SCHEMA_VERSION),),
         )
 
+    def _sync(
+        self, known: Dict[str, Tuple[str, str]], writer: _IndexWriter
+    ) -> Dict[str, int]:
+        """Replace the rows of changed sources and drop those of removed ones."""
+        stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        seen = set()
+
+        def changed(items):
+            for item in items:
+                key, stat = item[0], item[1]
+                if key in seen:
+                    continue
+                seen.add(key)
+                old = known.get(key)
+                if old is not None and old[0] == stat:
+                    stats["unchanged"] += 1
+                else:
+                    yield (*item, None if old is None else old[1])
+
+        def apply(results):
+            for key, stat, digest, rows in results:
+                old = known.get(key)
+                if old is not None and old[1] == digest:
+                    # Touched or rewritten with identical content
+                    writer.set_source(key, stat, digest)
+                    stats["unchanged"] += 1
+                elif rows is not None:
+                    writer.replace(key, stat, digest, rows)
+                    stats["updated" if old is not None else "added"] += 1
+                elif old is not None:
+                    # No longer indexable (e.g. a doc file that is not text)
+                    writer.remove(key)
+                    stats["removed"] += 1
+
+        apply(
+            map_batches(
+                compound_rows_batch,
+                changed(self._compound_items()),
+                workers=self.workers or default_workers(),
+                local_fn=partial(compound_rows_batch, load=self._load_record),
+            )
+        )
+        apply(self._doc_results(changed(self._doc_items())))
+
+        for key in known.keys() - seen:
+            writer.remove(key)
+            stats["removed"] += 1
+        return stats
+
+    def _compound_items(self) -> Iterator[Tuple[str, str, str, str, str, Any]]:
+        """Yield (key, stat, refid, kind, name, path) per compound in index.xml."""
         try:
-            tree = ET.parse(self.index_xml)
-            root = tree.getroot()
-
-            if root is None:
-                logger.error("Empty or invalid index.xml in %s", self.xml_dir)
-                return
-
-            batch = []
-            for compound in root.findall("compound"):
-                result = self._process_compound_element(compound)
-                if result:
-                    batch.append(result)
-
-            if batch:
-                cursor.executemany(
-                    "INSERT INTO symbols (name, kind, refid, brief, detailed, filepath) "
-                    "VALUES (?, ?, ?, ?, ?, ?)",
-                    batch,
+            for _, elem in xml_backend.iterparse(self.index_xml, events=("end",)):
+                if elem.tag != "compound":
+                    continue
+                refid = elem.get("refid", "")
+                kind = elem.get("kind", "")
+                name = elem.findtext("name") or ""
+                elem.clear()
+                try:
+                    path: Optional[Path] = (self.xml_dir / f"{refid}.xml").resolve()
+                    path.relative_to(self.xml_dir)  # type: ignore[union-attr]
+                except (ValueError, RuntimeError):
+                    path = None
+                stat = f"{_stat_fingerprint(path)}|{_compound_header(kind, name)}"
+                yield (
+                    f"compound:{refid}",
+                    stat,
+                    refid,
+                    kind,
+                    name,
+                    None if path is None else str(path),
                 )
         except Exception as e:
             logger.error("Error parsing Doxygen XML for index: %s", e)
 
-        self._ingest_broader_context(cursor)
-        conn.commit()
-        conn.close()
-        logger.info("FTS5 index build complete.")
-
-    def _process_compound_element(self, compound):
-        """Helper to process a compound element and return data tuple for DB insert."""
-        refid = compound.get("refid", "")
-        kind = compound.get("kind", "")
-        name_elem = compound.find("name")
-        name = name_elem.text if name_elem is not None else ""
-
-        brief, detailed, filepath = self._parse_detailed_xml(refid)
-
-        return (name, kind, refid, brief, detailed, filepath)
-
-    def _ingest_broader_context(self, cursor):
-        """Scan repository for documentation files and ingest them."""
-        ignore_dirs = {
-            ".git",
-            "build",
-            "node_modules",
-            "html",
-            "latex",
-            ".venv",
-            "__pycache__",
-        }
-        batch = []
-
+    def _doc_items(self) -> Iterator[Tuple[str, str, Path]]:
+        """Yield (key, stat, path) per documentation file in the repository."""
         for root, dirs, files in os.walk(self.repo_root):
             dirs[:] = [
-                d for d in dirs if d not in ignore_dirs and not d.startswith(".")
+                d for d in dirs if d not in _IGNORE_DIRS and not d.startswith(".")
             ]
 
             for file in files:
-                ext = Path(file).suffix.lower()
-                if ext in {".md", ".yaml", ".yml", ".txt"}:
-                    result = self._ingest_file(root, file)
-                    if result:
-                        batch.append(result)
-
-        if batch:
-            cursor.executemany(
-                "INSERT INTO symbols (name, kind, refid, brief, detailed, filepath) "
-                "VALUES (?, ?, ?, ?, ?, ?)",
-                batch,
-            )
-
-    def _ingest_file(self, root, file):
-        """Process a single documentation file for the index."""
-        filepath = Path(root) / file
-        try:
-            rel_path = filepath.relative_to(self.repo_root)
-            with open(filepath, "r", encoding="utf-8") as f:
-                content = f.read()
-
-            return (
-                file,
+                if Path(file).suffix.lower() in _DOC_EXTENSIONS:
+                    path = Path(root) / file
+                    key = f"doc:{path.relative_to(self.repo_root)}"
+                    yield key, _stat_fingerprint(path), path
+
+    def _doc_results(self, items) -> Iterator[Tuple[str, str, str, Optional[List]]]:
+        """Read documentation files into single rows (None if not UTF-8 text)."""
+        for key, stat, path, _ in items:
+            content = _read_bytes(path)
+            digest = hashlib.blake2b(content).hexdigest()
+            try:
+                text = content.decode("utf-8")
+            except UnicodeDecodeError:
+                yield key, stat, digest, None
+                continue
+            row = (
+                path.name,
                 "documentation",
                 "file_context",
+                "",
+                "",
                 "Repository Specification/Documentation",
-                content,
-                str(rel_path),
+                text,
+                str(path.relative_to(self.repo_root)),
             )
-        except Exception:
-            return None
+            yield key, stat, digest, [row]
 
-    def search(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
-        """Perform a semantic search using SQLite FTS5."""
+    def search(
+        self, query: str, limit: int = 5, kinds: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Perform a semantic search using SQLite FTS5, optionally restricted to
+        some kinds ("class", "function", "documentation", ...).
+        """
         if not self.db_path.exists():
             return []
 
+        weights = ", ".join(str(w) for w in _BM25_WEIGHTS)
+        sql = (
+            "SELECT name, kind, refid, brief, filepath, parent, signature, "
+            f"bm25(symbols, {weights}) AS rank FROM symbols WHERE symbols MATCH ?"
+        )
+        params: List[Any] = [query]
+        if kinds:
+            sql += f" AND kind IN ({', '.join('?' * len(kinds))})"
+            params.extend(kinds)
+        sql += " ORDER BY rank"
+
+        # A member of an undocumented namespace is stored once per file that
+        # lists it; keep its best-ranked row. Documentation rows all share one
+        # refid and are told apart by path.
+        rows = []
+        seen = set()
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-
-            cursor.execute(
-                """
-                SELECT name, kind, refid, brief, filepath, bm25(symbols) as rank
-                FROM symbols
-                WHERE symbols MATCH ?
-                ORDER BY rank
-                LIMIT ?
-            """,
-                (query, limit),
-            )
-
-            results = []
-            for row in cursor.fetchall():
-                results.append(
-                    {
-                        "name": row[0],
-                        "kind": row[1],
-                        "refid": row[2],
-                        "brief": row[3],
-                        "filepath": row[4],
-                        "rank": round(row[5], 2),  # bm25 score
-                    }
-                )
-
-            conn.close()
-            return results
-        except sqlite3.Error as e:
+            cursor = self._readers.get().execute(sql, params)
+            try:
+                for row in cursor:
+                    key = row[4] if row[1] == "documentation" else row[2]
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    rows.append(row)
+                    if len(rows) >= limit:
+                        break
+            finally:
+                # Ends the read transaction so checkpoints are not held back
+                cursor.close()
+        except (sqlite3.Error, OSError) as e:
             logger.error("SQLite search error: %s", e)
             return [{"error": f"Search failed: {e}"}]
+
+        return [
+            {
+                "name": row[0],
+                "kind": row[1],
+                "refid": row[2],
+                "brief": row[3],
+                "filepath": row[4],
+                "parent": row[5],
+                "signature": row[6],
+                "rank": round(row[7], 2),  # weighted bm25 score
+            }
+            for row in rows
+        ]
@@ -15,7 +15,7 @@ import sys
 from importlib.metadata import PackageNotFoundError
 from importlib.metadata import version as get_package_version
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 try:
     import watchdog.events
@@ -30,10 +30,13 @@ import shutil
 # MCP server imports
 from mcp.server.fastmcp import FastMCP
 
+from .cache import COMPOUND_CACHE
 from .config import DoxygenConfig
 from .funnel import minify_xml_file, setup_funnel
 from .git_tracker import get_file_timeline
+from .name_index import DEFAULT_PAGE_SIZE
 from .query_engine import DoxygenQueryEngine
+from .source_cache import SOURCE_CACHE
 from .types import MCPResult
 from .utils import (
     detect_primary_language,
@@ -689,6 +692,14 @@ async def doxy_check() -> str:
     return await check_doxygen_install()
 
 
+def _format_suggestion(suggestion: Dict[str, Any]) -> str:
+    """Render a suggest_symbols entry as "name (kind in scope)"."""
+    where = suggestion["kind"]
+    if suggestion.get("scope"):
+        where += f" in {suggestion['scope']}"
+    return f"{suggestion['name']} ({where})"
+
+
 @mcp.tool()
 async def query_project_reference(
     symbol_name: Optional[str] = None,
@@ -723,7 +734,13 @@ async def query_project_reference(
         result = await asyncio.to_thread(engine.query_symbol, symbol_name)
 
         if not result:
-            return f"⚠️ Symbol '{symbol_name}' not found in index. Ensure it is committed or indexed."
+            message = f"⚠️ Symbol '{symbol_name}' not found in index. Ensure it is committed or indexed."
+            suggestions = await asyncio.to_thread(engine.suggest_symbols, symbol_name)
+            if suggestions:
+                message += "\nDid you mean: " + ", ".join(
+                    _format_suggestion(s) for s in suggestions
+                )
+            return message
 
         timeline = ""
         filepath = result.get("location", {}).get("file", "")
@@ -754,13 +771,133 @@ async def doxy_query(
     return await query_project_reference(symbol_name, project_path)
 
 
+# Fields doxy_query_batch can return per symbol, and the doxy_query defaults
+_BATCH_FIELDS = ("name", "kind", "brief", "detailed", "location", "members", "timeline")
+_DEFAULT_BATCH_FIELDS = ("name", "kind", "brief", "detailed", "location", "timeline")
+_MAX_BATCH_SYMBOLS = 100
+
+
+def _batch_item(
+    item: Union[str, Dict[str, Any]], default_fields: List[str]
+) -> Tuple[str, List[str]]:
+    """Normalize a batch entry to (symbol name, fields)."""
+    if isinstance(item, str):
+        return item, default_fields
+    name = item.get("name") or item.get("symbol")
+    if not name:
+        raise ValueError(f"batch entry without a name: {item!r}")
+    return name, list(item.get("fields") or default_fields)
+
+
+@mcp.tool(name="doxy_query_batch")
+async def doxy_query_batch(
+    symbols: List[Union[str, Dict[str, Any]]],
+    fields: Optional[List[str]] = None,
+    project_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Look up many symbols in one call. Entries are names or
+    {"name": ..., "fields": [...]}; git timelines are shared per file.
+    """
+    try:
+        if len(symbols) > _MAX_BATCH_SYMBOLS:
+            return {
+                "error": f"❌ At most {_MAX_BATCH_SYMBOLS} symbols per batch "
+                f"(got {len(symbols)})."
+            }
+        items = [
+            _batch_item(item, list(fields or _DEFAULT_BATCH_FIELDS)) for item in symbols
+        ]
+        unknown = sorted(
+            {f for _, item_fields in items for f in item_fields} - set(_BATCH_FIELDS)
+        )
+        if unknown:
+            return {
+                "error": f"❌ Unknown fields {unknown}; choose from {list(_BATCH_FIELDS)}."
+            }
+
+        # pylint: disable=no-member
+        resolved_path = await asyncio.to_thread(resolve_project_path, project_path)
+        xml_dir = await asyncio.to_thread(_find_xml_dir, resolved_path)
+
+        if not xml_dir:
+            return {"error": "❌ Doxygen XML not found. Generate documentation first."}
+
+        engine = await DoxygenQueryEngine.create(xml_dir)
+        details = await asyncio.to_thread(
+            engine.query_symbols, [name for name, _ in items]
+        )
+
+        # One git lookup per distinct file, run concurrently
+        timeline_set = set()
+        for name, item_fields in items:
+            entry = details.get(name)
+            if entry is None or "timeline" not in item_fields or "error" in entry:
+                continue
+            file_path = (entry.get("location") or {}).get("file")
+            if file_path:
+                timeline_set.add(file_path)
+        timeline_files = sorted(timeline_set)
+        timelines = dict(
+            zip(
+                timeline_files,
+                await asyncio.gather(
+                    *(
+                        asyncio.to_thread(
+                            get_file_timeline,
+                            str(resolved_path / file_path),
+                            is_indexed=True,
+                        )
+                        for file_path in timeline_files
+                    )
+                ),
+            )
+        )
+
+        results = []
+        missing = []
+        for name, item_fields in items:
+            result = details.get(name)
+            if not result or "error" in result:
+                missing.append(name)
+                entry = {"symbol": name, "found": False}
+                if result:
+                    entry["error"] = result["error"]
+                results.append(entry)
+                continue
+
+            entry = {"symbol": name, "found": True}
+            for field in item_fields:
+                if field == "timeline":
+                    file_path = (result.get("location") or {}).get("file")
+                    if file_path:
+                        entry["timeline"] = timelines[file_path]
+                elif field in result:
+                    entry[field] = result[field]
+            results.append(entry)
+
+        return {
+            "results": results,
+            "found": len(results) - len(missing),
+            "missing": missing,
+        }
+    except ValueError as e:
+        return {"error": f"❌ Error: {str(e)}"}
+    except Exception as e:
+        return {"error": f"❌ Error in doxy_query_batch: {str(e)}"}
+
+
 @mcp.tool()
 async def semantic_search(
     query: str,
     limit: int = 5,
     project_path: Optional[str] = None,
+    kind: Optional[str] = None,
 ) -> str:
-    """Semantic search across docs and symbols."""
+    """
+    Semantic search across docs, compounds and members. kind restricts
+    results, e.g. "function" or "class,struct".
+    """
     try:
         # pylint: disable=no-member
         resolved_path = await asyncio.to_thread(resolve_project_path, project_path)
@@ -771,7 +908,8 @@ async def semantic_search(
 
         engine = await DoxygenQueryEngine.create(xml_dir)
         # pylint: disable=no-member
-        results = await asyncio.to_thread(engine.semantic_search, query, limit)
+        kinds = [k.strip() for k in kind.split(",") if k.strip()] if kind else None
+        results = await asyncio.to_thread(engine.semantic_search, query, limit, kinds)
 
         if not results:
             return f"ℹ️ No semantic matches found for '{query}'."
@@ -786,7 +924,10 @@ async def semantic_search(
         ]
 
         for r in results:
-            lines.append(f"- {r['kind'].upper()}: {r['name']}")
+            scope = f" (in {r['parent']})" if r.get("parent") else ""
+            lines.append(f"- {r['kind'].upper()}: {r['name']}{scope}")
+            if r.get("signature"):
+                lines.append(f"   Signature: {r['signature']}")
             if r.get("filepath"):
                 full_path = resolved_path / r["filepath"]
                 # Compact timeline for search results
@@ -813,9 +954,10 @@ async def doxy_search(
     query: str,
     limit: int = 5,
     project_path: Optional[str] = None,
+    kind: Optional[str] = None,
 ) -> str:
     """Legacy wrapper for semantic_search."""
-    return await semantic_search(query, limit, project_path)
+    return await semantic_search(query, limit, project_path, kind)
 
 
 @mcp.tool()
@@ -981,13 +1123,13 @@ async def doxy_parity_check(project_path: Optional[str] = None) -> List[Dict[str
 
 def _merge_index_xml_sync(main_index_path: Path, temp_index_path: Path) -> None:
     """Helper to merge temporary index.xml into main index.xml."""
-    import defusedxml.ElementTree as ET
+    from . import xml_backend
 
     try:
-        main_tree = ET.parse(main_index_path)
+        main_tree = xml_backend.parse(main_index_path)
         main_root = main_tree.getroot()
 
-        temp_tree = ET.parse(temp_index_path)
+        temp_tree = xml_backend.parse(temp_index_path)
         temp_root = temp_tree.getroot()
 
         if main_root is None or temp_root is None:
@@ -1125,24 +1267,30 @@ async def doxy_refresh_delta(
         except RuntimeError as e:
             return f"❌ Error: {str(e)}"
 
-        xml_dest_dir = Path(xml_dir)
-        copied_count = await _process_delta_xml_files(temp_xml_out, xml_dest_dir)
+        # Publish the reload before touching the XML, so concurrent calls keep
+        # using the current engine instead of cold-loading half-written files
+        reserved = await DoxygenQueryEngine.reserve_reload(xml_dir)
+        try:
+            xml_dest_dir = Path(xml_dir)
+            copied_count = await _process_delta_xml_files(temp_xml_out, xml_dest_dir)
 
-        temp_index_path = temp_xml_out / "index.xml"
-        main_index_path = xml_dest_dir / "index.xml"
+            temp_index_path = temp_xml_out / "index.xml"
+            main_index_path = xml_dest_dir / "index.xml"
 
-        if temp_index_path.exists():
-            if not main_index_path.exists():
-                await asyncio.to_thread(shutil.copy2, temp_index_path, main_index_path)
-            else:
-                await asyncio.to_thread(
-                    _merge_index_xml_sync, main_index_path, temp_index_path
-                )
-
-        await asyncio.to_thread(shutil.rmtree, delta_temp, ignore_errors=True)
+            if temp_index_path.exists():
+                if not main_index_path.exists():
+                    await asyncio.to_thread(
+                        shutil.copy2, temp_index_path, main_index_path
+                    )
+                else:
+                    await asyncio.to_thread(
+                        _merge_index_xml_sync, main_index_path, temp_index_path
+                    )
 
-        DoxygenQueryEngine.clear_cache(xml_dir)
-        await DoxygenQueryEngine.create(xml_dir)
+            await asyncio.to_thread(shutil.rmtree, delta_temp, ignore_errors=True)
+        finally:
+            # Swap in the new generation; the old one serves until it is ready
+            await DoxygenQueryEngine.reload(xml_dir, reserved)
 
         return f"✅ Delta refresh completed successfully. Updated {copied_count} files."
     except Exception as e:
@@ -1202,6 +1350,44 @@ async def doxy_trace_path(
         return f"❌ Error in doxy_trace_path: {str(e)}"
 
 
+@mcp.tool(name="doxy_call_stats")
+async def doxy_call_stats(
+    symbol_name: str, max_depth: int = 3, project_path: Optional[str] = None
+) -> Dict[str, Any]:
+    """Fan-in/fan-out, direct callers/callees and reachability for a function."""
+    try:
+        # pylint: disable=no-member
+        resolved_path = await asyncio.to_thread(resolve_project_path, project_path)
+        xml_dir = await asyncio.to_thread(_find_xml_dir, resolved_path)
+
+        if not xml_dir:
+            return {"error": "❌ Doxygen XML not found. Generate documentation first."}
+
+        engine = await DoxygenQueryEngine.create(xml_dir)
+        return await asyncio.to_thread(engine.get_call_stats, symbol_name, max_depth)
+    except Exception as e:
+        return {"error": f"❌ Error in doxy_call_stats: {str(e)}"}
+
+
+@mcp.tool(name="doxy_warmup")
+async def doxy_warmup(
+    workers: Optional[int] = None, project_path: Optional[str] = None
+) -> Dict[str, Any]:
+    """Parse all compound XML in parallel processes to prime caches and indices."""
+    try:
+        # pylint: disable=no-member
+        resolved_path = await asyncio.to_thread(resolve_project_path, project_path)
+        xml_dir = await asyncio.to_thread(_find_xml_dir, resolved_path)
+
+        if not xml_dir:
+            return {"error": "❌ Doxygen XML not found. Generate documentation first."}
+
+        engine = await DoxygenQueryEngine.create(xml_dir)
+        return await asyncio.to_thread(engine.warm_up, workers)
+    except Exception as e:
+        return {"error": f"❌ Error in doxy_warmup: {str(e)}"}
+
+
 @mcp.tool()
 async def configure_repo_context(
     project_path: Optional[str] = None,
@@ -1229,9 +1415,22 @@ async def doxy_onboard(
     return await configure_repo_context(project_path)
 
 
+# Response key -> compound kind listed by get_project_structure
+_STRUCTURE_KINDS = (
+    ("classes", "class"),
+    ("namespaces", "namespace"),
+    ("files", "file"),
+)
+
+
 @mcp.tool()
-async def get_project_structure(project_path: Optional[str] = None) -> Dict[str, Any]:
-    """Get tree overview of documented components."""
+async def get_project_structure(
+    project_path: Optional[str] = None, page_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Get tree overview of documented components. With page_size, each list
+    holds only its first page; continue with doxy_list_symbols.
+    """
     try:
         # pylint: disable=no-member
         resolved_path = await asyncio.to_thread(resolve_project_path, project_path)
@@ -1242,22 +1441,59 @@ async def get_project_structure(project_path: Optional[str] = None) -> Dict[str,
 
         engine = await DoxygenQueryEngine.create(xml_dir)
 
-        structure = {
-            "project_root": str(resolved_path),
-            "classes": engine.list_all_symbols(kind_filter="class"),
-            "namespaces": engine.list_all_symbols(kind_filter="namespace"),
-            "files": engine.list_all_symbols(kind_filter="file"),
-        }
-
+        structure: Dict[str, Any] = {"project_root": str(resolved_path)}
+        if page_size is None:
+            for key, kind in _STRUCTURE_KINDS:
+                structure[key] = engine.list_all_symbols(kind_filter=kind)
+            return structure
+
+        pagination = {}
+        for key, kind in _STRUCTURE_KINDS:
+            page = engine.list_symbols_page(kind=kind, page_size=page_size)
+            structure[key] = page.pop("items")
+            pagination[key] = page
+        structure["pagination"] = pagination
         return structure
     except Exception as e:  # pylint: disable=broad-exception-caught
         return {"error": str(e)}
 
 
 @mcp.tool(name="doxy_structure")
-async def doxy_structure(project_path: Optional[str] = None) -> Dict[str, Any]:
+async def doxy_structure(
+    project_path: Optional[str] = None, page_size: Optional[int] = None
+) -> Dict[str, Any]:
     """Legacy wrapper for get_project_structure."""
-    return await get_project_structure(project_path)
+    return await get_project_structure(project_path, page_size)
+
+
+@mcp.tool(name="doxy_list_symbols")
+async def doxy_list_symbols(
+    kind: Optional[str] = None,
+    prefix: Optional[str] = None,
+    namespace: Optional[str] = None,
+    cursor: Optional[str] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    project_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Page through sorted compound names, optionally by kind ("class",
+    "namespace", "file", ...), namespace and name prefix. Pass next_cursor
+    back as cursor for the next page.
+    """
+    try:
+        # pylint: disable=no-member
+        resolved_path = await asyncio.to_thread(resolve_project_path, project_path)
+        xml_dir = await asyncio.to_thread(_find_xml_dir, resolved_path)
+
+        if not xml_dir:
+            return {"error": "❌ Doxygen XML not found. Generate documentation first."}
+
+        engine = await DoxygenQueryEngine.create(xml_dir)
+        return await asyncio.to_thread(
+            engine.list_symbols_page, kind, prefix, namespace, cursor, page_size
+        )
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        return {"error": f"❌ Error in doxy_list_symbols: {str(e)}"}
 
 
 @mcp.tool()
@@ -1271,26 +1507,29 @@ async def refresh_index(project_path: Optional[str] = None) -> str:
         if not xml_dir:
             return "❌ Error: Doxygen XML not found. Generate documentation first."
 
-        # Run Doxygen build and SNR filter
+        # Publish the reload before Doxygen rewrites the XML, so concurrent
+        # calls keep using the current engine instead of cold-loading it
+        reserved = await DoxygenQueryEngine.reserve_reload(xml_dir)
         try:
-            await asyncio.to_thread(
-                subprocess.run,
-                ["doxygen", "Doxyfile.fast"],
-                cwd=resolved_path,
-                check=True,
-                capture_output=True,
-                shell=False,
-            )
-
-            # Run SNR filter in parallel with bounded concurrency
-            await _minify_all_xml(xml_dir)
+            # Run Doxygen build and SNR filter
+            try:
+                await asyncio.to_thread(
+                    subprocess.run,
+                    ["doxygen", "Doxyfile.fast"],
+                    cwd=resolved_path,
+                    check=True,
+                    capture_output=True,
+                    shell=False,
+                )
 
-        except Exception as build_err:
-            return f"❌ Failed to rebuild Doxygen index: {build_err}"
+                # Run SNR filter in parallel with bounded concurrency
+                await _minify_all_xml(xml_dir)
 
-        # Re-initializing the engine effectively refreshes the index
-        DoxygenQueryEngine.clear_cache(xml_dir)
-        await DoxygenQueryEngine.create(xml_dir)
+            except Exception as build_err:
+                return f"❌ Failed to rebuild Doxygen index: {build_err}"
+        finally:
+            # Swap in the new generation; the old one serves until it is ready
+            await DoxygenQueryEngine.reload(xml_dir, reserved)
         return "✅ Doxygen index rebuilt and refreshed successfully."
     except ValueError as e:
         return f"❌ Error: {str(e)}"
@@ -1319,23 +1558,9 @@ async def get_symbol_at_location(
 
         engine = await DoxygenQueryEngine.create(xml_dir)
         # pylint: disable=no-member
-        file_symbols = await asyncio.to_thread(engine.get_file_structure, file_path)
-
-        # Simple heuristic: find the symbol that contains this line
-        best_match = None
-        min_distance = float("inf")
-
-        for symbol in file_symbols:
-            loc = symbol.get("location", {})
-            if loc.get("file") and Path(loc["file"]).name == Path(file_path).name:
-                sym_line = int(loc.get("line", 0))
-                if 0 < sym_line <= line_number:
-                    distance = line_number - sym_line
-                    if distance < min_distance:
-                        min_distance = distance
-                        best_match = symbol
-
-        return best_match
+        return await asyncio.to_thread(
+            engine.get_symbol_at_location, file_path, line_number
+        )
     except Exception as e:  # pylint: disable=broad-exception-caught
         return {"error": str(e)}
 
@@ -1634,6 +1859,23 @@ async def doxy_binary_gaps(project_path: Optional[str] = None) -> Dict[str, Any]
     return await find_binary_gaps(project_path)
 
 
+@mcp.tool(name="doxy_cache_stats")
+async def doxy_cache_stats() -> Dict[str, Any]:
+    """Report compound and source-file cache occupancy and hit/miss counters."""
+    stats = COMPOUND_CACHE.stats()
+    stats["source_files"] = SOURCE_CACHE.stats()
+    # pylint: disable=protected-access
+    engines = DoxygenQueryEngine._cache
+    stats["engines"] = len(engines)
+    stats["engine_registry"] = engines.stats()
+    stats["prefetch"] = {
+        path: engine._prefetcher.stats()
+        for path, engine in engines.items()
+        if engine._prefetcher is not None
+    }
+    return stats
+
+
 def generate_config(args):
     """Generate MCP configuration for various clients."""
     script_path = Path(__file__).resolve()
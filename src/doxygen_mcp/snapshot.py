@@ -0,0 +1,150 @@
+"""
+Persistent binary snapshot of the query engine's in-memory index.
+
+A snapshot is written next to ``search_index.db`` after index.xml has been
+parsed, and loaded on the next cold start while index.xml is unchanged, so
+server restarts skip the iterparse pass entirely.
+
+File layout: a fixed header (magic, format version, payload length) followed
+by a ``marshal`` payload. The file is memory-mapped on load.
+
+``marshal`` is not safe against crafted input: a malicious file can carry
+code objects or crash the interpreter while decoding. The snapshot is a
+cache with the same trust as the XML directory it sits in; do not point the
+server at an xml_dir that untrusted users can write to.
+"""
+
+import hashlib
+import logging
+import marshal
+import mmap
+import os
+import struct
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FILENAME = "engine_index.snapshot"
+SNAPSHOT_MAGIC = b"DXMCPIDX"
+# Bump whenever the shape of the exported engine state changes.
+SNAPSHOT_VERSION = 2
+
+_HEADER = struct.Struct("<8sIQ")  # magic, version, payload length
+
+
+def file_digest(path: Path) -> str:
+    """Return a content hash of a file."""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "blake2b").hexdigest()
+
+
+def index_fingerprint(index_path: Path, with_digest: bool = False) -> Dict[str, Any]:
+    """Return the stat-based fingerprint of index.xml, optionally with its hash."""
+    st = index_path.stat()
+    fingerprint: Dict[str, Any] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    if with_digest:
+        fingerprint["digest"] = file_digest(index_path)
+    return fingerprint
+
+
+def fingerprint_matches(stored: Dict[str, Any], index_path: Path) -> bool:
+    """Check a stored fingerprint against the current index.xml."""
+    try:
+        current = index_fingerprint(index_path)
+    except OSError:
+        return False
+
+    if stored.get("size") != current["size"]:
+        return False
+    if stored.get("mtime_ns") == current["mtime_ns"]:
+        return True
+
+    # Same size but a different mtime (touch, checkout, copy): fall back to
+    # comparing content hashes before discarding the snapshot.
+    try:
+        return stored.get("digest") == file_digest(index_path)
+    except OSError:
+        return False
+
+
+def pack_repeated(values: List[str]) -> Tuple[List[str], bytes]:
+    """Dictionary-encode a column of highly repetitive strings."""
+    table: List[str] = []
+    ids: Dict[str, int] = {}
+    codes = array("I")
+    for value in values:
+        code = ids.get(value)
+        if code is None:
+            code = ids[value] = len(table)
+            table.append(value)
+        codes.append(code)
+    return table, codes.tobytes()
+
+
+def unpack_repeated(packed: Tuple[List[str], bytes]) -> List[str]:
+    """Decode a column produced by `pack_repeated`."""
+    table, raw = packed
+    codes = array("I")
+    codes.frombytes(raw)
+    return [table[code] for code in codes]
+
+
+def load_snapshot(snapshot_path: Path, index_path: Path) -> Optional[Dict[str, Any]]:
+    """Load engine state from a snapshot if it is still valid for index.xml."""
+    try:
+        with open(snapshot_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < _HEADER.size:
+                return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                magic, version, length = _HEADER.unpack_from(mm, 0)
+                if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+                    return None
+                if _HEADER.size + length != size:
+                    return None
+                with memoryview(mm)[_HEADER.size :] as payload:
+                    data = marshal.loads(payload)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, EOFError, TypeError, struct.error) as e:
+        logger.warning("Ignoring unreadable index snapshot %s: %s", snapshot_path, e)
+        return None
+
+    if not isinstance(data, dict) or not isinstance(data.get("state"), dict):
+        return None
+    fingerprint = data.get("fingerprint")
+    if not isinstance(fingerprint, dict):
+        return None
+    if not fingerprint_matches(fingerprint, index_path):
+        return None
+
+    return data["state"]
+
+
+def write_snapshot(
+    snapshot_path: Path, fingerprint: Dict[str, Any], state: Dict[str, Any]
+) -> bool:
+    """
+    Atomically write engine state keyed by an index.xml fingerprint.
+
+    The fingerprint should be taken *before* index.xml is parsed so that an
+    index rewritten mid-parse invalidates the snapshot instead of masking it.
+    """
+    tmp_path = snapshot_path.with_name(f"{snapshot_path.name}.{os.getpid()}.tmp")
+    try:
+        payload = marshal.dumps({"fingerprint": fingerprint, "state": state})
+
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(payload)))
+            f.write(payload)
+        os.replace(tmp_path, snapshot_path)
+        return True
+    except (OSError, ValueError) as e:
+        logger.warning("Could not write index snapshot %s: %s", snapshot_path, e)
+        try:
+            tmp_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+        return False
@@ -0,0 +1,156 @@
+"""
+Shared cache of source files with line-offset tables.
+
+Call-site scanning and snippet extraction read small line ranges from the
+same few files many times. Each file's line start offsets are computed once
+and ranges are sliced out of the cached contents. Entries are revalidated
+against the file's size and mtime on every access and the number of cached
+files is LRU-bounded.
+
+Files up to INLINE_MAX_BYTES are read into memory once. Larger files keep
+only their offsets and read each range with a short-lived file handle, so
+no handle or mapping outlives a call: editors can still replace the file
+(Windows refuses renames over open files) and a file truncated mid-read
+yields a short read instead of a fault.
+"""
+
+import os
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+DEFAULT_MAX_FILES = 64
+# Largest file whose contents are kept in memory
+INLINE_MAX_BYTES = 1024 * 1024
+_SCAN_CHUNK = 1024 * 1024
+
+
+class SourceFile:
+    """A source file with the byte offset of every line start."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._data: Optional[bytes] = None
+        offsets = array("Q")
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            self.size = st.st_size
+            self.mtime_ns = st.st_mtime_ns
+            if self.size <= INLINE_MAX_BYTES:
+                self._data = f.read()
+                self.size = len(self._data)
+                chunks = [(0, self._data)]
+            else:
+                chunks = self._scan(f)
+            for base, chunk in chunks:
+                pos = chunk.find(b"\n")
+                while pos != -1:
+                    offsets.append(base + pos + 1)
+                    pos = chunk.find(b"\n", pos + 1)
+
+        if self.size:
+            offsets.insert(0, 0)
+        if offsets and offsets[-1] == self.size:
+            offsets.pop()  # trailing newline does not start another line
+        self._offsets = offsets
+
+    def _scan(self, f):
+        """Yield (offset, chunk) over a large file and record its real size."""
+        base = 0
+        while True:
+            chunk = f.read(_SCAN_CHUNK)
+            if not chunk:
+                break
+            yield base, chunk
+            base += len(chunk)
+        self.size = base
+
+    def _slice(self, start: int, end: int) -> bytes:
+        if self._data is not None:
+            return self._data[start:end]
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            return f.read(end - start)
+
+    @property
+    def line_count(self) -> int:
+        return len(self._offsets)
+
+    def line(self, number: int) -> str:
+        """Return 1-based line `number` without its line terminator."""
+        start = self._offsets[number - 1]
+        end = self._offsets[number] if number < len(self._offsets) else self.size
+        return self._slice(start, end).decode("utf-8").rstrip("\r\n")
+
+    def lines(self, first: int, last: int) -> List[str]:
+        """Return 1-based lines first..last (inclusive), clamped to the file."""
+        first = max(first, 1)
+        last = min(last, len(self._offsets))
+        if first > last:
+            return []
+        start = self._offsets[first - 1]
+        end = self._offsets[last] if last < len(self._offsets) else self.size
+        text = self._slice(start, end).decode("utf-8")
+        return [line.rstrip("\r") for line in text.split("\n")[: last - first + 1]]
+
+
+class SourceCache:
+    """Thread-safe, LRU-bounded map of path -> `SourceFile`."""
+
+    def __init__(self, max_files: int = DEFAULT_MAX_FILES):
+        self.max_files = max_files
+        self._files: "OrderedDict[str, Tuple[int, int, SourceFile]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: Union[str, Path]) -> SourceFile:
+        """Return the current contents of a file, re-reading it if it changed."""
+        key = str(path)
+        st = os.stat(key)
+        with self._lock:
+            entry = self._files.get(key)
+            if entry is not None and entry[:2] == (st.st_size, st.st_mtime_ns):
+                self._files.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+
+        # Read outside the lock; evicted entries are freed once no reader
+        # still holds a reference.
+        source = SourceFile(Path(key))
+        with self._lock:
+            self._files[key] = (source.size, source.mtime_ns, source)
+            self._files.move_to_end(key)
+            while len(self._files) > self.max_files:
+                self._files.popitem(last=False)
+        return source
+
+    def clear(self) -> None:
+        """Drop every cached file."""
+        with self._lock:
+            self._files.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return occupancy and hit/miss counters."""
+        with self._lock:
+            return {
+                "files": len(self._files),
+                "max_files": self.max_files,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+def _max_files_from_env() -> int:
+    try:
+        return max(1, int(os.environ.get("DOXYGEN_SOURCE_CACHE_FILES", "")))
+    except ValueError:
+        return DEFAULT_MAX_FILES
+
+
+# Process-wide cache shared by every query engine.
+SOURCE_CACHE = SourceCache(_max_files_from_env())
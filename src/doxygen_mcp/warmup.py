@@ -0,0 +1,130 @@
+"""
+Parallel compound parsing for full-index warmup.
+
+Parsing thousands of compound XML files is CPU-bound and serialised by the
+GIL, so warmup fans the work out to a process pool. Workers receive batches
+of file paths and return plain-data compound records, which the parent then
+feeds into the engine's caches and indices. `map_batches` is the same
+bounded pool for other per-file work, such as the search index build.
+"""
+
+import itertools
+import logging
+import multiprocessing
+import os
+from collections import deque
+from collections.abc import Sized
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from .records import parse_compound_record
+
+logger = logging.getLogger(__name__)
+
+# Files handed to a worker per task; large enough to amortise pickling.
+DEFAULT_BATCH_SIZE = 64
+
+ParseResult = Tuple[str, Optional[Dict[str, Any]], Optional[str]]
+
+
+def warmup_mode() -> str:
+    """Return the DOXYGEN_WARMUP mode ("full" or "" for none)."""
+    return os.environ.get("DOXYGEN_WARMUP", "").strip().lower()
+
+
+def default_workers() -> int:
+    """Worker count: every available core."""
+    try:
+        return max(1, len(os.sched_getaffinity(0)))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def parse_batch(batch: Sequence[Tuple[str, str]]) -> List[ParseResult]:
+    """Parse (refid, path) pairs; runs in worker processes."""
+    results: List[ParseResult] = []
+    for refid, path in batch:
+        try:
+            record = parse_compound_record(Path(path))
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            results.append((refid, None, f"Error parsing {path}: {e}"))
+            continue
+        if record is None:
+            results.append((refid, None, "No compounddef found"))
+        else:
+            results.append((refid, record, None))
+    return results
+
+
+def _pool_context():
+    """Prefer forkserver: forking a threaded server process is unsafe."""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context(
+        "forkserver" if "forkserver" in methods else "spawn"
+    )
+
+
+def _batched(items: Iterable[Any], batch_size: int) -> Iterator[List[Any]]:
+    iterator = iter(items)
+    while batch := list(itertools.islice(iterator, batch_size)):
+        yield batch
+
+
+def map_batches(
+    fn: Callable[[List[Any]], List[Any]],
+    items: Iterable[Any],
+    workers: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    local_fn: Optional[Callable[[List[Any]], List[Any]]] = None,
+) -> Iterator[Any]:
+    """
+    Apply fn to consecutive batches of items and yield the results in order.
+
+    Batches run in a process pool when more than one worker is used and there
+    is more than one batch; otherwise in this process, with local_fn if given.
+    Items are consumed lazily and at most two batches per worker are in
+    flight, so memory stays flat however long the input is.
+    """
+    workers = workers or default_workers()
+    batches = _batched(items, batch_size)
+    head = list(itertools.islice(batches, 2))
+    if workers <= 1 or len(head) <= 1:
+        for batch in itertools.chain(head, batches):
+            yield from (local_fn or fn)(batch)
+        return
+
+    if isinstance(items, Sized):
+        workers = min(workers, -(-len(items) // batch_size))
+    pending: Deque[Future] = deque()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context()) as pool:
+        for batch in itertools.chain(head, batches):
+            pending.append(pool.submit(fn, batch))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def parse_compounds(
+    items: Iterable[Tuple[str, str]],
+    workers: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[ParseResult]:
+    """
+    Parse (refid, path) pairs, in parallel when more than one worker is used.
+
+    Results are yielded batch by batch in input order.
+    """
+    return map_batches(parse_batch, items, workers, batch_size)
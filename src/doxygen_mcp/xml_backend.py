@@ -0,0 +1,130 @@
+"""
+XML parsing backend for Doxygen output.
+
+Uses lxml's C parser when it is installed, configured so it never resolves
+entities, loads DTDs or touches the network, and falls back to
+``defusedxml.ElementTree`` otherwise. Like defusedxml, the lxml path rejects
+documents that declare entities (Doxygen never emits them). Both backends
+return ElementTree-style trees, so callers only use the common
+``find``/``findall``/``iter`` API.
+
+Environment:
+    DOXYGEN_XML_BACKEND: ``auto`` (default), ``lxml`` or ``defusedxml``.
+    DOXYGEN_XML_HUGE_TREE: allow lxml to parse very deep or very large
+        documents (disables libxml2's size safety limits). Off by default.
+"""
+
+import os
+import threading
+from typing import Any, Iterator, Tuple
+
+import defusedxml.ElementTree as DefusedET
+from defusedxml.common import EntitiesForbidden
+
+try:
+    from lxml import etree as _lxml_etree
+
+    # Fail over on stub or broken installs, not just a missing package.
+    _LxmlParser = _lxml_etree.XMLParser
+except (ImportError, AttributeError):
+    _lxml_etree = None
+
+_FALSE_VALUES = ("false", "0", "no", "off")
+
+_local = threading.local()
+
+ParseErrors: Tuple[type, ...] = (DefusedET.ParseError,)
+if _lxml_etree is not None:
+    ParseErrors += (_lxml_etree.XMLSyntaxError,)
+
+
+def _huge_tree() -> bool:
+    """Whether DOXYGEN_XML_HUGE_TREE enables lxml's huge_tree mode."""
+    raw = os.environ.get("DOXYGEN_XML_HUGE_TREE")
+    return raw is not None and raw.lower() not in _FALSE_VALUES
+
+
+def backend_name() -> str:
+    """Return the backend in effect: "lxml" or "defusedxml"."""
+    requested = os.environ.get("DOXYGEN_XML_BACKEND", "auto").lower()
+    if requested == "defusedxml" or _lxml_etree is None:
+        return "defusedxml"
+    return "lxml"
+
+
+def _lxml_parser():
+    """Return this thread's hardened lxml parser (lxml parsers are not thread-safe)."""
+    huge_tree = _huge_tree()
+    parser = getattr(_local, "parser", None)
+    if parser is None or _local.huge_tree != huge_tree:
+        parser = _LxmlParser(
+            resolve_entities=False,
+            no_network=True,
+            load_dtd=False,
+            huge_tree=huge_tree,
+        )
+        _local.parser = parser
+        _local.huge_tree = huge_tree
+    return parser
+
+
+def _lxml_source(source: Any) -> Any:
+    """lxml accepts file objects and str paths but not Path objects."""
+    return source if hasattr(source, "read") else os.fspath(source)
+
+
+def _reject_entity_declarations(tree) -> None:
+    """Raise EntitiesForbidden if the document's internal DTD declares entities."""
+    dtd = tree.docinfo.internalDTD
+    if dtd is None:
+        return
+    for decl in dtd.iterentities():
+        raise EntitiesForbidden(
+            decl.name, decl.content, None, decl.system_url, None, None
+        )
+
+
+def parse(source: Any):
+    """Parse a file path or file object into an element tree."""
+    if backend_name() == "lxml":
+        tree = _lxml_etree.parse(_lxml_source(source), _lxml_parser())
+        _reject_entity_declarations(tree)
+        return tree
+    return DefusedET.parse(source)
+
+
+def _checked_iterparse(context) -> Iterator:
+    """Yield from an lxml iterparse context, checking the DTD before the first event."""
+    checked = False
+    for event, elem in context:
+        if not checked:
+            _reject_entity_declarations(elem.getroottree())
+            checked = True
+        yield event, elem
+
+
+def iterparse(source: Any, events: Tuple[str, ...] = ("end",)) -> Iterator:
+    """Incrementally parse a file, yielding (event, element) pairs."""
+    if backend_name() == "lxml":
+        return _checked_iterparse(
+            _lxml_etree.iterparse(
+                _lxml_source(source),
+                events=events,
+                resolve_entities=False,
+                no_network=True,
+                load_dtd=False,
+                huge_tree=_huge_tree(),
+            )
+        )
+    return DefusedET.iterparse(source, events=events)
+
+
+def fromstring(text: Any):
+    """Parse XML text or bytes into an element."""
+    if backend_name() == "lxml":
+        if isinstance(text, str):
+            text = text.encode("utf-8")
+        root = _lxml_etree.fromstring(text, _lxml_parser())
+        _reject_entity_declarations(root.getroottree())
+        return root
+    return DefusedET.fromstring(text)
@@ -58,3 +58,25 @@ except ImportError:
     sys.modules["mcp"] = mock_mcp
     sys.modules["mcp.server"] = mock_server
     sys.modules["mcp.server.fastmcp"] = mock_fastmcp
+
+
+@pytest.fixture
+def load_engine():
+    """
+    Return a factory that writes Doxygen XML files into a directory and
+    returns a DoxygenQueryEngine with its index loaded from them.
+    """
+    # Imported here so the mcp mock above is installed first
+    from doxygen_mcp.query_engine import (  # pylint: disable=import-outside-toplevel
+        DoxygenQueryEngine,
+    )
+
+    def load(xml_dir, files=None):
+        xml_dir.mkdir(parents=True, exist_ok=True)
+        for name, content in (files or {}).items():
+            (xml_dir / name).write_text(content, encoding="utf-8")
+        engine = DoxygenQueryEngine(str(xml_dir))
+        engine._load_index()  # pylint: disable=protected-access
+        return engine
+
+    return load
@@ -0,0 +1,116 @@
+"""
+Unit tests for the shared, byte-budgeted compound cache.
+"""
+
+import asyncio
+
+import pytest
+
+from doxygen_mcp.cache import COMPOUND_CACHE, CompoundCache, estimate_size
+from doxygen_mcp.query_engine import DoxygenQueryEngine
+
+CLASS_XML = """<?xml version='1.0' encoding='UTF-8' standalone='no'?>
+<doxygen version="1.9.1">
+  <compounddef id="class_widget" kind="class">
+    <compoundname>Widget</compoundname>
+    <briefdescription><para>A widget.</para></briefdescription>
+  </compounddef>
+</doxygen>
+"""
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_cache():
+    """Isolate the process-wide cache between tests."""
+    COMPOUND_CACHE.clear()
+    yield
+    COMPOUND_CACHE.clear()
+
+
+def test_estimate_size_grows_with_content():
+    """Larger nested payloads are estimated as larger."""
+    small = {"name": "a", "members": []}
+    large = {"name": "a", "members": [{"name": f"m{i}"} for i in range(50)]}
+    assert estimate_size(large) > estimate_size(small) > 0
+
+
+def test_evicts_least_recently_used_by_size():
+    """Entries are evicted oldest-first once the byte budget is exceeded."""
+    cache = CompoundCache(budget_bytes=300)
+    cache.put("ns", "a", "a", size=100)
+    cache.put("ns", "b", "b", size=100)
+    cache.put("ns", "c", "c", size=100)
+    assert cache.get("ns", "a") == "a"  # refresh "a"
+
+    cache.put("ns", "d", "d", size=100)
+    assert cache.get("ns", "b") is None
+    assert cache.get("ns", "a") == "a"
+
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["used_bytes"] == 300
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+
+
+def test_rejects_entries_larger_than_budget():
+    """A single oversized entry is not cached and does not flush the cache."""
+    cache = CompoundCache(budget_bytes=100)
+    cache.put("ns", "a", "a", size=50)
+    assert not cache.put("ns", "big", "big", size=500)
+    assert cache.get("ns", "a") == "a"
+
+
+def test_invalidate_only_drops_namespace():
+    """Invalidating one namespace leaves other engines' entries alone."""
+    cache = CompoundCache(budget_bytes=1000)
+    cache.put("one", "a", 1, size=10)
+    cache.put("one", "b", 2, size=10)
+    cache.put("two", "a", 3, size=10)
+
+    assert cache.invalidate("one") == 2
+    assert cache.get("one", "a") is None
+    assert cache.get("two", "a") == 3
+    assert cache.stats()["used_bytes"] == 10
+
+
+def test_engine_caches_details_and_releases_on_clear(tmp_path):
+    """Details are served from the shared cache and dropped by clear_cache."""
+    (tmp_path / "class_widget.xml").write_text(CLASS_XML, encoding="utf-8")
+    engine = DoxygenQueryEngine(str(tmp_path))
+    DoxygenQueryEngine._cache[str(tmp_path)] = (
+        engine  # pylint: disable=protected-access
+    )
+
+    first = engine._fetch_compound_details(
+        "class_widget"
+    )  # pylint: disable=protected-access
+    second = engine._fetch_compound_details(
+        "class_widget"
+    )  # pylint: disable=protected-access
+    assert first == second
+    assert COMPOUND_CACHE.stats()["hits"] == 1
+
+    DoxygenQueryEngine.clear_cache(str(tmp_path))
+    assert COMPOUND_CACHE.stats()["entries"] == 0
+
+
+def test_engine_does_not_cache_errors(tmp_path):
+    """Missing compound files are retried instead of cached."""
+    engine = DoxygenQueryEngine(str(tmp_path))
+    assert "error" in engine._fetch_compound_details(
+        "missing"
+    )  # pylint: disable=protected-access
+    assert COMPOUND_CACHE.stats()["entries"] == 0
+
+
+def test_cache_stats_tool():
+    """The doxy_cache_stats tool surfaces the counters."""
+    from doxygen_mcp.server import doxy_cache_stats
+
+    COMPOUND_CACHE.put("ns", "a", "a", size=10)
+    COMPOUND_CACHE.get("ns", "a")
+    stats = asyncio.run(doxy_cache_stats())
+    assert stats["hits"] == 1
+    assert stats["entries"] == 1
+    assert "budget_bytes" in stats and "engines" in stats
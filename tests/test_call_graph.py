@@ -0,0 +1,190 @@
+"""
+Unit tests for the CSR call graph.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from doxygen_mcp.call_graph import CallGraphBuilder
+
+
+def _member(refid, name, references=(), referencedby=(), line=1):
+    return {
+        "refid": refid,
+        "name": name,
+        "kind": "function",
+        "location": {
+            "file": "src/app.c",
+            "line": str(line),
+            "bodystart": str(line),
+            "bodyend": str(line + 2),
+        },
+        "references": [{"refid": r, "name": r} for r in references],
+        "referencedby": [{"refid": r, "name": r} for r in referencedby],
+    }
+
+
+def _graph():
+    """main -> parse -> lex, main -> run -> lex; lex also calls ext (no record)."""
+    builder = CallGraphBuilder()
+    builder.add_compound(
+        {
+            "name": "app.c",
+            "kind": "file",
+            "members": [
+                _member("main", "main", references=("parse", "run"), line=1),
+                _member("parse", "parse", references=("lex",), line=10),
+                _member("run", "run", references=("lex",), line=20),
+                _member("lex", "lex", references=("ext",), referencedby=("parse",)),
+            ],
+        }
+    )
+    builder.add_compound(
+        {"name": "Lexer", "kind": "class", "members": [_member("lex", "lex")]}
+    )
+    return builder.build()
+
+
+def test_csr_edges_and_counts():
+    """Edges are deduplicated and indexed in both directions."""
+    graph = _graph()
+    main, lex = graph.node_id("main"), graph.node_id("lex")
+
+    assert [graph.refids[n] for n in graph.callees(main)] == ["parse", "run"]
+    assert sorted(graph.refids[n] for n in graph.callers(lex)) == ["parse", "run"]
+    assert graph.fan_out(main) == 2
+    assert graph.fan_in(lex) == 2
+    assert graph.edge_count == 5
+
+
+def test_class_listing_qualifies_file_member_names():
+    """A class listing of a member overrides the unqualified file listing."""
+    graph = _graph()
+    assert graph.names[graph.node_id("lex")] == "Lexer::lex"
+    assert graph.names[graph.node_id("main")] == "main"
+
+
+def test_reference_only_nodes_have_no_attributes():
+    """Targets without a member record are kept as bare nodes."""
+    graph = _graph()
+    ext = graph.node_id("ext")
+    assert not graph.is_member[ext]
+    assert graph.node(ext)["name"] == ""
+
+
+def test_reference_entries_fill_missing_body_spans():
+    """A reference's span and compoundref describe the member it names."""
+    builder = CallGraphBuilder()
+    helper = _member("helper", "helper")
+    helper["referencedby"] = [
+        {"refid": "ext", "compoundref": "ext.c", "startline": "7", "endline": "9"},
+        {"refid": "caller", "startline": "15", "endline": "20"},
+    ]
+    caller = _member("caller", "caller", line=15)
+    del caller["location"]["bodystart"], caller["location"]["bodyend"]
+    builder.add_compound({"name": "app.c", "kind": "file", "members": [helper, caller]})
+    graph = builder.build()
+
+    ext = graph.node(graph.node_id("ext"))
+    assert (ext["file"], ext["bodystart"], ext["bodyend"]) == ("ext.c", 7, 9)
+    caller_node = graph.node(graph.node_id("caller"))
+    assert (caller_node["file"], caller_node["bodystart"]) == ("src/app.c", 15)
+    assert caller_node["bodyend"] == 20
+
+
+def test_reachability_with_depth_limit():
+    """BFS reachability honours max_depth in both directions."""
+    graph = _graph()
+    main = graph.node_id("main")
+
+    direct = {graph.refids[n] for n, _ in graph.reachable(main, max_depth=1)}
+    assert direct == {"parse", "run"}
+    everything = dict(graph.reachable(main))
+    assert everything[graph.node_id("ext")] == 3
+
+    callers = {
+        graph.refids[n] for n, _ in graph.reachable(graph.node_id("ext"), reverse=True)
+    }
+    assert callers == {"lex", "parse", "run", "main"}
+
+
+INDEX_XML = """<?xml version='1.0' encoding='UTF-8' standalone='no'?>
+<doxygenindex version="1.9.1">
+  <compound refid="app_8c" kind="file"><name>app.c</name>
+    <member refid="app_8c_1main" kind="function"><name>main</name></member>
+    <member refid="app_8c_1helper" kind="function"><name>helper</name></member>
+  </compound>
+</doxygenindex>
+"""
+
+FILE_XML = """<?xml version='1.0' encoding='UTF-8' standalone='no'?>
+<doxygen>
+  <compounddef id="app_8c" kind="file">
+    <compoundname>app.c</compoundname>
+    <location file="app.c"/>
+    <sectiondef kind="func">
+      <memberdef kind="function" id="app_8c_1main">
+        <name>main</name>
+        <location file="app.c" line="5" bodystart="5" bodyend="8"/>
+        <references refid="app_8c_1helper">helper</references>
+      </memberdef>
+      <memberdef kind="function" id="app_8c_1helper">
+        <name>helper</name>
+        <location file="app.c" line="1" bodystart="1" bodyend="3"/>
+        <referencedby refid="app_8c_1main" startline="5" endline="8">main</referencedby>
+      </memberdef>
+    </sectiondef>
+  </compounddef>
+</doxygen>
+"""
+
+SOURCE = "int helper() {\n  return 1;\n}\nint main() {\n  return helper();\n}\n"
+
+
+@pytest.fixture
+def engine(tmp_path, load_engine):
+    """An engine over one file where main calls helper."""
+    (tmp_path / ".git").mkdir()
+    (tmp_path / "app.c").write_text(SOURCE, encoding="utf-8")
+    return load_engine(
+        tmp_path / "xml", {"index.xml": INDEX_XML, "app_8c.xml": FILE_XML}
+    )
+
+
+def test_engine_call_stats(engine):  # pylint: disable=redefined-outer-name
+    """The engine reports fan-in/fan-out from its lazily built graph."""
+    stats = engine.get_call_stats("helper")["definitions"][0]
+    assert stats["fan_in"] == 1
+    assert stats["fan_out"] == 0
+    assert stats["callers"] == ["main"]
+    assert "error" in engine.get_call_stats("nonexistent")
+
+
+def test_find_references_builds_the_graph_on_demand(
+    engine,
+):  # pylint: disable=redefined-outer-name
+    """References always come from the graph, whatever ran before."""
+    with patch.object(engine, "_get_member_referenced_by", side_effect=AssertionError):
+        refs = engine.find_references("helper")
+
+    assert engine._call_graph is not None  # pylint: disable=protected-access
+    assert refs[0]["line"] == 5
+    assert refs[0]["caller"] == "main"
+    assert engine.find_references("helper") == refs
+
+
+def test_find_references_walks_xml_without_a_graph_node(
+    engine,
+):  # pylint: disable=redefined-outer-name
+    """Members keyed by a synthetic file:line refid fall back to their record."""
+    definition = {
+        "name": "helper",
+        "refid": "app.c:1",
+        "is_member": True,
+        "parent_refid": "app_8c",
+    }
+    with patch.object(engine, "find_symbol_definitions", return_value=[definition]):
+        refs = engine.find_references("helper")
+
+    assert [(r["caller"], r["line"]) for r in refs] == [("main", 5)]
@@ -0,0 +1,111 @@
+"""
+Tests for the typo-tolerant name index and "did you mean" suggestions.
+"""
+
+import itertools
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from doxygen_mcp.fuzzy_index import FuzzyNameIndex, edit_distance
+from doxygen_mcp.query_engine import DoxygenQueryEngine
+from doxygen_mcp.server import doxy_query
+
+INDEX_XML = """<?xml version='1.0' encoding='UTF-8' standalone='no'?>
+<doxygenindex version="1.9.1">
+  <compound refid="class_widget" kind="class"><name>ui::Widget</name>
+    <member refid="class_widget_1render" kind="function"><name>render</name></member>
+  </compound>
+  <compound refid="class_window" kind="class"><name>ui::Window</name></compound>
+  <compound refid="ns_ui" kind="namespace"><name>ui</name></compound>
+</doxygenindex>
+"""
+
+
+def _reference_distance(a, b):
+    """Unbounded optimal string alignment distance."""
+    d = [
+        [i + j if i * j == 0 else 0 for j in range(len(b) + 1)]
+        for i in range(len(a) + 1)
+    ]
+    for i, j in itertools.product(range(1, len(a) + 1), range(1, len(b) + 1)):
+        d[i][j] = min(
+            d[i - 1][j] + 1,
+            d[i][j - 1] + 1,
+            d[i - 1][j - 1] + (a[i - 1] != b[j - 1]),
+        )
+        if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+            d[i][j] = min(d[i][j], d[i - 2][j - 2] + 1)
+    return d[-1][-1]
+
+
+def test_bounded_edit_distance_matches_reference():
+    """The banded distance agrees with the full table up to its bound."""
+    words = ["".join(p) for n in range(5) for p in itertools.product("ab", repeat=n)]
+    for a, b in itertools.product(words, repeat=2):
+        expected = _reference_distance(a, b)
+        for bound in (0, 1, 2):
+            assert edit_distance(a, b, bound) == min(expected, bound + 1), (a, b)
+
+
+def test_lookup_ranks_typos_by_distance():
+    """Single edits of every kind are found, closest and shortest first."""
+    index = FuzzyNameIndex(
+        (name, name) for name in ("Parser", "Parsers", "Printer", "Partial", "Token")
+    )
+    assert len(index) == 5
+
+    for typo in ("Parsr", "Pasrer", "Parxer", "Parsere"):
+        distance, name, payloads = index.lookup(typo)[0]
+        assert (distance, name, payloads) == (1, "parser", ["Parser"])
+    assert [name for _, name, _ in index.lookup("parser", limit=2)] == [
+        "parser",
+        "parsers",
+    ]
+    assert not index.lookup("Tkn", max_distance=1)
+    assert index.lookup("Tken", max_distance=1)[0][1] == "token"
+
+
+def test_engine_suggests_compounds_and_members(tmp_path, load_engine):
+    """Suggestions cover qualified names, unscoped names and members."""
+    engine = load_engine(tmp_path, {"index.xml": INDEX_XML})
+
+    assert engine.query_symbol("Widgte") is None
+    suggestions = engine.suggest_symbols("Widgte")
+    assert suggestions[0] == {"name": "ui::Widget", "kind": "class", "distance": 1}
+
+    assert engine.suggest_symbols("rendr") == [
+        {"name": "render", "kind": "function", "scope": "ui::Widget", "distance": 1}
+    ]
+    assert engine.suggest_symbols("zzzzzz") == []
+
+
+def test_index_load_builds_fuzzy_index_in_background(tmp_path, load_engine):
+    """The first lookup miss finds the index already built at load."""
+    engine = load_engine(tmp_path, {"index.xml": INDEX_XML})
+    for thread in threading.enumerate():
+        if thread.name == "doxygen-fuzzy-index":
+            thread.join(timeout=10)
+
+    assert engine._fuzzy_index is not None  # pylint: disable=protected-access
+    with patch("doxygen_mcp.query_engine.FuzzyNameIndex", side_effect=AssertionError):
+        assert engine.suggest_symbols("Widgte")[0]["name"] == "ui::Widget"
+
+
+@pytest.mark.asyncio
+@patch("doxygen_mcp.server.resolve_project_path")
+@patch("doxygen_mcp.server._find_xml_dir")
+async def test_doxy_query_miss_lists_candidates(mock_xml_dir, mock_resolve, tmp_path):
+    """doxy_query misses name the closest symbols instead of a bare not-found."""
+    (tmp_path / "index.xml").write_text(INDEX_XML, encoding="utf-8")
+    mock_resolve.return_value = Path(tmp_path)
+    mock_xml_dir.return_value = str(tmp_path)
+    DoxygenQueryEngine.clear_cache()
+
+    res = await doxy_query("Windw")
+
+    assert "not found in index" in res
+    assert "Did you mean: ui::Window (class)" in res
+    DoxygenQueryEngine.clear_cache()
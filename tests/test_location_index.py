@@ -0,0 +1,133 @@
+"""
+Unit tests for source-location lookups.
+"""
+
+from unittest.mock import patch
+
+from doxygen_mcp.location_index import (
+    FileIntervalIndex,
+    LocationIndex,
+    normalize_source_path,
+)
+from doxygen_mcp.query_engine import DoxygenQueryEngine
+
+
+def _index():
+    index = LocationIndex()
+    index.add("src/app/main.c", 20, "main_run")
+    index.add("src/app/main.c", 5, "main_init")
+    index.add("./src/app/main.c", 40, "main_exit")
+    index.add("lib/util.c", 3, "util_helper")
+    return index.freeze()
+
+
+def test_normalize_source_path():
+    """Separators and redundant components are normalized."""
+    assert normalize_source_path("src\\\\app\\\\..\\\\main.c") == "src/main.c"
+    assert normalize_source_path("./a/b.c") == "a/b.c"
+
+
+def test_exact_and_preceding_lookups():
+    """Exact lines resolve directly; other lines find the previous member."""
+    index = _index()
+    assert index.at("src/app/main.c", 20) == "main_run"
+    assert index.at("src/app/main.c", 21) is None
+    assert index.preceding("src/app/main.c", 39) == (20, "main_run")
+    assert index.preceding("src/app/main.c", 4) is None
+
+
+def test_resolves_absolute_and_relative_paths():
+    """Absolute or partially qualified paths match by trailing components."""
+    index = _index()
+    assert index.at("/home/dev/repo/src/app/main.c", 5) == "main_init"
+    assert index.at("app/main.c", 40) == "main_exit"
+    assert index.at("util.c", 3) == "util_helper"
+    # A lone file with that basename is accepted, as with get_file_structure.
+    assert index.at("other/main.c", 5) == "main_init"
+
+
+def test_ambiguous_basename_is_not_guessed():
+    """With several same-named files, only a path-suffix match resolves."""
+    index = LocationIndex()
+    index.add("src/a/util.c", 1, "a_util")
+    index.add("src/b/util.c", 1, "b_util")
+    index.freeze()
+    assert index.at("b/util.c", 1) == "b_util"
+    assert index.at("util.c", 1) is None
+
+
+def test_trace_resolves_file_line_entry(tmp_path, load_engine):
+    """A synthetic file:line entry refid is resolved through the index."""
+    index_xml = """<?xml version='1.0' encoding='UTF-8' standalone='no'?>
+<doxygenindex version="1.9.1">
+  <compound refid="app_8c" kind="file"><name>app.c</name></compound>
+</doxygenindex>
+"""
+    file_xml = """<?xml version='1.0' encoding='UTF-8' standalone='no'?>
+<doxygen>
+  <compounddef id="app_8c" kind="file">
+    <compoundname>app.c</compoundname>
+    <sectiondef kind="func">
+      <memberdef kind="function" id="app_8c_1start">
+        <name>start</name>
+        <location file="app.c" line="2" bodystart="2" bodyend="4"/>
+      </memberdef>
+    </sectiondef>
+  </compounddef>
+</doxygen>
+"""
+    engine = load_engine(tmp_path, {"index.xml": index_xml, "app_8c.xml": file_xml})
+
+    assert engine.get_location_index().at("app.c", 2) == "app_8c_1start"
+    seen = []
+    engine.find_symbol_definitions = lambda _: [
+        {"name": "start", "kind": "function", "refid": "app.c:2"}
+    ]
+    engine.get_source_snippet = lambda *args: seen.append(args) or "code"
+    engine.trace_call_path("start")
+    assert seen == [("app.c", 2, 4)]
+
+
+def _symbol(name, line, bodystart=None, bodyend=None):
+    loc = {"file": "src/shapes.h", "line": str(line)}
+    if bodystart is not None:
+        loc.update(bodystart=str(bodystart), bodyend=str(bodyend))
+    return {"name": name, "location": loc}
+
+
+def test_interval_index_returns_innermost_body():
+    """Nested bodies resolve to the innermost enclosing symbol."""
+    index = FileIntervalIndex(
+        [
+            _symbol("Shape::area", 12, 12, 15),
+            _symbol("shapes", 1, 1, 100),
+            _symbol("Shape", 10, 10, 30),
+            _symbol("Shape::kSides", 20),
+            _symbol("Circle", 40, 40, 60),
+        ]
+    )
+    assert index.lookup(13)["name"] == "Shape::area"
+    assert index.lookup(20)["name"] == "Shape::kSides"
+    assert index.lookup(25)["name"] == "Shape"
+    assert index.lookup(35)["name"] == "shapes"
+    assert index.lookup(50)["name"] == "Circle"
+
+
+def test_interval_index_falls_back_to_preceding_declaration():
+    """Lines outside every body use the closest declaration above them."""
+    index = FileIntervalIndex([_symbol("a", 5, 5, 8), _symbol("b", 20)])
+    assert index.lookup(12)["name"] == "a"
+    assert index.lookup(25)["name"] == "b"
+    assert index.lookup(2) is None
+
+
+def test_engine_caches_interval_index_per_file(tmp_path):
+    """Repeated cursor lookups in one file build its structure only once."""
+    engine = DoxygenQueryEngine(str(tmp_path))
+    symbols = [_symbol("Shape", 10, 10, 30), _symbol("Shape::area", 12, 12, 15)]
+    with patch.object(engine, "get_file_structure", return_value=symbols) as spy:
+        assert engine.get_symbol_at_location("/repo/src/shapes.h", 13)["name"] == (
+            "Shape::area"
+        )
+        assert engine.get_symbol_at_location("shapes.h", 29)["name"] == "Shape"
+    assert spy.call_count == 1
@@ -0,0 +1,44 @@
+"""
+Unit tests for the compact compound model.
+"""
+
+import pytest
+
+from doxygen_mcp.model import CompoundInfo
+
+INDEX_XML = """<?xml version='1.0' encoding='UTF-8' standalone='no'?>
+<doxygenindex version="1.9.1">
+  <compound refid="class_a" kind="class"><name>A</name>
+    <member refid="class_a_1run" kind="function"><name>run</name></member>
+  </compound>
+  <compound refid="class_b" kind="class"><name>B</name>
+    <member refid="class_b_1run" kind="function"><name>run</name></member>
+  </compound>
+</doxygenindex>
+"""
+
+
+def test_compound_info_reads_like_a_dict():
+    """Existing dict-style access keeps working on the slotted record."""
+    info = CompoundInfo("ns::Widget", "class", "class_widget")
+
+    assert info["refid"] == "class_widget"
+    assert info.get("kind") == "class"
+    assert info.get("missing", "default") == "default"
+    assert "name" in info and "missing" not in info
+    assert info == {"kind": "class", "refid": "class_widget", "name": "ns::Widget"}
+    assert dict(info) == info.to_dict()
+    with pytest.raises(KeyError):
+        info["missing"]  # pylint: disable=pointless-statement
+    assert not hasattr(info, "__dict__")
+
+
+def test_engine_interns_repeated_kinds(tmp_path, load_engine):
+    """Compounds and member rows share one string object per kind."""
+    engine = load_engine(tmp_path, {"index.xml": INDEX_XML})
+
+    a, b = engine.compounds["A"], engine.compounds["B"]
+    assert isinstance(a, CompoundInfo)
+    assert a.kind is b.kind
+    rows = engine._member_index["run"]  # pylint: disable=protected-access
+    assert rows[0][2] is rows[1][2]
@@ -0,0 +1,79 @@
+"""
+Tests for sorted name listings and cursor pagination.
+"""
+
+import pytest
+
+from doxygen_mcp.model import CompoundInfo
+from doxygen_mcp.name_index import SortedNameIndex
+
+INDEX_XML = """<?xml version='1.0' encoding='UTF-8' standalone='no'?>
+<doxygenindex version="1.9.1">
+  <compound refid="ns_a" kind="namespace"><name>app</name></compound>
+  <compound refid="c3" kind="class"><name>app::Zeta</name></compound>
+  <compound refid="c1" kind="class"><name>app::Alpha</name></compound>
+  <compound refid="c2" kind="class"><name>app::detail::Impl</name></compound>
+  <compound refid="c4" kind="class"><name>apple::Pie</name></compound>
+  <compound refid="f1" kind="file"><name>main.cpp</name></compound>
+</doxygenindex>
+"""
+
+
+def _pages(index, **kwargs):
+    cursor, items = None, []
+    while True:
+        page = index.page(cursor=cursor, **kwargs)
+        items.append(page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return items
+
+
+def test_pages_cover_each_kind_in_order():
+    """Pages walk the sorted names of a kind without gaps or repeats."""
+    index = SortedNameIndex(
+        CompoundInfo(f"C{i:02d}", "class" if i % 3 else "file", f"r{i}")
+        for i in range(20)
+    )
+    classes = index.names("class")
+    assert classes == sorted(classes) and len(classes) == 13
+
+    pages = _pages(index, kind="class", page_size=5)
+    assert [len(p) for p in pages] == [5, 5, 3]
+    assert [n for p in pages for n in p] == classes
+    assert index.page(kind="class", page_size=5)["total"] == 13
+    assert index.count() == 20 and index.kinds() == ["class", "file"]
+
+
+def test_prefix_range_and_invalid_cursor():
+    """Prefix pages stay inside the prefix range; bad cursors are rejected."""
+    index = SortedNameIndex(
+        CompoundInfo(name, "class", name) for name in ("ab", "abc", "abd", "b", "a")
+    )
+    assert _pages(index, prefix="ab", page_size=2) == [["ab", "abc"], ["abd"]]
+    assert index.page(prefix="zz")["items"] == []
+    with pytest.raises(ValueError):
+        index.page(cursor="not base64!")
+
+
+def test_engine_pages_by_namespace(tmp_path, load_engine):
+    """Engine listings are sorted and filter by namespace scope and prefix."""
+    engine = load_engine(tmp_path, {"index.xml": INDEX_XML})
+
+    assert engine.list_all_symbols("class") == [
+        "app::Alpha",
+        "app::Zeta",
+        "app::detail::Impl",
+        "apple::Pie",
+    ]
+    page = engine.list_symbols_page(kind="class", namespace="app", page_size=2)
+    assert page["items"] == ["app::Alpha", "app::Zeta"]
+    assert page["total"] == 3
+    page = engine.list_symbols_page(
+        kind="class", namespace="app", cursor=page["next_cursor"], page_size=2
+    )
+    assert page["items"] == ["app::detail::Impl"] and page["next_cursor"] is None
+
+    page = engine.list_symbols_page(namespace="app", prefix="Z")
+    assert page["items"] == ["app::Zeta"] and page["kind"] == "all"
+    assert engine.count_symbols("file") == 1
@@ -0,0 +1,56 @@
+"""
+Unit tests for the trigram partial-match index.
+"""
+
+from doxygen_mcp.partial_index import PartialMatchIndex
+
+
+def _build(*names):
+    index = PartialMatchIndex()
+    for name in names:
+        index.add(name)
+    return index
+
+
+def test_search_finds_substrings():
+    """Every indexed name containing the query is returned."""
+    index = _build("std::detail::vector_impl", "std::vector", "mylist")
+    assert set(index.search("vector")) == {"std::detail::vector_impl", "std::vector"}
+    assert index.search("missing") == []
+
+
+def test_search_ranks_closest_match_first():
+    """Boundary matches beat mid-word matches, then shorter names win."""
+    index = _build("testnamespace", "ns::namespace_helpers", "ns::namespace")
+    assert index.search("namespace") == [
+        "ns::namespace",
+        "ns::namespace_helpers",
+        "testnamespace",
+    ]
+
+
+def test_search_ranks_last_component_and_demoted_names():
+    """Exact last scope components win; demoted names lose otherwise close ties."""
+    index = _build("widget.h", "widget.cpp", "ns::widget", "widgetfactory")
+    assert index.search("widget")[0] == "ns::widget"
+    assert index.search("widget", demote=lambda n: "." in n) == [
+        "ns::widget",
+        "widgetfactory",
+        "widget.h",
+        "widget.cpp",
+    ]
+
+
+def test_search_short_queries_and_limit():
+    """Queries shorter than a trigram still match, and limit is honoured."""
+    index = _build("ab", "xab", "abc", "zzz")
+    assert index.search("ab") == ["ab", "abc", "xab"]
+    assert index.search("ab", limit=1) == ["ab"]
+    assert not index.search("")
+    assert len(index) == 4
+
+
+def test_search_requires_all_trigrams():
+    """A candidate sharing only some trigrams is filtered out."""
+    index = _build("calculator", "calendar")
+    assert index.search("calc") == ["calculator"]
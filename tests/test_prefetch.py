@@ -0,0 +1,147 @@
+"""
+Tests for the background compound prefetcher.
+"""
+
+import os
+import time
+
+import pytest
+
+from doxygen_mcp.cache import COMPOUND_CACHE
+from doxygen_mcp.prefetch import Prefetcher
+from doxygen_mcp.query_engine import DoxygenQueryEngine
+
+INDEX_XML = """<?xml version='1.0' encoding='UTF-8' standalone='no'?>
+<doxygenindex version="1.9.1">
+  <compound refid="class_small" kind="class"><name>Small</name>
+    <member refid="class_small_1a" kind="function"><name>a</name></member>
+  </compound>
+  <compound refid="class_big" kind="class"><name>Big</name>
+    <member refid="class_big_1a" kind="function"><name>a</name></member>
+    <member refid="class_big_1b" kind="function"><name>b</name></member>
+  </compound>
+  <compound refid="old_8h" kind="file"><name>old.h</name></compound>
+  <compound refid="new_8h" kind="file"><name>new.h</name></compound>
+</doxygenindex>
+"""
+
+COMPOUND_XML = """<?xml version='1.0' encoding='UTF-8' standalone='no'?>
+<doxygen>
+  <compounddef id="{refid}" kind="{kind}">
+    <compoundname>{name}</compoundname>
+    {inner}
+  </compounddef>
+</doxygen>
+"""
+
+
+@pytest.fixture(autouse=True)
+def _reset_state():
+    DoxygenQueryEngine.clear_cache()
+    COMPOUND_CACHE.clear()
+    yield
+    DoxygenQueryEngine.clear_cache()
+    COMPOUND_CACHE.clear()
+
+
+@pytest.fixture
+def engine(tmp_path, load_engine):
+    """A cold engine over classes and headers of differing age and fan-in."""
+    (tmp_path / ".git").mkdir()
+    compounds = [
+        ("class_small", "class", "Small", ""),
+        ("class_big", "class", "Big", ""),
+        ("class_inner", "class", "Inner", ""),
+        ("old_8h", "file", "old.h", ""),
+        (
+            "new_8h",
+            "file",
+            "new.h",
+            '<innerclass refid="class_inner">Inner</innerclass>',
+        ),
+    ]
+    files = {
+        f"{refid}.xml": COMPOUND_XML.format(
+            refid=refid, kind=kind, name=name, inner=inner
+        )
+        for refid, kind, name, inner in compounds
+    }
+    files["index.xml"] = INDEX_XML
+    for name, age in (("old.h", 1000), ("new.h", 0)):
+        path = tmp_path / name
+        path.write_text("// header\n", encoding="utf-8")
+        stamp = time.time() - age
+        os.utime(path, (stamp, stamp))
+
+    query_engine = load_engine(tmp_path / "xml", files)
+    query_engine.search_index.repo_root = tmp_path
+    # Building the search index cached every record; start cold.
+    COMPOUND_CACHE.clear()
+    return query_engine
+
+
+def _record_order(query_engine, prefetcher):
+    """Run a prefetcher to completion, returning refids in parse order."""
+    order = []
+    load = query_engine._load_compound_record  # pylint: disable=protected-access
+
+    def spy(refid):
+        order.append(refid)
+        return load(refid)
+
+    query_engine._load_compound_record = spy
+    prefetcher.start().join(timeout=10)
+    return order
+
+
+def test_prefetch_order_and_cache_fill(engine):  # pylint: disable=redefined-outer-name
+    """Recent files go first, their inner classes next, then by fan-in."""
+    prefetcher = Prefetcher(engine, idle_seconds=0)
+
+    order = _record_order(engine, prefetcher)
+
+    assert order == ["new_8h", "class_inner", "old_8h", "class_big", "class_small"]
+    assert prefetcher.stats()["state"] == "done"
+    assert prefetcher.prefetched == 5
+    ns = engine._cache_namespace  # pylint: disable=protected-access
+    assert all(COMPOUND_CACHE.contains(ns, ("record", refid)) for refid in order)
+
+
+def test_prefetch_skips_cached_and_yields_to_foreground(
+    engine,
+):  # pylint: disable=redefined-outer-name
+    """Already-cached records are skipped; recent foreground use pauses work."""
+    engine.get_compound_record("class_big")
+
+    prefetcher = Prefetcher(engine, idle_seconds=0.3)
+    started = time.monotonic()
+    order = _record_order(engine, prefetcher)
+
+    assert time.monotonic() - started >= 0.25
+    assert "class_big" not in order
+    assert prefetcher.skipped == 1
+
+
+def test_prefetch_stops_when_cache_is_nearly_full(
+    engine,
+):  # pylint: disable=redefined-outer-name
+    """The prefetcher never fills the shared cache past its ratio."""
+    prefetcher = Prefetcher(engine, idle_seconds=0, fill_ratio=0.0)
+
+    assert _record_order(engine, prefetcher) == []
+    assert prefetcher.state == "cache_full"
+
+
+async def test_create_starts_prefetch_when_enabled(
+    engine, monkeypatch
+):  # pylint: disable=redefined-outer-name
+    """DOXYGEN_PREFETCH starts the prefetcher after the engine is registered."""
+    monkeypatch.setenv("DOXYGEN_PREFETCH", "1")
+
+    created = await DoxygenQueryEngine.create(str(engine.xml_dir))
+    prefetcher = created._prefetcher  # pylint: disable=protected-access
+    assert prefetcher is not None
+
+    DoxygenQueryEngine.clear_cache()
+    prefetcher.join(timeout=10)
+    assert prefetcher.state in ("done", "stopped")
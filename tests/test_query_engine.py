@@ -406,3 +406,40 @@ def test_fetch_compound_connections_no_compounddef(
 def test_normalize_symbol_name(input_name, expected_name):
     """Test that normalize_symbol_name correctly handles whitespace, case, and namespace operators."""
     assert normalize_symbol_name(input_name) == expected_name
+
+
+def test_find_partial_matches_ranked(engine):  # pylint: disable=redefined-outer-name
+    """Partial matches are returned as ranked compound candidates."""
+    matches = engine.find_partial_matches("test")
+    assert [m["name"] for m in matches] == ["TestClass", "TestNamespace", "test_file.h"]
+    assert engine.find_partial_matches("file.h")[0]["refid"] == "test_file_8h"
+
+
+def test_query_symbol_prefers_class_over_same_named_file(
+    xml_dir, load_engine
+):  # pylint: disable=redefined-outer-name
+    """A bare class name resolves to the class, not a file named after it."""
+    index_xml = """<?xml version='1.0' encoding='UTF-8' standalone='no'?>
+<doxygenindex version="1.9.1">
+  <compound refid="widget_8cpp" kind="file"><name>widget.cpp</name></compound>
+  <compound refid="widget_8h" kind="file"><name>widget.h</name></compound>
+  <compound refid="classns_1_1_widget" kind="class"><name>ns::Widget</name></compound>
+</doxygenindex>
+"""
+    class_xml = """<?xml version='1.0' encoding='UTF-8' standalone='no'?>
+<doxygen>
+  <compounddef id="classns_1_1_widget" kind="class">
+    <compoundname>ns::Widget</compoundname>
+  </compounddef>
+</doxygen>
+"""
+    query_engine = load_engine(
+        xml_dir, {"index.xml": index_xml, "classns_1_1_widget.xml": class_xml}
+    )
+
+    assert query_engine.query_symbol("Widget")["name"] == "ns::Widget"
+    assert [m["name"] for m in query_engine.find_partial_matches("widget")] == [
+        "ns::Widget",
+        "widget.h",
+        "widget.cpp",
+    ]
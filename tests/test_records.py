@@ -0,0 +1,104 @@
+"""
+Unit tests for the shared compound record.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from doxygen_mcp.auditor import check_doxygen_parity
+from doxygen_mcp.cache import COMPOUND_CACHE
+from doxygen_mcp.records import parse_compound_record
+
+INDEX_XML = """<?xml version='1.0' encoding='UTF-8' standalone='no'?>
+<doxygenindex version="1.9.1">
+  <compound refid="class_widget" kind="class"><name>Widget</name></compound>
+</doxygenindex>
+"""
+
+CLASS_XML = """<?xml version='1.0' encoding='UTF-8' standalone='no'?>
+<doxygen version="1.9.1">
+  <compounddef id="class_widget" kind="class">
+    <compoundname>Widget</compoundname>
+    <basecompoundref refid="class_base">Base</basecompoundref>
+    <innerclass refid="class_widget_1_1_part">Widget::Part</innerclass>
+    <briefdescription><para>A widget.</para></briefdescription>
+    <detaileddescription><para>Draws things.</para></detaileddescription>
+    <location file="src/widget.h" line="3"/>
+    <sectiondef kind="public-func">
+      <memberdef kind="function" id="class_widget_1draw">
+        <type>void</type>
+        <name>draw</name>
+        <argsstring>(int width)</argsstring>
+        <param><type>int</type><declname>width</declname></param>
+        <detaileddescription><para><parameterlist kind="param">
+          <parameteritem><parameternamelist>
+            <parametername>height</parametername>
+          </parameternamelist></parameteritem>
+        </parameterlist></para></detaileddescription>
+        <location file="src/widget.h" line="7"/>
+        <references refid="class_canvas_1paint">paint</references>
+        <referencedby refid="main_8c_1main" startline="12">main</referencedby>
+      </memberdef>
+    </sectiondef>
+  </compounddef>
+</doxygen>
+"""
+
+
+@pytest.fixture
+def xml_dir(tmp_path):
+    """XML directory with one class compound."""
+    (tmp_path / "index.xml").write_text(INDEX_XML, encoding="utf-8")
+    (tmp_path / "class_widget.xml").write_text(CLASS_XML, encoding="utf-8")
+    COMPOUND_CACHE.clear()
+    yield tmp_path
+    COMPOUND_CACHE.clear()
+
+
+def test_parse_compound_record(xml_dir):  # pylint: disable=redefined-outer-name
+    """A record carries compound, inheritance, member and parameter data."""
+    record = parse_compound_record(xml_dir / "class_widget.xml")
+    assert record["name"] == "Widget"
+    assert record["location"]["file"] == "src/widget.h"
+    assert record["base_classes"] == ["Base"]
+    assert record["inner_classes"] == ["class_widget_1_1_part"]
+
+    member = record["members"][0]
+    assert member["args"] == "(int width)"
+    assert member["params"] == ["width"]
+    assert member["documented_params"] == ["height"]
+    assert member["references"][0]["refid"] == "class_canvas_1paint"
+    assert member["referencedby"][0]["startline"] == "12"
+
+
+def test_parse_compound_record_without_compounddef(tmp_path):
+    """Files without a compounddef produce no record."""
+    xml_file = tmp_path / "empty.xml"
+    xml_file.write_text("<doxygen></doxygen>", encoding="utf-8")
+    assert parse_compound_record(xml_file) is None
+
+
+def test_consumers_share_a_single_parse(
+    xml_dir, load_engine
+):  # pylint: disable=redefined-outer-name
+    """Search build, details, connections and parity parse each file once."""
+    with patch(
+        "doxygen_mcp.query_engine.parse_compound_record",
+        wraps=parse_compound_record,
+    ) as spy:
+        engine = load_engine(xml_dir)
+
+        details = engine.query_symbol("Widget")
+        connections = engine.get_symbol_connections("Widget")
+        mismatches = check_doxygen_parity(engine)
+
+    assert spy.call_count == 1
+    assert details["members"][0]["name"] == "draw"
+    assert "params" not in details["members"][0]
+    assert connections["members"][0]["references"] == ["paint"]
+    assert {m["kind"] for m in mismatches} == {
+        "parameter_redundant",
+        "parameter_missing",
+    }
+    assert engine.semantic_search("Draws")[0]["filepath"] == "src/widget.h"
@@ -0,0 +1,210 @@
+"""
+Tests for the generation-aware engine registry.
+"""
+
+import asyncio
+import os
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from doxygen_mcp.query_engine import DoxygenQueryEngine
+from doxygen_mcp.registry import EngineRegistry
+
+INDEX_XML = """<?xml version='1.0' encoding='UTF-8' standalone='no'?>
+<doxygenindex version="1.9.1">
+  <compound refid="class_{name}" kind="class"><name>{name}</name></compound>
+</doxygenindex>
+"""
+
+
+@pytest.fixture(autouse=True)
+def _reset_engines():
+    DoxygenQueryEngine.clear_cache()
+    yield
+    DoxygenQueryEngine.clear_cache()
+
+
+def _xml_dir(tmp_path, name="Widget"):
+    xml_dir = tmp_path / name
+    xml_dir.mkdir()
+    (xml_dir / "index.xml").write_text(INDEX_XML.format(name=name), encoding="utf-8")
+    return xml_dir
+
+
+async def test_create_reloads_when_index_changes(tmp_path):
+    """A regenerated index.xml yields a fresh engine with the next generation."""
+    xml_dir = _xml_dir(tmp_path)
+    first = await DoxygenQueryEngine.create(str(xml_dir))
+    assert await DoxygenQueryEngine.create(str(xml_dir)) is first
+    assert first.generation >= 1
+
+    index = xml_dir / "index.xml"
+    index.write_text(INDEX_XML.format(name="Gadget"), encoding="utf-8")
+    st = index.stat()
+    os.utime(index, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    second = await DoxygenQueryEngine.create(str(xml_dir))
+    assert second is not first
+    assert second.generation == first.generation + 1
+    assert "Gadget" in second.compounds
+
+
+def test_evicts_least_recently_used_over_memory_cap(tmp_path, load_engine):
+    """Older engines are unloaded once the estimated total exceeds the cap."""
+    engines = {}
+    for name in ("A", "B", "C"):
+        engines[name] = load_engine(_xml_dir(tmp_path, name))
+    size = engines["A"].estimated_memory()
+    assert size > 0
+
+    registry = EngineRegistry(memory_cap_bytes=int(size * 2.5))
+    registry["/a"] = engines["A"]
+    registry["/b"] = engines["B"]
+    assert registry.lookup("/a") is engines["A"]  # now most recently used
+    registry["/c"] = engines["C"]
+
+    assert sorted(registry) == ["/a", "/c"]
+    assert registry.stats()["evictions"] == 1
+
+
+def test_lazy_indices_count_towards_memory_cap(tmp_path, load_engine):
+    """Indices built after registration are re-estimated and can evict."""
+    engines = {}
+    for name in ("A", "B"):
+        engines[name] = load_engine(_xml_dir(tmp_path, name))
+        engines[name].get_fuzzy_index()  # wait for the build started at load
+    registry = EngineRegistry(
+        memory_cap_bytes=engines["A"].estimated_memory() * 2 + 512
+    )
+    registry["/a"] = engines["A"]
+    registry["/b"] = engines["B"]
+    registered = registry.stats()["engines"]["/a"]["estimated_bytes"]
+
+    engines["A"].list_all_symbols()
+    engines["A"].get_call_graph()
+    assert registry.stats()["engines"]["/a"]["estimated_bytes"] > registered + 512
+    assert registry.lookup("/b") is engines["B"]
+    assert sorted(registry) == ["/b"]
+    assert registry.stats()["evictions"] == 1
+
+
+def test_mapping_access_and_generations(tmp_path):
+    """Plain dict-style access keeps working alongside generations."""
+    engine = DoxygenQueryEngine(str(_xml_dir(tmp_path)))
+    registry = EngineRegistry(memory_cap_bytes=0)
+
+    registry["/w"] = engine
+    assert "/w" in registry and registry.get("/w") is engine
+    registry["/w"] = engine
+    assert registry.generation("/w") == 2
+    assert registry.pop("/w") is engine
+    assert registry.lookup("/w") is None
+    assert registry.generation("/w") == 2
+
+
+def test_replaced_engine_is_retired(tmp_path):
+    """Registering a new engine closes the old one's search connections."""
+    xml_dir = _xml_dir(tmp_path)
+    old, new = DoxygenQueryEngine(str(xml_dir)), DoxygenQueryEngine(str(xml_dir))
+    registry = EngineRegistry(memory_cap_bytes=0)
+    registry["/w"] = old
+
+    with patch.object(old.search_index, "close") as close:
+        registry["/w"] = new
+    close.assert_called_once()
+
+
+async def test_concurrent_create_loads_once(tmp_path):
+    """Concurrent callers share one in-progress load of the same directory."""
+    xml_dir = _xml_dir(tmp_path)
+    loads = []
+    original = DoxygenQueryEngine._load_index  # pylint: disable=protected-access
+
+    def counting_load(self):
+        loads.append(self)
+        original(self)
+
+    with patch.object(DoxygenQueryEngine, "_load_index", counting_load):
+        engines = await asyncio.gather(
+            *(DoxygenQueryEngine.create(str(xml_dir)) for _ in range(5))
+        )
+
+    assert len(loads) == 1
+    assert all(engine is engines[0] for engine in engines)
+
+
+async def test_failed_create_is_not_cached(tmp_path):
+    """A failed load propagates to every waiter and the next call retries."""
+    xml_dir = _xml_dir(tmp_path)
+    with patch.object(
+        DoxygenQueryEngine, "_load_index", side_effect=RuntimeError("boom")
+    ):
+        with pytest.raises(RuntimeError):
+            await DoxygenQueryEngine.create(str(xml_dir))
+
+    engine = await DoxygenQueryEngine.create(str(xml_dir))
+    assert "Widget" in engine.compounds
+
+
+async def test_reload_serves_old_generation_until_swap(tmp_path):
+    """create() keeps returning the old engine while a reload is loading."""
+    xml_dir = _xml_dir(tmp_path)
+    old = await DoxygenQueryEngine.create(str(xml_dir))
+    (xml_dir / "index.xml").write_text(INDEX_XML.format(name="Gizmo"), "utf-8")
+
+    release = threading.Event()
+    original = DoxygenQueryEngine._load_index  # pylint: disable=protected-access
+
+    def blocked_load(self):
+        release.wait(timeout=10)
+        original(self)
+
+    with patch.object(DoxygenQueryEngine, "_load_index", blocked_load):
+        reload_task = asyncio.ensure_future(DoxygenQueryEngine.reload(str(xml_dir)))
+        await asyncio.sleep(0.05)
+        assert await DoxygenQueryEngine.create(str(xml_dir)) is old
+        release.set()
+        new = await reload_task
+
+    assert new is not old
+    assert new.generation == old.generation + 1
+    assert "Gizmo" in new.compounds
+    assert await DoxygenQueryEngine.create(str(xml_dir)) is new
+
+
+async def test_reserved_reload_covers_xml_rewrite(tmp_path):
+    """Between reserve_reload() and reload(), create() never starts a cold load."""
+    xml_dir = _xml_dir(tmp_path)
+    old = await DoxygenQueryEngine.create(str(xml_dir))
+    loads = []
+    original = DoxygenQueryEngine._load_index  # pylint: disable=protected-access
+
+    def counting_load(self):
+        loads.append(self)
+        original(self)
+
+    with patch.object(DoxygenQueryEngine, "_load_index", counting_load):
+        reserved = await DoxygenQueryEngine.reserve_reload(str(xml_dir))
+        index = xml_dir / "index.xml"
+        index.write_text(INDEX_XML.format(name="Gizmo"), encoding="utf-8")
+        st = index.stat()
+        os.utime(index, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        assert await DoxygenQueryEngine.create(str(xml_dir)) is old
+        new = await DoxygenQueryEngine.reload(str(xml_dir), reserved)
+
+    assert len(loads) == 1
+    assert "Gizmo" in new.compounds
+    assert await DoxygenQueryEngine.create(str(xml_dir)) is new
+
+
+def test_retired_engine_stops_writing_to_cache(tmp_path):
+    """Requests finishing on a retired engine leave nothing in the shared cache."""
+    engine = DoxygenQueryEngine(str(_xml_dir(tmp_path)))
+    engine._store_record("class_Widget", {"members": []})  # pylint: disable=W0212
+    engine.retire()
+    assert engine.release_cached_compounds() == 0
+
+    engine._store_record("class_Widget", {"members": []})  # pylint: disable=W0212
+    assert engine.release_cached_compounds() == 0
@@ -0,0 +1,83 @@
+"""
+Unit tests for the repository file index.
+"""
+
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from doxygen_mcp.query_engine import DoxygenQueryEngine
+from doxygen_mcp.repo_files import RepoFileIndex
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """A small tree with two files sharing a basename."""
+    for rel in ("src/app/util.c", "lib/util.c", "src/main.c", "build/gen.c"):
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("// " + rel, encoding="utf-8")
+    return tmp_path
+
+
+def test_walk_fallback_prunes_build_dirs(repo):  # pylint: disable=redefined-outer-name
+    """Without git the tree is walked, skipping build output."""
+    index = RepoFileIndex.scan(repo)
+    assert index.file_count == 3
+    assert index.find("gen.c") is None
+
+
+def test_find_prefers_path_suffix_match(repo):  # pylint: disable=redefined-outer-name
+    """Trailing path components disambiguate files sharing a basename."""
+    index = RepoFileIndex.scan(repo)
+    assert index.find("app/util.c") == repo / "src/app/util.c"
+    assert index.find("/elsewhere/checkout/lib/util.c") == repo / "lib/util.c"
+    # Basename only: unique matches resolve, ambiguous ones are not guessed.
+    assert index.find("other/main.c") == repo / "src/main.c"
+    assert index.find("util.c") is None
+    assert index.find("other/util.c") is None
+    assert index.find("missing.c") is None
+
+
+def test_find_skips_files_deleted_since_scan(
+    repo,
+):  # pylint: disable=redefined-outer-name
+    """Indexed paths that no longer exist are never returned."""
+    index = RepoFileIndex.scan(repo)
+    (repo / "src/app/util.c").unlink()
+    assert index.find("util.c") == repo / "lib/util.c"
+    (repo / "src/main.c").unlink()
+    assert index.find("main.c") is None
+
+
+def test_scan_uses_git_when_available(repo):  # pylint: disable=redefined-outer-name
+    """Inside a git checkout, git ls-files decides which files exist."""
+    try:
+        subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        pytest.skip("git is not available")
+    (repo / ".gitignore").write_text("lib/\n", encoding="utf-8")
+
+    index = RepoFileIndex.scan(repo)
+    assert index.find("lib/util.c") == repo / "src/app/util.c"
+    assert index.find("gen.c") == repo / "build/gen.c"
+
+
+def test_engine_resolves_without_rglob(repo):  # pylint: disable=redefined-outer-name
+    """Unresolvable locations are looked up in the index, built only once."""
+    xml_dir = repo / "docs" / "xml"
+    xml_dir.mkdir(parents=True)
+    engine = DoxygenQueryEngine(str(xml_dir))
+    engine.search_index.repo_root = repo
+
+    with patch.object(Path, "rglob", side_effect=AssertionError("rglob")):
+        with patch(
+            "doxygen_mcp.query_engine.RepoFileIndex.scan", wraps=RepoFileIndex.scan
+        ) as scan:
+            assert engine.get_source_snippet("/old/root/src/main.c", 1, 1) == (
+                "// src/main.c"
+            )
+            assert engine.get_source_snippet("app/util.c", 1, 1) == "// src/app/util.c"
+    assert scan.call_count == 1
@@ -1,5 +1,6 @@
 import os
 import shutil
+import sqlite3
 import xml.etree.ElementTree as ET
 from pathlib import Path
 
@@ -44,3 +45,344 @@ def test_search_index_batching(tmp_path):
     cursor.execute("SELECT COUNT(*) FROM symbols WHERE kind='class'")
     count = cursor.fetchone()[0]
     assert count == 10
+
+
+def test_concurrent_initialize_rebuilds_once(tmp_path, monkeypatch):
+    """Racing initializers serialize on the lock file and rebuild only once."""
+    import threading
+    import time
+
+    (tmp_path / "index.xml").write_text("<doxygenindex/>", encoding="utf-8")
+    builds = []
+    original = DoxygenSearchIndex._build_index
+
+    def slow_build(self):
+        builds.append(self)
+        time.sleep(0.1)
+        original(self)
+
+    monkeypatch.setattr(DoxygenSearchIndex, "_build_index", slow_build)
+    indexes = [DoxygenSearchIndex(str(tmp_path)) for _ in range(3)]
+    threads = [threading.Thread(target=idx.initialize) for idx in indexes]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(builds) == 1
+    assert (tmp_path / "search_index.db").exists()
+
+
+def _write_compound(xml_dir, refid, brief):
+    (xml_dir / f"{refid}.xml").write_text(
+        f'<doxygen><compounddef id="{refid}" kind="class">'
+        f"<compoundname>{refid}</compoundname>"
+        f"<briefdescription><para>{brief}</para></briefdescription>"
+        f"</compounddef></doxygen>",
+        encoding="utf-8",
+    )
+
+
+def _write_index(xml_dir, refids):
+    compounds = "".join(
+        f'<compound refid="{r}" kind="class"><name>{r}</name></compound>'
+        for r in refids
+    )
+    (xml_dir / "index.xml").write_text(
+        f"<doxygenindex>{compounds}</doxygenindex>", encoding="utf-8"
+    )
+
+
+def test_update_only_touches_changed_sources(tmp_path, monkeypatch):
+    """A sync re-parses changed compounds only and drops removed ones."""
+    (tmp_path / ".git").mkdir()
+    (tmp_path / "notes.md").write_text("design notes", encoding="utf-8")
+    refids = [f"c{i}" for i in range(5)]
+    for refid in refids:
+        _write_compound(tmp_path, refid, f"original {refid}")
+    _write_index(tmp_path, refids)
+    idx = DoxygenSearchIndex(str(tmp_path))
+    idx._build_index()
+    assert {r["name"] for r in idx.search("original")} >= {"c0", "c4"}
+
+    parsed = []
+    original = DoxygenSearchIndex._load_record
+
+    def counting_load(self, refid, path):
+        parsed.append(refid)
+        return original(self, refid, path)
+
+    monkeypatch.setattr(DoxygenSearchIndex, "_load_record", counting_load)
+    _write_compound(tmp_path, "c2", "rewritten gadget")
+    c3 = tmp_path / "c3.xml"
+    st = c3.stat()
+    os.utime(c3, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))  # touch only
+    _write_index(tmp_path, [r for r in refids if r != "c4"])
+
+    stats = idx._update_index()
+
+    assert parsed == ["c2"]
+    assert stats == {"added": 0, "updated": 1, "removed": 1, "unchanged": 4}
+    assert [r["name"] for r in idx.search("gadget")] == ["c2"]
+    assert {r["name"] for r in idx.search("original")} == {"c0", "c1", "c3"}
+    assert idx._update_index()["unchanged"] == 5
+
+
+def test_outdated_schema_is_rebuilt(tmp_path):
+    """A database without the bookkeeping tables is replaced on sync."""
+    _write_compound(tmp_path, "c0", "hello")
+    _write_index(tmp_path, ["c0"])
+    conn = sqlite3.connect(tmp_path / "search_index.db")
+    conn.execute("CREATE VIRTUAL TABLE symbols USING fts5(name, kind)")
+    conn.commit()
+    conn.close()
+
+    idx = DoxygenSearchIndex(str(tmp_path))
+    assert idx._update_index()["added"] >= 1
+    assert idx.search("hello")[0]["refid"] == "c0"
+
+
+def test_parallel_build_matches_serial(tmp_path):
+    """Parsing in worker processes yields the same index as parsing in-process."""
+    refids = [f"c{i}" for i in range(150)]
+    contents = {}
+    for workers in (1, 2):
+        xml_dir = tmp_path / f"w{workers}"
+        xml_dir.mkdir()
+        for refid in refids:
+            _write_compound(xml_dir, refid, f"brief {refid}")
+        _write_index(xml_dir, refids)
+        idx = DoxygenSearchIndex(str(xml_dir), workers=workers)
+        idx.repo_root = xml_dir
+        assert idx._update_index()["added"] == len(refids)
+        conn = idx.get_connection()
+        contents[workers] = sorted(
+            conn.execute("SELECT name, refid, brief FROM symbols").fetchall()
+        )
+        conn.close()
+
+    assert len(contents[1]) == len(refids)
+    assert contents[1] == contents[2]
+
+
+MEMBER_XML = """<doxygen><compounddef id="{refid}" kind="{kind}">
+  <compoundname>{name}</compoundname>
+  <briefdescription><para>{brief}</para></briefdescription>
+  <sectiondef kind="func">{members}</sectiondef>
+  <location file="src/widget.h" line="1"/>
+</compounddef></doxygen>"""
+
+MEMBERDEF = """<memberdef kind="{kind}" id="{refid}">
+  <type>{type}</type><name>{name}</name><argsstring>{args}</argsstring>
+  <briefdescription><para>{brief}</para></briefdescription>
+  <location file="src/widget.h" line="7"/>
+</memberdef>"""
+
+
+def test_members_are_indexed_and_ranked_by_field(tmp_path):
+    """Members get their own rows, name hits outrank body hits, kinds filter."""
+    render = MEMBERDEF.format(
+        kind="function",
+        refid="class_widget_1render",
+        type="void",
+        name="render",
+        args="(int frame) const",
+        brief="Draws the widget.",
+    )
+    count = MEMBERDEF.format(
+        kind="variable",
+        refid="class_widget_1count",
+        type="int",
+        name="count",
+        args="",
+        brief="How often render was called.",
+    )
+    (tmp_path / "class_widget.xml").write_text(
+        MEMBER_XML.format(
+            refid="class_widget",
+            kind="class",
+            name="ui::Widget",
+            brief="A drawable widget.",
+            members=render + count,
+        ),
+        encoding="utf-8",
+    )
+    # The file compound repeats the class member; it must not be indexed twice
+    (tmp_path / "widget_8h.xml").write_text(
+        MEMBER_XML.format(
+            refid="widget_8h",
+            kind="file",
+            name="widget.h",
+            brief="",
+            members=render,
+        ),
+        encoding="utf-8",
+    )
+    (tmp_path / "index.xml").write_text(
+        '<doxygenindex><compound refid="class_widget" kind="class">'
+        "<name>ui::Widget</name></compound>"
+        '<compound refid="widget_8h" kind="file"><name>widget.h</name>'
+        "</compound></doxygenindex>",
+        encoding="utf-8",
+    )
+    idx = DoxygenSearchIndex(str(tmp_path))
+    idx.repo_root = tmp_path
+    idx._build_index()
+
+    results = idx.search("render")
+    assert [r["refid"] for r in results] == [
+        "class_widget_1render",
+        "class_widget_1count",
+    ]
+    assert results[0]["parent"] == "ui::Widget"
+    assert results[0]["signature"] == "void render(int frame) const"
+
+    assert [r["name"] for r in idx.search("widget", kinds=["class"])] == ["ui::Widget"]
+    assert [r["kind"] for r in idx.search("render OR widget", kinds=["variable"])] == [
+        "variable"
+    ]
+
+    # Replacing a compound also replaces its member rows
+    (tmp_path / "class_widget.xml").write_text(
+        MEMBER_XML.format(
+            refid="class_widget",
+            kind="class",
+            name="ui::Widget",
+            brief="A drawable widget.",
+            members=count,
+        ),
+        encoding="utf-8",
+    )
+    idx._update_index()
+    assert [r["refid"] for r in idx.search("render")] == ["class_widget_1count"]
+
+
+def test_members_without_defining_compound_are_indexed_once(tmp_path):
+    """Members of undocumented namespaces stay findable, once, via any file."""
+    helper = MEMBERDEF.format(
+        kind="function",
+        refid="namespaceanon_1helper",
+        type="int",
+        name="helper",
+        args="()",
+        brief="Shared helper.",
+    )
+
+    def write_file(refid, name, brief):
+        (tmp_path / f"{refid}.xml").write_text(
+            MEMBER_XML.format(
+                refid=refid, kind="file", name=name, brief=brief, members=helper
+            ),
+            encoding="utf-8",
+        )
+
+    write_file("a_8h", "a.h", "")
+    write_file("b_8h", "b.h", "")
+    (tmp_path / "index.xml").write_text(
+        '<doxygenindex><compound refid="a_8h" kind="file"><name>a.h</name>'
+        '</compound><compound refid="b_8h" kind="file"><name>b.h</name>'
+        "</compound></doxygenindex>",
+        encoding="utf-8",
+    )
+    idx = DoxygenSearchIndex(str(tmp_path))
+    idx.repo_root = tmp_path
+    idx._build_index()
+    assert [r["refid"] for r in idx.search("helper")] == ["namespaceanon_1helper"]
+
+    # An incremental sync of one file must not surface the member twice
+    write_file("b_8h", "b.h", "Second header.")
+    idx._update_index()
+    assert [r["refid"] for r in idx.search("helper")] == ["namespaceanon_1helper"]
+
+    # Dropping one listing file keeps the member found through the other
+    (tmp_path / "index.xml").write_text(
+        '<doxygenindex><compound refid="b_8h" kind="file"><name>b.h</name>'
+        "</compound></doxygenindex>",
+        encoding="utf-8",
+    )
+    (tmp_path / "a_8h.xml").unlink()
+    idx._update_index()
+    results = idx.search("helper")
+    assert [r["refid"] for r in results] == ["namespaceanon_1helper"]
+    assert results[0]["parent"] == "b.h"
+
+
+def test_searches_reuse_read_only_connections_per_thread(tmp_path):
+    """Each thread keeps one read-only WAL connection until the file is replaced."""
+    import threading
+
+    _write_compound(tmp_path, "c0", "hello")
+    _write_index(tmp_path, ["c0"])
+    idx = DoxygenSearchIndex(str(tmp_path))
+    idx.repo_root = tmp_path
+    idx._build_index()
+
+    conn = idx._readers.get()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    with pytest.raises(sqlite3.OperationalError):
+        conn.execute("DELETE FROM entries")
+    assert idx._readers.get() is conn
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(idx._readers.get()))
+    thread.start()
+    thread.join()
+    assert other[0] is not conn
+
+    _write_compound(tmp_path, "c0", "goodbye")
+    idx._build_index()
+    assert idx.search("goodbye")[0]["refid"] == "c0"
+    assert idx._readers.get() is not conn
+
+    # Closing the pool does not leave threads holding closed connections
+    idx.close()
+    assert idx.search("goodbye")[0]["refid"] == "c0"
+    assert idx.manifest() is not None
+    idx.close()
+
+
+def test_build_swaps_in_a_verified_shadow_with_manifest(tmp_path):
+    """Builds record a manifest; freshness follows index.xml content, not mtime."""
+    _write_compound(tmp_path, "c0", "hello")
+    _write_index(tmp_path, ["c0"])
+    idx = DoxygenSearchIndex(str(tmp_path))
+    idx.repo_root = tmp_path
+    idx._build_index()
+
+    manifest = idx.manifest()
+    assert manifest["rows"] == manifest["sources"] == 1
+    assert manifest["duration_s"] >= 0
+    assert not (tmp_path / "search_index.db.building").exists()
+    assert not idx._needs_rebuild()
+
+    index_xml = tmp_path / "index.xml"
+    st = index_xml.stat()
+    os.utime(index_xml, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert not idx._needs_rebuild()
+    _write_index(tmp_path, ["c0", "c1"])
+    assert idx._needs_rebuild()
+
+
+def test_failed_build_keeps_the_live_index(tmp_path, monkeypatch):
+    """A build that fails verification is discarded; searches keep working."""
+    _write_compound(tmp_path, "c0", "hello")
+    _write_index(tmp_path, ["c0"])
+    idx = DoxygenSearchIndex(str(tmp_path))
+    idx.repo_root = tmp_path
+    idx._build_index()
+    assert idx.search("hello")[0]["refid"] == "c0"
+
+    def corrupt(self, known, writer):
+        stats = original(self, known, writer)
+        stats["added"] += 1  # claims a source that never reached the table
+        return stats
+
+    original = DoxygenSearchIndex._sync
+    monkeypatch.setattr(DoxygenSearchIndex, "_sync", corrupt)
+    _write_compound(tmp_path, "c0", "goodbye")
+    with pytest.raises(sqlite3.DatabaseError, match="Row counts disagree"):
+        idx._build_index()
+
+    assert not (tmp_path / "search_index.db.building").exists()
+    assert idx.search("hello")[0]["refid"] == "c0"
+    assert idx.search("goodbye") == []
@@ -0,0 +1,117 @@
+"""
+Unit tests for the persistent engine index snapshot.
+"""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from doxygen_mcp.snapshot import (
+    SNAPSHOT_FILENAME,
+    index_fingerprint,
+    load_snapshot,
+    write_snapshot,
+)
+
+INDEX_XML = """<?xml version='1.0' encoding='UTF-8' standalone='no'?>
+<doxygenindex version="1.9.1">
+  <compound refid="class_widget" kind="class"><name>ui::Widget</name>
+    <member refid="class_widget_1draw" kind="function"><name>draw</name></member>
+  </compound>
+  <compound refid="widget_8h" kind="file"><name>src/widget.h</name></compound>
+</doxygenindex>
+"""
+
+
+@pytest.fixture
+def xml_dir(tmp_path):
+    """XML directory containing a small index.xml."""
+    (tmp_path / "index.xml").write_text(INDEX_XML, encoding="utf-8")
+    return tmp_path
+
+
+def test_write_and_load_roundtrip(xml_dir):  # pylint: disable=redefined-outer-name
+    """A snapshot written for index.xml loads back while index.xml is unchanged."""
+    index_path = xml_dir / "index.xml"
+    snapshot_path = xml_dir / SNAPSHOT_FILENAME
+    state = {"names": ["a", "b"], "blob": b"\x00\x01"}
+
+    assert write_snapshot(
+        snapshot_path, index_fingerprint(index_path, with_digest=True), state
+    )
+    assert load_snapshot(snapshot_path, index_path) == state
+
+
+def test_load_rejects_changed_index(xml_dir):  # pylint: disable=redefined-outer-name
+    """Editing index.xml invalidates the snapshot."""
+    index_path = xml_dir / "index.xml"
+    snapshot_path = xml_dir / SNAPSHOT_FILENAME
+    write_snapshot(snapshot_path, index_fingerprint(index_path), {"x": 1})
+
+    index_path.write_text(INDEX_XML.replace("Widget", "Gadget!"), encoding="utf-8")
+    assert load_snapshot(snapshot_path, index_path) is None
+
+
+def test_load_accepts_touched_index_with_same_hash(
+    xml_dir,
+):  # pylint: disable=redefined-outer-name
+    """A new mtime with identical content is revalidated by hash."""
+    index_path = xml_dir / "index.xml"
+    snapshot_path = xml_dir / SNAPSHOT_FILENAME
+    write_snapshot(
+        snapshot_path, index_fingerprint(index_path, with_digest=True), {"x": 1}
+    )
+
+    st = index_path.stat()
+    os.utime(index_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert load_snapshot(snapshot_path, index_path) == {"x": 1}
+
+
+def test_load_ignores_corrupt_snapshot(
+    xml_dir,
+):  # pylint: disable=redefined-outer-name
+    """Garbage or truncated snapshot files are ignored."""
+    index_path = xml_dir / "index.xml"
+    snapshot_path = xml_dir / SNAPSHOT_FILENAME
+    snapshot_path.write_bytes(b"not a snapshot at all")
+    assert load_snapshot(snapshot_path, index_path) is None
+    assert load_snapshot(xml_dir / "missing.snapshot", index_path) is None
+
+
+def test_engine_restores_from_snapshot(
+    xml_dir, load_engine
+):  # pylint: disable=redefined-outer-name
+    """A second engine skips parsing index.xml and rebuilds identical indices."""
+    first = load_engine(xml_dir)
+    assert (xml_dir / SNAPSHOT_FILENAME).exists()
+
+    with patch("doxygen_mcp.query_engine.xml_backend.iterparse") as mock_iterparse:
+        second = load_engine(xml_dir)
+        mock_iterparse.assert_not_called()
+
+    assert second.compounds == first.compounds
+    # pylint: disable=protected-access
+    assert second._member_parent_map == {"class_widget_1draw": "class_widget"}
+    assert second._member_index == {
+        "draw": [("class_widget_1draw", "class_widget", "function")]
+    }
+    assert second._file_map["widget.h"][0]["refid"] == "widget_8h"
+    assert second.find_partial_matches("widg")[0]["name"] == "ui::Widget"
+
+
+def test_engine_falls_back_on_foreign_snapshot(
+    xml_dir, load_engine
+):  # pylint: disable=redefined-outer-name
+    """A snapshot with wrongly typed names is discarded and index.xml parsed."""
+    first = load_engine(xml_dir)
+    state = first._export_state()  # pylint: disable=protected-access
+    state["names"] = [1, 2]
+    write_snapshot(
+        xml_dir / SNAPSHOT_FILENAME,
+        index_fingerprint(xml_dir / "index.xml", with_digest=True),
+        state,
+    )
+
+    second = load_engine(xml_dir)
+    assert second.compounds == first.compounds
@@ -0,0 +1,93 @@
+"""
+Unit tests for the shared source file cache.
+"""
+
+import os
+
+import pytest
+
+from doxygen_mcp import source_cache
+from doxygen_mcp.source_cache import SourceCache, SourceFile
+
+
+@pytest.mark.parametrize(
+    "content, expected",
+    [
+        ("one\ntwo\nthree\n", ["one", "two", "three"]),
+        ("one\r\ntwo\r\nthree", ["one", "two", "three"]),
+        ("", []),
+        ("\n\nlast", ["", "", "last"]),
+    ],
+)
+def test_lines_match_splitlines(tmp_path, content, expected):
+    """Line numbering agrees with str.splitlines for \\n and \\r\\n files."""
+    path = tmp_path / "src.c"
+    path.write_bytes(content.encode("utf-8"))
+    source = SourceFile(path)
+
+    assert source.line_count == len(expected)
+    assert source.lines(1, source.line_count) == expected
+    assert [source.line(n) for n in range(1, source.line_count + 1)] == expected
+
+
+def test_lines_are_clamped(tmp_path):
+    """Out-of-range requests are clamped like list slicing."""
+    path = tmp_path / "src.c"
+    path.write_text("a\nb\nc\n", encoding="utf-8")
+    source = SourceFile(path)
+    assert source.lines(0, 2) == ["a", "b"]
+    assert source.lines(2, 99) == ["b", "c"]
+    assert source.lines(5, 9) == []
+
+
+def test_cache_reuses_and_revalidates(tmp_path):
+    """Unchanged files are served from the cache; edits are picked up."""
+    path = tmp_path / "src.c"
+    path.write_text("old\n", encoding="utf-8")
+    cache = SourceCache(max_files=4)
+
+    first = cache.get(path)
+    assert cache.get(path) is first
+    assert cache.stats()["hits"] == 1
+
+    path.write_text("new line\n", encoding="utf-8")
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert cache.get(path).lines(1, 1) == ["new line"]
+    assert cache.stats()["misses"] == 2
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """Only max_files files are retained."""
+    cache = SourceCache(max_files=2)
+    paths = []
+    for name in "abc":
+        path = tmp_path / f"{name}.c"
+        path.write_text(name, encoding="utf-8")
+        paths.append(path)
+
+    cache.get(paths[0])
+    cache.get(paths[1])
+    cache.get(paths[0])
+    cache.get(paths[2])  # evicts b
+    assert cache.stats()["files"] == 2
+    cache.get(paths[0])
+    assert cache.stats()["hits"] == 2
+
+
+def test_large_files_are_read_per_range(tmp_path, monkeypatch):
+    """Files over the inline limit keep no contents and no open handle."""
+    monkeypatch.setattr(source_cache, "INLINE_MAX_BYTES", 8)
+    monkeypatch.setattr(source_cache, "_SCAN_CHUNK", 5)  # splits lines
+    path = tmp_path / "big.c"
+    expected = [f"line {i}" for i in range(20)]
+    path.write_text("\r\n".join(expected) + "\r\n", encoding="utf-8")
+    source = SourceFile(path)
+
+    assert source._data is None  # pylint: disable=protected-access
+    assert source.line_count == 20
+    assert source.lines(1, 20) == expected
+    assert source.line(7) == "line 6"
+
+    path.write_text("cut", encoding="utf-8")  # truncated under the cache
+    assert source.lines(1, 2) == ["cut"]
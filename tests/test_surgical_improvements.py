@@ -16,6 +16,7 @@ from doxygen_mcp.auditor import check_doxygen_parity
 from doxygen_mcp.query_engine import DoxygenQueryEngine
 from doxygen_mcp.server import (
     doxy_parity_check,
+    doxy_query_batch,
     doxy_references,
     doxy_refresh_delta,
     doxy_rename_impact,
@@ -139,6 +140,22 @@ async def test_find_symbol_definitions(temp_xml_dir):
     assert defs_member[0]["parent_name"] == "Calculator"
 
 
+@pytest.mark.asyncio
+async def test_find_symbol_definitions_parses_only_listing_compounds(temp_xml_dir):
+    engine = await DoxygenQueryEngine.create(temp_xml_dir)
+    assert [r[1] for r in engine._member_index["subtract"]] == ["class_calculator"]
+
+    with patch.object(
+        engine, "_fetch_compound_details", wraps=engine._fetch_compound_details
+    ) as spy:
+        defs = engine.find_symbol_definitions("Calculator::subtract")
+
+    assert [d["name"] for d in defs] == ["subtract"]
+    # calculator.h lists no members, so its XML is never opened
+    fetched = {c.args[0] for c in spy.call_args_list}
+    assert "calculator_8h" not in fetched
+
+
 @pytest.mark.asyncio
 async def test_find_references(temp_xml_dir):
     engine = await DoxygenQueryEngine.create(temp_xml_dir)
@@ -237,3 +254,46 @@ async def test_doxy_refresh_delta_tool(
 
         res = await doxy_refresh_delta(str(target_file), str(fake_proj_path))
         assert "Delta refresh completed successfully" in res
+
+
+@pytest.mark.asyncio
+@patch("doxygen_mcp.server.get_file_timeline")
+@patch("doxygen_mcp.server.resolve_project_path")
+@patch("doxygen_mcp.server._find_xml_dir")
+async def test_doxy_query_batch_tool(
+    mock_xml_dir, mock_resolve_path, mock_timeline, temp_xml_dir
+):
+    mock_resolve_path.return_value = Path("/tmp/fake_project")
+    mock_xml_dir.return_value = temp_xml_dir
+    mock_timeline.return_value = "🕒 Last modified: today"
+    # Give the class compound a location so timelines are looked up
+    class_xml = Path(temp_xml_dir) / "class_calculator.xml"
+    class_xml.write_text(
+        CALCULATOR_XML_CONTENT.replace(
+            "</sectiondef>\n  </compounddef>",
+            '</sectiondef>\n    <location file="calculator.h" line="5"/>\n  </compounddef>',
+        ),
+        encoding="utf-8",
+    )
+    DoxygenQueryEngine.clear_cache()
+
+    res = await doxy_query_batch(
+        [
+            "Calculator",
+            "calculator",
+            {"name": "Calculator", "fields": ["kind", "members"]},
+            "NoSuchSymbol",
+        ]
+    )
+
+    assert res["found"] == 3
+    assert res["missing"] == ["NoSuchSymbol"]
+    first, second, third, missing = res["results"]
+    assert first["name"] == "Calculator"
+    assert first["timeline"] == second["timeline"] == "🕒 Last modified: today"
+    assert mock_timeline.call_count == 1
+    assert set(third) == {"symbol", "found", "kind", "members"}
+    assert missing == {"symbol": "NoSuchSymbol", "found": False}
+
+    bad = await doxy_query_batch(["Calculator"], fields=["bogus"])
+    assert "Unknown fields" in bad["error"]
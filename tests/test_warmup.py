@@ -0,0 +1,116 @@
+"""
+Tests for the process-pool full-index warmup.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from doxygen_mcp.cache import COMPOUND_CACHE
+from doxygen_mcp.query_engine import DoxygenQueryEngine
+from doxygen_mcp.warmup import parse_compounds
+
+COMPOUND_XML = """<?xml version='1.0' encoding='UTF-8' standalone='no'?>
+<doxygen>
+  <compounddef id="{refid}" kind="file">
+    <compoundname>{name}</compoundname>
+    <location file="{name}"/>
+    <sectiondef kind="func">
+      <memberdef kind="function" id="{refid}_1run">
+        <name>run_{index}</name>
+        <location file="{name}" line="3" bodystart="3" bodyend="6"/>
+        {calls}
+      </memberdef>
+    </sectiondef>
+  </compounddef>
+</doxygen>
+"""
+
+COUNT = 6
+
+
+@pytest.fixture(autouse=True)
+def _reset_state():
+    DoxygenQueryEngine.clear_cache()
+    COMPOUND_CACHE.clear()
+    yield
+    DoxygenQueryEngine.clear_cache()
+    COMPOUND_CACHE.clear()
+
+
+def _write_corpus(xml_dir):
+    """Write COUNT file compounds where each run_i calls run_{i+1}."""
+    xml_dir.mkdir()
+    compounds = []
+    for i in range(COUNT):
+        refid, name = f"f{i}_8c", f"f{i}.c"
+        calls = (
+            f'<references refid="f{i + 1}_8c_1run">run_{i + 1}</references>'
+            if i + 1 < COUNT
+            else ""
+        )
+        (xml_dir / f"{refid}.xml").write_text(
+            COMPOUND_XML.format(refid=refid, name=name, index=i, calls=calls),
+            encoding="utf-8",
+        )
+        compounds.append(
+            f'<compound refid="{refid}" kind="file"><name>{name}</name></compound>'
+        )
+    (xml_dir / "index.xml").write_text(
+        "<?xml version='1.0' encoding='UTF-8'?>\n<doxygenindex>"
+        + "".join(compounds)
+        + "</doxygenindex>",
+        encoding="utf-8",
+    )
+
+
+def test_parallel_parse_matches_serial(tmp_path):
+    """Worker processes return the same records, in order, as a serial parse."""
+    xml_dir = tmp_path / "xml"
+    _write_corpus(xml_dir)
+    (xml_dir / "broken.xml").write_text("<doxygen><compounddef", encoding="utf-8")
+    items = [(f"f{i}_8c", str(xml_dir / f"f{i}_8c.xml")) for i in range(COUNT)]
+    items.append(("broken", str(xml_dir / "broken.xml")))
+
+    serial = list(parse_compounds(items, workers=1, batch_size=2))
+    parallel = list(parse_compounds(items, workers=2, batch_size=2))
+
+    assert serial == parallel
+    assert [refid for refid, _, _ in parallel] == [refid for refid, _ in items]
+    assert parallel[0][1]["members"][0]["name"] == "run_0"
+    assert parallel[-1][1] is None and "Error parsing" in parallel[-1][2]
+
+
+def test_warm_up_populates_cache_and_indices(tmp_path, load_engine):
+    """After warmup, records, graph and location index need no further parsing."""
+    xml_dir = tmp_path / "xml"
+    _write_corpus(xml_dir)
+    engine = load_engine(xml_dir)
+
+    stats = engine.warm_up(workers=1)
+
+    assert stats["compounds"] == COUNT
+    assert stats["parsed"] == COUNT
+    assert stats["errors"] == 0
+    assert stats["graph_edges"] == COUNT - 1
+    with patch(
+        "doxygen_mcp.query_engine.parse_compound_record", side_effect=AssertionError
+    ):
+        assert engine.get_compound_record("f2_8c")["name"] == "f2.c"
+        graph = engine.get_call_graph()
+        assert engine.get_location_index().at("f3.c", 3) == "f3_8c_1run"
+
+    run0 = graph.node_id("f0_8c_1run")
+    assert len(graph.reachable(run0)) == COUNT - 1
+
+
+async def test_create_warms_up_when_enabled(tmp_path, monkeypatch):
+    """DOXYGEN_WARMUP=full runs the warmup as part of engine creation."""
+    xml_dir = tmp_path / "xml"
+    _write_corpus(xml_dir)
+    monkeypatch.setenv("DOXYGEN_WARMUP", "full")
+
+    with patch.object(DoxygenQueryEngine, "warm_up", autospec=True) as warm_up:
+        await DoxygenQueryEngine.create(str(xml_dir))
+
+    warm_up.assert_called_once()
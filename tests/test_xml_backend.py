@@ -0,0 +1,82 @@
+"""
+Unit tests for the pluggable XML parsing backend.
+"""
+
+import pytest
+from defusedxml.common import EntitiesForbidden
+
+from doxygen_mcp import xml_backend
+
+COMPOUND_XML = """<?xml version='1.0' encoding='UTF-8' standalone='no'?>
+<doxygen version="1.9.1">
+  <compounddef id="class_widget" kind="class">
+    <compoundname>Widget</compoundname>
+    <briefdescription><para>A <bold>bold</bold> widget &amp; more.</para></briefdescription>
+  </compounddef>
+</doxygen>
+"""
+
+XXE_XML = """<?xml version="1.0"?>
+<!DOCTYPE root [
+  <!ENTITY xxe SYSTEM "file:///etc/passwd">
+]>
+<root><a>&xxe;</a></root>
+"""
+
+BACKENDS = ["defusedxml"]
+if xml_backend._lxml_etree is not None:  # pylint: disable=protected-access
+    BACKENDS.append("lxml")
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request, monkeypatch):
+    """Run a test once per available backend."""
+    monkeypatch.setenv("DOXYGEN_XML_BACKEND", request.param)
+    assert xml_backend.backend_name() == request.param
+    return request.param
+
+
+def test_parse_reads_compound(tmp_path, backend):  # pylint: disable=unused-argument
+    """Both backends expose the same ElementTree-style API."""
+    xml_file = tmp_path / "class_widget.xml"
+    xml_file.write_text(COMPOUND_XML, encoding="utf-8")
+
+    compounddef = xml_backend.parse(xml_file).getroot().find("compounddef")
+    assert compounddef.get("kind") == "class"
+    assert compounddef.find("compoundname").text == "Widget"
+    brief = "".join(compounddef.find("briefdescription").itertext())
+    assert brief == "A bold widget & more."
+
+
+def test_iterparse_yields_end_events(
+    tmp_path, backend
+):  # pylint: disable=unused-argument
+    """iterparse yields (event, element) pairs for every closing tag."""
+    xml_file = tmp_path / "class_widget.xml"
+    xml_file.write_text(COMPOUND_XML, encoding="utf-8")
+
+    tags = [elem.tag for _, elem in xml_backend.iterparse(xml_file)]
+    assert tags[-1] == "doxygen"
+    assert "compoundname" in tags
+
+
+def test_entity_declarations_rejected(
+    tmp_path, backend
+):  # pylint: disable=unused-argument
+    """Documents declaring entities are refused by every backend."""
+    xml_file = tmp_path / "xxe.xml"
+    xml_file.write_text(XXE_XML, encoding="utf-8")
+
+    with pytest.raises(EntitiesForbidden):
+        xml_backend.parse(xml_file)
+    with pytest.raises(EntitiesForbidden):
+        list(xml_backend.iterparse(xml_file))
+    with pytest.raises(EntitiesForbidden):
+        xml_backend.fromstring(XXE_XML)
+
+
+def test_unknown_backend_defaults_to_auto(monkeypatch):
+    """Unrecognised values fall back to automatic selection."""
+    monkeypatch.setenv("DOXYGEN_XML_BACKEND", "bogus")
+    expected = "lxml" if "lxml" in BACKENDS else "defusedxml"
+    assert xml_backend.backend_name() == expected